@@ -0,0 +1,187 @@
+"""
+Async application services for the read API
+Same arguments and response dicts as the read methods of services.py,
+awaiting the async repositories instead of blocking on the sync ones
+"""
+from datetime import date
+from typing import Any, Dict, Optional
+
+from .services import ShiftService, _listing_request, _page_response
+
+
+class AsyncVigilanteService:
+    """Async read service for Vigilantes"""
+
+    def __init__(self, vigilante_repository):
+        self.vigilante_repository = vigilante_repository
+
+    async def get_vigilante(self, vigilante_id: int) -> Dict[str, Any]:
+        """Get vigilante by ID"""
+        try:
+            vigilante = await self.vigilante_repository.get_by_id(vigilante_id)
+            if not vigilante:
+                return {
+                    "success": False,
+                    "message": "Vigilante not found"
+                }
+            return {
+                "success": True,
+                "data": vigilante
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    async def get_all_vigilantes(self, filters: Optional[Dict] = None) -> Dict[str, Any]:
+        """Get all vigilantes with optional filters"""
+        try:
+            vigilantes = await self.vigilante_repository.get_all(filters)
+            return {
+                "success": True,
+                "data": vigilantes,
+                "count": len(vigilantes)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+
+class AsyncBuildingService:
+    """Async read service for Buildings"""
+
+    def __init__(self, building_repository):
+        self.building_repository = building_repository
+
+    async def get_all_buildings(self) -> Dict[str, Any]:
+        """Get all buildings"""
+        try:
+            buildings = await self.building_repository.get_all()
+            return {
+                "success": True,
+                "data": buildings,
+                "count": len(buildings)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+
+class AsyncShiftService:
+    """Async read service for Shifts"""
+
+    def __init__(self, shift_repository):
+        self.shift_repository = shift_repository
+
+    async def get_all_shifts(self, filters: Optional[Dict] = None) -> Dict[str, Any]:
+        """Get one page of shifts, filtered in the database; see ShiftService.get_all_shifts"""
+        try:
+            criteria, limit, after = _listing_request(
+                filters, ('vigilante_id', 'building_id', 'planilla_id'), ShiftService.SHIFT_STATUSES
+            )
+        except ValueError as e:
+            return {
+                "success": False,
+                "message": str(e)
+            }
+        try:
+            return _page_response(await self.shift_repository.get_all(criteria, limit, after))
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    async def get_shift(self, shift_id: int) -> Dict[str, Any]:
+        """Get shift by ID"""
+        try:
+            shift = await self.shift_repository.get_by_id(shift_id)
+            if not shift:
+                return {
+                    "success": False,
+                    "message": "Shift not found"
+                }
+            return {
+                "success": True,
+                "data": shift
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+
+class AsyncReportService:
+    """Async read service for Reports"""
+
+    def __init__(self, report_repository, payroll_repository):
+        self.report_repository = report_repository
+        self.payroll_repository = payroll_repository
+
+    async def get_vigilante_hours(self, vigilante_id: int, start_date: str, end_date: str) -> Dict[str, Any]:
+        """registro_horas rows of a vigilante between two ISO dates (inclusive), with vigilante and building names"""
+        try:
+            start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        except (TypeError, ValueError):
+            return {
+                "success": False,
+                "message": "start_date and end_date must be ISO dates (YYYY-MM-DD)"
+            }
+        try:
+            hours = await self.report_repository.get_vigilante_hours(vigilante_id, start, end)
+            return {
+                "success": True,
+                "data": hours,
+                "count": len(hours)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    async def get_vigilante_totals(self, vigilante_id: int, mes: int, anio: int) -> Dict[str, Any]:
+        """Running monthly totals of a vigilante"""
+        try:
+            totals = await self.payroll_repository.get_vigilante_liquidation(vigilante_id, mes, anio)
+            if not totals:
+                return {
+                    "success": False,
+                    "message": "No liquidation for this vigilante and month"
+                }
+            return {
+                "success": True,
+                "data": totals
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to retrieve totals"
+            }
+
+    async def get_building_totals(self, building_id: int, mes: int, anio: int) -> Dict[str, Any]:
+        """Running monthly totals of a building"""
+        try:
+            totals = await self.payroll_repository.get_building_liquidation(building_id, mes, anio)
+            if not totals:
+                return {
+                    "success": False,
+                    "message": "No liquidation for this building and month"
+                }
+            return {
+                "success": True,
+                "data": totals
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to retrieve totals"
+            }
@@ -2,18 +2,74 @@
 Application Services Layer
 This layer orchestrates the business logic and coordinates between domain and infrastructure
 """
-from typing import List, Dict, Optional, Any
-from datetime import datetime, timedelta
+import time
+from typing import Callable, List, Dict, Optional, Any, Tuple
+from datetime import date, datetime, timedelta
 from ..domain.models import Vigilante, Building, Shift, User, Report, StatusEnum, ShiftTypeEnum
 from ..domain.repositories import VigilanteRepository, BuildingRepository, ShiftRepository, UserRepository, ReportRepository
 from ..domain.services import ShiftAssignmentService, PayrollCalculationService, ContingencyManagementService
+from ..domain.roster import RosterPlanningService
+from ..domain.parallel_planning import DEFAULT_CLUSTERS, ParallelRosterPlanner
+from ..domain.optimizer import RosterOptimizer
+from ..domain.spatial import SpatialGridIndex
+from ..domain.pagination import Page, decode_cursor, page_size
+from ..domain.shift_batch import history_window, validate_shift_batch
+from ..domain.bulk_import import BUILDING_IMPORT, VIGILANTE_IMPORT, chunked, missing_headers, unique_values, validate_chunk
+from ..domain.payroll import liquidate_month, liquidation_delta, compare_liquidations
+from ..domain.fixed_point import to_float
+
+
+# How long the vigilante grid index is reused before reloading addresses
+SPATIAL_INDEX_TTL_SECONDS = 300
+
+
+def _listing_request(filters: Optional[Dict[str, Any]], id_keys, statuses) -> Tuple[Dict[str, Any], int, Optional[Tuple[datetime, int]]]:
+    """Typed repository filters, page size and cursor key from a listing's query arguments
+    
+    start_date and end_date are inclusive ISO dates on the start time and
+    become a [start_from, start_to) range. ValueError names the bad argument.
+    """
+    filters = filters or {}
+    criteria: Dict[str, Any] = {}
+    for key in id_keys:
+        if filters.get(key) not in (None, ''):
+            try:
+                criteria[key] = int(filters[key])
+            except ValueError:
+                raise ValueError(f"{key} must be an integer")
+    status = filters.get('status')
+    if status:
+        if status not in statuses:
+            raise ValueError(f"status must be one of {', '.join(statuses)}")
+        criteria['status'] = status
+    for key, bound, offset in (('start_date', 'start_from', 0), ('end_date', 'start_to', 1)):
+        if filters.get(key):
+            try:
+                day = date.fromisoformat(filters[key])
+            except ValueError:
+                raise ValueError(f"{key} must be an ISO date (YYYY-MM-DD)")
+            criteria[bound] = datetime.combine(day, datetime.min.time()) + timedelta(days=offset)
+    after = decode_cursor(filters['cursor']) if filters.get('cursor') else None
+    return criteria, page_size(filters.get('limit')), after
+
+
+def _page_response(page: Page) -> Dict[str, Any]:
+    return {
+        "success": True,
+        "data": page.items,
+        "count": len(page.items),
+        "next_cursor": page.next_cursor
+    }
 
 
 class VigilanteService:
     """Application service for Vigilante operations"""
     
-    def __init__(self, vigilante_repository: VigilanteRepository):
+    def __init__(self, vigilante_repository: VigilanteRepository,
+                 on_change: Optional[Callable[[], None]] = None):
         self.vigilante_repository = vigilante_repository
+        # Called after vigilantes are created or changed, e.g. to drop indexes built from them
+        self.on_change = on_change or (lambda: None)
 
     def register_vigilante(self, vigilante_data: Dict[str, Any]) -> Dict[str, Any]:
         """Register a new vigilante with validation"""
@@ -54,6 +110,7 @@ class VigilanteService:
             
             # Save to repository
             created_vigilante = self.vigilante_repository.create(vigilante)
+            self.on_change()
             
             return {
                 "success": True,
@@ -120,6 +177,7 @@ class VigilanteService:
             
             # Save updated vigilante
             updated_vigilante = self.vigilante_repository.update(vigilante)
+            self.on_change()
             
             return {
                 "success": True,
@@ -203,13 +261,17 @@ class BuildingService:
 class ShiftService:
     """Application service for Shift operations"""
     
+    MINIMUM_REST_HOURS = 12
+    
     def __init__(self, 
                  shift_repository: ShiftRepository,
                  vigilante_repository: VigilanteRepository,
-                 building_repository: BuildingRepository):
+                 building_repository: BuildingRepository,
+                 planilla_repository=None):
         self.shift_repository = shift_repository
         self.vigilante_repository = vigilante_repository
         self.building_repository = building_repository
+        self.planilla_repository = planilla_repository
 
     def create_shift(self, shift_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new shift with validation"""
@@ -252,14 +314,17 @@ class ShiftService:
                 created_at=datetime.now()
             )
             
-            # Validate minimum rest time
-            existing_shifts = self.shift_repository.get_shifts_by_vigilante(shift_data['vigilante_id'])
+            # Validate minimum rest time against the only shifts that can conflict
+            rest = timedelta(hours=self.MINIMUM_REST_HOURS)
+            nearby_shifts = self.shift_repository.get_shifts_by_vigilante_in_window(
+                shift_data['vigilante_id'], shift.start_datetime - rest, shift.end_datetime + rest
+            )
             if not ContingencyManagementService.validate_minimum_rest_time(
-                shift_data['vigilante_id'], shift, existing_shifts
+                shift_data['vigilante_id'], shift, nearby_shifts, self.MINIMUM_REST_HOURS
             ):
                 return {
                     "success": False,
-                    "message": "Insufficient rest time between shifts (minimum 12 hours required)"
+                    "message": f"Insufficient rest time between shifts (minimum {self.MINIMUM_REST_HOURS} hours required)"
                 }
             
             # Save to repository
@@ -278,15 +343,90 @@ class ShiftService:
                 "message": "Failed to create shift"
             }
 
-    def get_all_shifts(self, filters: Optional[Dict] = None) -> Dict[str, Any]:
-        """Get all shifts with optional filters"""
+    def bulk_create_shifts(self, rows: List[Dict[str, Any]], created_by: Optional[int] = None,
+                           atomic: bool = False) -> Dict[str, Any]:
+        """Validate a batch of shifts together and insert the valid ones in one transaction
+        
+        Vigilantes, buildings and the stored shifts that can conflict are
+        loaded once for the whole batch. Rejected rows come back as
+        {index, message} errors; with atomic=True any error rejects the
+        whole batch and nothing is inserted. Shifts go to the planilla of
+        their month, created as a draft when missing.
+        """
         try:
-            shifts = self.shift_repository.get_all(filters)
+            if not isinstance(rows, list) or not rows:
+                return {
+                    "success": False,
+                    "message": "shifts must be a non-empty list"
+                }
+            if self.planilla_repository is None:
+                return {
+                    "success": False,
+                    "message": "Bulk shift creation is not configured"
+                }
+            
+            vigilantes = {v.id: v for v in self.vigilante_repository.get_active_vigilantes() if v.is_active()}
+            buildings = {b.id: b for b in self.building_repository.get_active_buildings() if b.is_active()}
+            window = history_window(rows, self.MINIMUM_REST_HOURS)
+            history = self.shift_repository.get_shifts_for_vigilantes_in_window(*window) if window else []
+            
+            batch = validate_shift_batch(rows, vigilantes, buildings, history, self.MINIMUM_REST_HOURS)
+            summary = {
+                "received": len(rows),
+                "created": 0,
+                "rejected": len(batch.errors),
+                "errors": batch.errors
+            }
+            if atomic and batch.errors:
+                return {
+                    "success": False,
+                    "data": summary,
+                    "message": "Batch rejected; no shifts were created"
+                }
+            
+            planillas: Dict[tuple, int] = {}
+            planilla_assignments = []
+            for assignment in batch.assignments:
+                month = (assignment.fecha.month, assignment.fecha.year)
+                if month not in planillas:
+                    planillas[month] = self.planilla_repository.get_or_create(*month, created_by).id_planilla
+                planilla_assignments.append((planillas[month], assignment))
+            
+            summary["created"] = self.shift_repository.copy_assignments(planilla_assignments, created_by)
             return {
                 "success": True,
-                "data": shifts,
-                "count": len(shifts)
+                "data": summary,
+                "message": f"{summary['created']} shifts created, {summary['rejected']} rejected"
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to create shifts"
+            }
+
+    SHIFT_STATUSES = ('programado', 'confirmado', 'completado', 'ausente')
+
+    def get_all_shifts(self, filters: Optional[Dict] = None) -> Dict[str, Any]:
+        """Get one page of shifts, filtered in the database
+        
+        filters are the query arguments: vigilante_id, building_id,
+        planilla_id, status, start_date and end_date (ISO dates, inclusive,
+        on the shift start), limit and the cursor returned as next_cursor
+        by the previous page.
+        """
+        try:
+            criteria, limit, after = _listing_request(
+                filters, ('vigilante_id', 'building_id', 'planilla_id'), self.SHIFT_STATUSES
+            )
+        except ValueError as e:
+            return {
+                "success": False,
+                "message": str(e)
             }
+        try:
+            return _page_response(self.shift_repository.get_all(criteria, limit, after))
         except Exception as e:
             return {
                 "success": False,
@@ -313,18 +453,356 @@ class ShiftService:
             }
 
 
+class RosterService:
+    """Application service for whole-month roster generation"""
+    
+    def __init__(self,
+                 planilla_repository,
+                 shift_repository: ShiftRepository,
+                 vigilante_repository: VigilanteRepository,
+                 building_repository: BuildingRepository,
+                 workers: int = 1,
+                 seed: int = 0,
+                 clusters: int = DEFAULT_CLUSTERS):
+        self.planilla_repository = planilla_repository
+        self.shift_repository = shift_repository
+        self.vigilante_repository = vigilante_repository
+        self.building_repository = building_repository
+        # Above one worker the month is solved per building cluster in a process pool
+        self.parallel_planner = (
+            ParallelRosterPlanner(workers=workers, n_clusters=clusters, seed=seed) if workers > 1 else None
+        )
+
+    def generate_month_roster(self, mes: int, anio: int, generated_by: Optional[int] = None,
+                              rest_hours: int = 12, optimize_ms: int = 0) -> Dict[str, Any]:
+        """Fill a planilla_turnos month with assignments for every active building
+
+        With optimize_ms > 0 the generated roster is improved by simulated
+        annealing for that long before it is saved.
+        """
+        try:
+            if not 1 <= mes <= 12:
+                return {
+                    "success": False,
+                    "message": "Invalid month, expected 1-12"
+                }
+            
+            planilla = self.planilla_repository.get_or_create(mes, anio, generated_by)
+            if self.planilla_repository.count_assignments(planilla.id_planilla):
+                return {
+                    "success": False,
+                    "message": "The planilla for this month already has assignments"
+                }
+            
+            # Load everything the solver needs up front; no per-row queries afterwards
+            buildings = self.building_repository.get_active_buildings()
+            vigilantes = self.vigilante_repository.get_active_vigilantes()
+            month_start = datetime(anio, mes, 1)
+            previous_shifts = self.shift_repository.get_shifts_by_date_range(
+                month_start - timedelta(days=7), month_start
+            )
+            
+            if self.parallel_planner:
+                roster = self.parallel_planner.generate_month(
+                    mes, anio, buildings, vigilantes, previous_shifts, rest_hours
+                )
+            else:
+                roster = RosterPlanningService.generate_month(
+                    mes, anio, buildings, vigilantes, previous_shifts, rest_hours
+                )
+            
+            optimization = None
+            if optimize_ms > 0:
+                optimizer = RosterOptimizer(buildings, vigilantes, previous_shifts, rest_hours)
+                optimization = optimizer.optimize(roster.assignments, optimize_ms)
+                roster.assignments = optimization.assignments
+            created = self.shift_repository.bulk_create_assignments(
+                planilla.id_planilla, roster.assignments, generated_by
+            )
+            
+            return {
+                "success": True,
+                "data": {
+                    "planilla_id": planilla.id_planilla,
+                    "assignments_created": created,
+                    "unfilled_slots": [
+                        {
+                            "building_id": slot.building_id,
+                            "shift_type_id": slot.shift_type_id,
+                            "start_datetime": slot.start_datetime.isoformat(),
+                            "end_datetime": slot.end_datetime.isoformat()
+                        }
+                        for slot in roster.unfilled
+                    ],
+                    "coverage": roster.coverage,
+                    "optimization": {
+                        "initial_cost": optimization.initial_cost,
+                        "best_cost": optimization.best_cost,
+                        "breakdown": optimization.breakdown,
+                        "iterations": optimization.iterations,
+                        "elapsed_ms": round(optimization.elapsed_ms, 1)
+                    } if optimization else None
+                },
+                "message": "Roster generated successfully"
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to generate roster"
+            }
+
+
+class ContingencyService:
+    """Application service for absences and replacements"""
+    
+    def __init__(self,
+                 novedad_repository,
+                 shift_repository: ShiftRepository,
+                 vigilante_repository: VigilanteRepository,
+                 building_repository: BuildingRepository):
+        self.novedad_repository = novedad_repository
+        self.shift_repository = shift_repository
+        self.vigilante_repository = vigilante_repository
+        self.building_repository = building_repository
+        self._spatial_index: Optional[SpatialGridIndex] = None
+        self._spatial_index_built = 0.0
+
+    NOVEDAD_STATUSES = ('pendiente', 'resuelta', 'cancelada')
+
+    def list_novedades(self, filters: Optional[Dict] = None) -> Dict[str, Any]:
+        """Get one page of novedades with the vigilante, replacement and building names
+        
+        filters are the query arguments: vigilante_id, building_id, status,
+        start_date and end_date, limit and cursor, as for shifts.
+        """
+        try:
+            criteria, limit, after = _listing_request(filters, ('vigilante_id', 'building_id'), self.NOVEDAD_STATUSES)
+        except ValueError as e:
+            return {
+                "success": False,
+                "message": str(e)
+            }
+        try:
+            return _page_response(self.novedad_repository.get_all(criteria, limit, after))
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def spatial_index(self) -> SpatialGridIndex:
+        """Grid index of active vigilantes, rebuilt every SPATIAL_INDEX_TTL_SECONDS"""
+        if self._spatial_index is None or time.monotonic() - self._spatial_index_built > SPATIAL_INDEX_TTL_SECONDS:
+            self._spatial_index = SpatialGridIndex(self.vigilante_repository.get_active_vigilantes())
+            self._spatial_index_built = time.monotonic()
+        return self._spatial_index
+
+    def invalidate_spatial_index(self) -> None:
+        """Force a rebuild on the next search, e.g. after vigilantes change"""
+        self._spatial_index = None
+
+    def find_replacements(self, novedad_id: int, k: int = 5, rest_hours: int = 12,
+                          max_distance: Optional[float] = None) -> Dict[str, Any]:
+        """Nearest vigilantes who could cover a novedad, closest first"""
+        try:
+            novedad = self.novedad_repository.get_by_id(novedad_id)
+            if not novedad:
+                return {
+                    "success": False,
+                    "message": "Novedad not found"
+                }
+            building = self.building_repository.get_active_building(novedad.building_id)
+            if not building:
+                return {
+                    "success": False,
+                    "message": "Building not found"
+                }
+            
+            shift = Shift(
+                id=novedad.shift_id,
+                vigilante_id=novedad.vigilante_id,
+                building_id=novedad.building_id,
+                start_datetime=novedad.start_datetime,
+                end_datetime=novedad.end_datetime,
+                shift_type=ShiftTypeEnum.NORMAL,
+                notes=None
+            )
+            margin = timedelta(hours=rest_hours)
+            nearby_shifts = self.shift_repository.get_shifts_by_date_range(
+                shift.start_datetime - margin, shift.end_datetime + margin
+            )
+            candidates = ContingencyManagementService.find_nearest_replacements(
+                shift, building, self.spatial_index(), k,
+                previous_shifts=nearby_shifts,
+                minimum_hours=rest_hours,
+                max_distance=max_distance
+            )
+            
+            return {
+                "success": True,
+                "data": [
+                    {
+                        "vigilante_id": vigilante.id,
+                        "name": vigilante.name,
+                        "distance": round(distance, 2) if distance is not None else None
+                    }
+                    for vigilante, distance in candidates
+                ],
+                "count": len(candidates)
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to find replacements"
+            }
+
+    def repair_novedad(self, novedad_id: int, max_depth: int = 3,
+                       time_budget_ms: float = 200, rest_hours: int = 12) -> Dict[str, Any]:
+        """Cover a novedad by locally repairing the published roster"""
+        try:
+            novedad = self.novedad_repository.get_by_id(novedad_id)
+            if not novedad:
+                return {
+                    "success": False,
+                    "message": "Novedad not found"
+                }
+            if novedad.status != 'pendiente':
+                return {
+                    "success": False,
+                    "message": "Novedad is not pending"
+                }
+            
+            # Affected day +/- 1, widened by the rest margin so feasibility checks see neighbours
+            day_start = datetime.combine(novedad.start_datetime.date(), datetime.min.time())
+            margin = timedelta(days=1, hours=rest_hours)
+            roster = self.shift_repository.get_shifts_by_date_range(
+                day_start - margin, day_start + timedelta(days=1) + margin
+            )
+            vigilantes = self.vigilante_repository.get_active_vigilantes()
+            buildings = {b.id: b for b in self.building_repository.get_active_buildings()}
+            
+            repair = ContingencyManagementService.repair_absence(
+                novedad, roster, vigilantes, buildings, rest_hours, max_depth, time_budget_ms
+            )
+            moved = self.shift_repository.apply_reassignments(repair.changes, novedad.id if repair.resolved else None)
+            if moved is None:
+                return {
+                    "success": False,
+                    "message": "Roster changed during repair, try again"
+                }
+            
+            return {
+                "success": True,
+                "data": {
+                    "resolved": repair.resolved,
+                    "timed_out": repair.timed_out,
+                    "elapsed_ms": round(repair.elapsed_ms, 1),
+                    "changes": [
+                        {
+                            "shift_id": c.shift_id,
+                            "building_id": c.building_id,
+                            "start_datetime": c.start_datetime.isoformat(),
+                            "end_datetime": c.end_datetime.isoformat(),
+                            "from_vigilante_id": c.from_vigilante_id,
+                            "to_vigilante_id": c.to_vigilante_id
+                        }
+                        for c in repair.changes
+                    ],
+                    "unfilled_shift_ids": [s.id for s in repair.unfilled]
+                },
+                "message": "Absence covered" if repair.resolved else "Absence could not be fully covered"
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to repair roster"
+            }
+
+
 class ReportService:
     """Application service for Report operations"""
     
+    # Days after the start shown by default on the coverage dashboard, as in vista_cobertura_edificios
+    COVERAGE_DAYS = 7
+    
     def __init__(self, 
                  report_repository: ReportRepository,
                  shift_repository: ShiftRepository,
                  vigilante_repository: VigilanteRepository,
-                 building_repository: BuildingRepository):
+                 building_repository: BuildingRepository,
+                 dashboard_repository=None):
         self.report_repository = report_repository
         self.shift_repository = shift_repository
         self.vigilante_repository = vigilante_repository
         self.building_repository = building_repository
+        self.dashboard_repository = dashboard_repository
+
+    def get_building_coverage(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                              building_id: Optional[int] = None) -> Dict[str, Any]:
+        """Vigilantes per building and starting hour for each day between two ISO dates (default: the next 7 days)"""
+        try:
+            start = date.fromisoformat(start_date) if start_date else date.today()
+            end = date.fromisoformat(end_date) if end_date else start + timedelta(days=self.COVERAGE_DAYS)
+        except (TypeError, ValueError):
+            return {
+                "success": False,
+                "message": "start_date and end_date must be ISO dates (YYYY-MM-DD)"
+            }
+        try:
+            coverage = self.dashboard_repository.get_building_coverage(start, end, building_id)
+            return {
+                "success": True,
+                "data": coverage,
+                "count": len(coverage)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def get_available_vigilantes(self) -> Dict[str, Any]:
+        """Active vigilantes with the end of their last shift and the start of their next one"""
+        try:
+            vigilantes = self.dashboard_repository.get_available_vigilantes()
+            return {
+                "success": True,
+                "data": vigilantes,
+                "count": len(vigilantes)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def get_vigilante_hours(self, vigilante_id: int, start_date: str, end_date: str) -> Dict[str, Any]:
+        """registro_horas rows of a vigilante between two ISO dates (inclusive), with vigilante and building names"""
+        try:
+            start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        except (TypeError, ValueError):
+            return {
+                "success": False,
+                "message": "start_date and end_date must be ISO dates (YYYY-MM-DD)"
+            }
+        try:
+            hours = self.report_repository.get_vigilante_hours(vigilante_id, start, end)
+            return {
+                "success": True,
+                "data": hours,
+                "count": len(hours)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
 
     def generate_report(self, report_criteria: Dict) -> Dict:
         """Generate a report based on criteria"""
@@ -380,6 +858,411 @@ class ReportService:
             }
 
 
+class PayrollService:
+    """Application service for the monthly liquidation batch"""
+    
+    def __init__(self, payroll_repository):
+        self.payroll_repository = payroll_repository
+
+    def liquidate_month(self, mes: int, anio: int, processed_by: Optional[int] = None) -> Dict[str, Any]:
+        """Compute and store liquidacion_mensual and liquidacion_edificio for a month"""
+        try:
+            if not 1 <= mes <= 12:
+                return {
+                    "success": False,
+                    "message": "Invalid month, expected 1-12"
+                }
+            
+            started = time.perf_counter()
+            hours = self.payroll_repository.load_month_hours(mes, anio)
+            liquidation = liquidate_month(mes, anio, hours)
+            counts = self.payroll_repository.upsert_liquidation(liquidation, processed_by)
+            
+            return {
+                "success": True,
+                "data": {
+                    "mes": mes,
+                    "anio": anio,
+                    "registros": len(hours),
+                    "vigilantes": counts.get("liquidacion_mensual", 0),
+                    "edificios": counts.get("liquidacion_edificio", 0),
+                    "valor_total": to_float(liquidation.valor_total),
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+                },
+                "message": "Payroll liquidated successfully"
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to liquidate payroll"
+            }
+
+    def complete_assignments(self, assignment_ids: List[int], completed_by: Optional[int] = None) -> Dict[str, Any]:
+        """Mark assignments completed and add their hours to the running monthly totals"""
+        try:
+            shifts = self.payroll_repository.lock_assignments(assignment_ids)
+            if not shifts:
+                return {
+                    "success": False,
+                    "message": "No assignments to complete"
+                }
+            
+            data = self._record_hours(shifts, completed_by)
+            return {
+                "success": True,
+                "data": data,
+                "message": f"Completed {len(shifts)} assignments"
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to complete assignments"
+            }
+
+    def correct_assignment(self, assignment_id: int, changes: Dict[str, Any], corrected_by: Optional[int] = None) -> Dict[str, Any]:
+        """Correct a completed assignment and move its hours between the running totals"""
+        try:
+            shifts = self.payroll_repository.lock_assignments([assignment_id])
+            if not shifts or not self.payroll_repository.load_assignment_hours([assignment_id]):
+                return {
+                    "success": False,
+                    "message": "Completed assignment not found"
+                }
+            
+            shift = shifts[0]
+            if 'vigilante_id' in changes:
+                shift.vigilante_id = int(changes['vigilante_id'])
+            if 'building_id' in changes:
+                shift.building_id = int(changes['building_id'])
+            if 'start_datetime' in changes:
+                shift.start_datetime = datetime.fromisoformat(changes['start_datetime'])
+            if 'end_datetime' in changes:
+                shift.end_datetime = datetime.fromisoformat(changes['end_datetime'])
+            if shift.end_datetime <= shift.start_datetime:
+                return {
+                    "success": False,
+                    "message": "End time must be after start time"
+                }
+            
+            data = self._record_hours([shift], corrected_by)
+            return {
+                "success": True,
+                "data": data,
+                "message": "Assignment corrected successfully"
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to correct assignment"
+            }
+
+    def _record_hours(self, shifts: List[Shift], calculated_by: Optional[int]) -> Dict[str, Any]:
+        """Write registro_horas for locked shifts and apply the signed delta against what was recorded
+        
+        Hours stay in integer minutes and money in centavos until the
+        repository writes them. Each registro keeps the salario it was valued
+        at, so a later correction takes back exactly what it added.
+        """
+        ids = [s.id for s in shifts]
+        before = self.payroll_repository.load_assignment_hours(ids)
+        salaries = self.payroll_repository.get_salaries(sorted({s.vigilante_id for s in shifts}))
+        registros = [
+            dict(
+                minutes,
+                id_asignacion=s.id,
+                id_vigilante=s.vigilante_id,
+                id_edificio=s.building_id,
+                fecha=s.start_datetime.date(),
+                hora_inicio=s.start_datetime,
+                hora_fin=s.end_datetime,
+                salario_aplicado=salaries.get(s.vigilante_id, 0),
+                calculado_por=calculated_by
+            )
+            for s, minutes in zip(shifts, PayrollCalculationService.split_registro_horas(shifts))
+        ]
+        
+        delta = liquidation_delta(before, registros)
+        counts = self.payroll_repository.save_assignment_hours(shifts, registros, delta)
+        return {
+            "asignaciones": ids,
+            "vigilantes": counts.get("liquidacion_mensual", 0),
+            "edificios": counts.get("liquidacion_edificio", 0),
+            "delta_valor_total": to_float(delta.valor_total)
+        }
+
+    def get_vigilante_totals(self, vigilante_id: int, mes: int, anio: int) -> Dict[str, Any]:
+        """Running monthly totals of a vigilante"""
+        try:
+            totals = self.payroll_repository.get_vigilante_liquidation(vigilante_id, mes, anio)
+            if not totals:
+                return {
+                    "success": False,
+                    "message": "No liquidation for this vigilante and month"
+                }
+            
+            return {
+                "success": True,
+                "data": totals
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to retrieve totals"
+            }
+
+    def get_building_totals(self, building_id: int, mes: int, anio: int) -> Dict[str, Any]:
+        """Running monthly totals of a building"""
+        try:
+            totals = self.payroll_repository.get_building_liquidation(building_id, mes, anio)
+            if not totals:
+                return {
+                    "success": False,
+                    "message": "No liquidation for this building and month"
+                }
+            
+            return {
+                "success": True,
+                "data": totals
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to retrieve totals"
+            }
+
+    def reconcile_month(
+        self,
+        mes: int,
+        anio: int,
+        repair: bool = False,
+        processed_by: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Check a month's running totals against a full recompute and report the drift
+        
+        With repair the recomputed figures replace the accumulated ones when
+        any drift is found.
+        """
+        try:
+            if not 1 <= mes <= 12:
+                return {
+                    "success": False,
+                    "message": "Invalid month, expected 1-12"
+                }
+            
+            started = time.perf_counter()
+            expected = liquidate_month(mes, anio, self.payroll_repository.load_month_hours(mes, anio))
+            vigilantes, buildings = self.payroll_repository.load_month_liquidation(mes, anio)
+            drift = compare_liquidations(expected, vigilantes, buildings)
+            repaired = False
+            if repair and not drift.clean:
+                expected = expected.including(vigilantes['id_vigilante'], buildings['id_edificio'])
+                self.payroll_repository.upsert_liquidation(expected, processed_by)
+                repaired = True
+            
+            return {
+                "success": True,
+                "data": {
+                    "mes": mes,
+                    "anio": anio,
+                    "clean": drift.clean,
+                    "repaired": repaired,
+                    "vigilantes": self._drift_to_json(drift.vigilantes),
+                    "edificios": self._drift_to_json(drift.buildings),
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+                },
+                "message": "No drift found" if drift.clean else "Drift found between running totals and recompute"
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to reconcile payroll"
+            }
+
+    @staticmethod
+    def _drift_to_json(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drift entries with their integer hundredths as hours and pesos"""
+        return [
+            dict(entry, **{k: to_float(entry[k]) for k in ('accumulated', 'expected', 'difference')})
+            for entry in entries
+        ]
+
+
+class ReferenceDataService:
+    """Application service for shift types and system settings"""
+    
+    # API names of the settings and their configuracion_sistema columns
+    SETTINGS = {
+        'minimum_rest_hours': 'minimo_horas_descanso',
+        'last_backup': 'ultimo_backup',
+        'last_quarterly_cleanup': 'ultima_limpieza_trimestral'
+    }
+    
+    def __init__(self, shift_type_repository, system_config_repository):
+        self.shift_type_repository = shift_type_repository
+        self.system_config_repository = system_config_repository
+
+    def get_shift_types(self) -> Dict[str, Any]:
+        """All shift types"""
+        try:
+            shift_types = self.shift_type_repository.get_all()
+            return {
+                "success": True,
+                "data": shift_types,
+                "count": len(shift_types)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def get_system_config(self) -> Dict[str, Any]:
+        """Settings in force"""
+        try:
+            config = self.system_config_repository.get_current()
+            if not config:
+                return {
+                    "success": False,
+                    "message": "System configuration not found"
+                }
+            return {
+                "success": True,
+                "data": config
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def update_system_config(self, data: Dict[str, Any], updated_by: Optional[int] = None) -> Dict[str, Any]:
+        """Change minimum_rest_hours (1-12) and the last_backup / last_quarterly_cleanup dates"""
+        changes = {}
+        try:
+            for key, column in self.SETTINGS.items():
+                if key not in data:
+                    continue
+                if key == 'minimum_rest_hours':
+                    hours = int(data[key])
+                    if not 1 <= hours <= 12:
+                        raise ValueError("minimum_rest_hours must be between 1 and 12")
+                    changes[column] = hours
+                else:
+                    changes[column] = date.fromisoformat(data[key]) if data[key] else None
+        except (TypeError, ValueError) as e:
+            return {
+                "success": False,
+                "message": str(e)
+            }
+        if not changes:
+            return {
+                "success": False,
+                "message": f"Provide at least one of {', '.join(self.SETTINGS)}"
+            }
+        config = self.system_config_repository.update(changes, updated_by)
+        if not config:
+            return {
+                "success": False,
+                "message": "Failed to update system configuration"
+            }
+        return {
+            "success": True,
+            "data": config,
+            "message": "System configuration updated successfully"
+        }
+
+
+class ImportService:
+    """Application service for bulk imports of vigilantes and buildings from spreadsheets"""
+    
+    CHUNK_SIZE = 2000
+    # Errors listed in the response; the rejected count covers all of them
+    MAX_REPORTED_ERRORS = 1000
+    
+    def __init__(self, vigilante_repository, building_repository,
+                 on_vigilantes_change: Optional[Callable[[], None]] = None):
+        self.vigilante_repository = vigilante_repository
+        self.building_repository = building_repository
+        self.on_vigilantes_change = on_vigilantes_change or (lambda: None)
+
+    def import_vigilantes(self, headers: List[str], rows, atomic: bool = False) -> Dict[str, Any]:
+        """Create the vigilantes of a spreadsheet's (row number, row) pairs"""
+        result = self._import(self.vigilante_repository, VIGILANTE_IMPORT, 'vigilantes', headers, rows, atomic)
+        if result.get("data", {}).get("created"):
+            self.on_vigilantes_change()
+        return result
+
+    def import_buildings(self, headers: List[str], rows, atomic: bool = False) -> Dict[str, Any]:
+        """Create the buildings of a spreadsheet's (row number, row) pairs"""
+        return self._import(self.building_repository, BUILDING_IMPORT, 'buildings', headers, rows, atomic)
+
+    def _import(self, repository, spec, noun, headers, rows, atomic) -> Dict[str, Any]:
+        """Validate and stage rows chunk by chunk, then publish them in one transaction
+        
+        Each chunk costs one query for the keys already stored and one load
+        (COPY on PostgreSQL); rows stream through, so the file is never held
+        in memory. Rejected rows come back as {row, message} errors, row
+        being the spreadsheet row number; with atomic=True any error
+        rejects the whole file and nothing is created.
+        """
+        missing = missing_headers(spec, headers)
+        if missing:
+            return {
+                "success": False,
+                "message": f"Missing columns: {', '.join(missing)}"
+            }
+        
+        summary = {"received": 0, "created": 0, "rejected": 0, "errors": []}
+        seen = {name: set() for name in spec.unique}
+        staged = repository.start_import()
+        try:
+            for chunk in chunked(rows, self.CHUNK_SIZE):
+                summary["received"] += len(chunk)
+                result = validate_chunk(spec, chunk, repository.existing_keys(unique_values(spec, chunk)), seen)
+                summary["rejected"] += len(result.errors)
+                summary["errors"].extend(result.errors[:self.MAX_REPORTED_ERRORS - len(summary["errors"])])
+                if not (atomic and summary["rejected"]):
+                    staged.stage(result.rows)
+            
+            if atomic and summary["rejected"]:
+                staged.abort()
+                return {
+                    "success": False,
+                    "data": summary,
+                    "message": f"File rejected; no {noun} were created"
+                }
+            summary["created"] = repository.finish_import(staged)
+        except Exception as e:
+            staged.abort()
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"Failed to import {noun}"
+            }
+        
+        # Rows whose key was registered by someone else while this import ran
+        concurrent = staged.staged - summary["created"]
+        if concurrent:
+            summary["rejected"] += concurrent
+            summary["errors"].append({"row": None, "message": f"{concurrent} rows were registered concurrently and skipped"})
+        return {
+            "success": True,
+            "data": summary,
+            "message": f"{summary['created']} {noun} created, {summary['rejected']} rejected"
+        }
+
 class UserService:
     """Application service for User operations and authentication"""
     
@@ -0,0 +1,8 @@
+"""
+ASGI entry point with the async read API:
+
+    hypercorn app.asgi:app --bind 0.0.0.0:5000
+"""
+from app.main import create_app
+
+app = create_app('async')
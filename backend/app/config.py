@@ -9,4 +9,31 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'your_jwt_secret_key'
     CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL') or 'redis://localhost:6379/0'
     CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND') or 'redis://localhost:6379/0'
-    BACKUP_DIRECTORY = os.environ.get('BACKUP_DIRECTORY') or '/path/to/backup'
\ No newline at end of file
+    BACKUP_DIRECTORY = os.environ.get('BACKUP_DIRECTORY') or '/path/to/backup'
+    PLANNER_WORKERS = int(os.environ.get('PLANNER_WORKERS') or 1)
+    PLANNER_SEED = int(os.environ.get('PLANNER_SEED') or 0)
+    # Building clusters of the parallel planner, independent of the worker count
+    PLANNER_CLUSTERS = int(os.environ.get('PLANNER_CLUSTERS') or 8)
+
+    # Connection pool of the API's engine
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 5)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 10)
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT') or 30)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 1800)
+    DB_POOL_PRE_PING = (os.environ.get('DB_POOL_PRE_PING') or 'true').lower() in ('1', 'true', 'yes')
+
+    # Read replicas, comma-separated; read-only repository calls are spread over them
+    DATABASE_REPLICA_URLS = [url.strip() for url in (os.environ.get('DATABASE_REPLICA_URLS') or '').split(',') if url.strip()]
+
+    # Primary of the async read API; defaults to DATABASE_URL with its async driver
+    ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL')
+
+    # Repository cache: per-process LRU, shared through Redis when REDIS_URL is set
+    REDIS_URL = os.environ.get('REDIS_URL')
+    CACHE_ENABLED = (os.environ.get('CACHE_ENABLED') or 'true').lower() in ('1', 'true', 'yes')
+    CACHE_TTL_SECONDS = float(os.environ.get('CACHE_TTL_SECONDS') or 300)
+    CACHE_LOCAL_ENTRIES = int(os.environ.get('CACHE_LOCAL_ENTRIES') or 1024)
+    CACHE_VERSION_CHECK_SECONDS = float(os.environ.get('CACHE_VERSION_CHECK_SECONDS') or 1)
+
+    # Seconds a year of festivos_colombia stays cached in each process; 0 keeps it until refreshed
+    HOLIDAY_CACHE_TTL_SECONDS = float(os.environ.get('HOLIDAY_CACHE_TTL_SECONDS') or 3600)
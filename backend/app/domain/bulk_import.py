@@ -0,0 +1,241 @@
+"""
+Bulk import of vigilantes and buildings
+Rows read from a spreadsheet are parsed and validated one chunk at a time;
+uniqueness is checked against the rows seen earlier in the file and against
+the keys already stored, which the caller looks up once per chunk
+"""
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+
+Parser = Callable[[Any], Any]
+
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+# 1234,56 or 1.234,56 (dots only as thousands separators); 1234.56 is left alone
+_DECIMAL_COMMA = re.compile(r'^\d{1,3}(\.\d{3})+(,\d+)?$|^\d+,\d+$')
+
+
+class DecimalCommaText(str):
+    """A cell of a file that writes numbers with a decimal comma and dot thousands (1.234,56)"""
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def text(max_length: int) -> Parser:
+    def parse(value):
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)  # phone and id numbers typed as numbers in a spreadsheet
+        value = str(value).strip()
+        if len(value) > max_length:
+            raise ValueError(f"at most {max_length} characters")
+        return value
+    return parse
+
+
+def email(value: Any) -> str:
+    value = str(value).strip().lower()
+    if len(value) > 100 or not _EMAIL.match(value):
+        raise ValueError("not a valid email address")
+    return value
+
+
+def integer(minimum: Optional[int] = None, maximum: Optional[int] = None) -> Parser:
+    def parse(value):
+        if isinstance(value, float):
+            if not value.is_integer():
+                raise ValueError("must be a whole number")
+            value = int(value)
+        try:
+            value = int(str(value).strip())
+        except ValueError:
+            raise ValueError("must be a whole number")
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            raise ValueError(f"must be between {minimum} and {maximum}")
+        return value
+    return parse
+
+
+def money(value: Any) -> Decimal:
+    if isinstance(value, DecimalCommaText) and _DECIMAL_COMMA.match(value.strip()):
+        value = value.strip().replace('.', '').replace(',', '.')
+    try:
+        amount = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError("must be a number")
+    if not amount.is_finite() or amount < 0 or amount >= Decimal('1e8'):
+        raise ValueError("must be between 0 and 99999999.99")
+    return amount.quantize(Decimal('0.01'))
+
+
+def iso_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        raise ValueError("must be a date (YYYY-MM-DD)")
+
+
+def choice(*values: str) -> Parser:
+    def parse(value):
+        value = str(value).strip()
+        if value not in values:
+            raise ValueError(f"must be one of {', '.join(values)}")
+        return value
+    return parse
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    """Columns of one table as they appear in the file
+
+    columns maps each column to its parser and whether it is required;
+    unique lists the columns that may not repeat in the file nor match a
+    stored row. defaults are added to every valid row.
+    """
+    table: str
+    columns: Mapping[str, Tuple[Parser, bool]]
+    unique: Tuple[str, ...] = ()
+    defaults: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def required(self) -> List[str]:
+        return [name for name, (_, required) in self.columns.items() if required]
+
+
+VIGILANTE_IMPORT = ImportSpec(
+    table='vigilantes',
+    columns={
+        'nombre_completo': (text(100), True),
+        'numero_identificacion': (text(20), True),
+        'fecha_nacimiento': (iso_date, True),
+        'telefono_celular': (text(20), True),
+        'correo_electronico': (email, False),
+        'direccion_calle': (integer(0), True),
+        'direccion_carrera': (integer(0), True),
+        'direccion_completa': (text(255), True),
+        'contacto_emergencia_nombre': (text(100), True),
+        'contacto_emergencia_telefono': (text(20), True),
+        'tipo_contrato': (choice('fijo_full_time', 'relevo_part_time'), True),
+        'edificios': (text(50), True),
+        'salario': (money, True),
+        'fecha_contratacion': (iso_date, True),
+    },
+    unique=('numero_identificacion', 'correo_electronico'),
+    defaults={'activo': True},
+)
+
+BUILDING_IMPORT = ImportSpec(
+    table='edificios',
+    columns={
+        'nombre': (text(100), True),
+        'direccion_calle': (integer(0), True),
+        'direccion_carrera': (integer(0), True),
+        'direccion_completa': (text(255), True),
+        'telefono': (text(20), False),
+        'administrador': (text(100), False),
+        'telefono_administrador': (text(20), False),
+        'tipo_turno': (choice('8_horas', '12_horas', '24_horas'), True),
+        'horas_semanales': (integer(40, 48), True),
+    },
+    # No constraint in the schema, but one building per address keeps re-imports idempotent
+    unique=('direccion_completa',),
+    defaults={'activo': True},
+)
+
+
+def missing_headers(spec: ImportSpec, headers: Iterable[str]) -> List[str]:
+    """Required columns absent from the file's header row"""
+    present = set(headers)
+    return [name for name in spec.required if name not in present]
+
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk: List[Any] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_row(spec: ImportSpec, raw: Mapping[str, Any]) -> Dict[str, Any]:
+    """Typed values of one row; ValueError names the first bad column"""
+    row = {}
+    for name, (parser, required) in spec.columns.items():
+        value = raw.get(name)
+        if _blank(value):
+            if required:
+                raise ValueError(f"{name} is required")
+            row[name] = None
+            continue
+        try:
+            row[name] = parser(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{name} {e}")
+    return row
+
+
+def unique_values(spec: ImportSpec, rows: Iterable[Mapping[str, Any]]) -> Dict[str, Set[Any]]:
+    """Values of each unique column in rows that parse, for the one stored-keys lookup of a chunk"""
+    values: Dict[str, Set[Any]] = {name: set() for name in spec.unique}
+    for _, raw in rows:
+        for name in spec.unique:
+            parser, _ = spec.columns[name]
+            try:
+                if not _blank(raw.get(name)):
+                    values[name].add(parser(raw[name]))
+            except (TypeError, ValueError):
+                pass
+    return values
+
+
+@dataclass
+class ImportChunk:
+    """Rows of a chunk ready to load and one error per rejected row"""
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def validate_chunk(
+    spec: ImportSpec,
+    rows: Iterable[Tuple[int, Mapping[str, Any]]],
+    stored: Mapping[str, Set[Any]],
+    seen: Dict[str, Set[Any]]
+) -> ImportChunk:
+    """Parse and check a chunk of (row number, raw row) pairs
+
+    stored holds the values of the unique columns already in the table; seen
+    collects those of the rows accepted so far and is updated in place, so
+    of two rows sharing a key the first one wins.
+    """
+    chunk = ImportChunk()
+    for number, raw in rows:
+        try:
+            row = parse_row(spec, raw)
+        except ValueError as e:
+            chunk.errors.append({"row": number, "message": str(e)})
+            continue
+        duplicate = next(
+            (name for name in spec.unique if row[name] is not None and (row[name] in seen[name] or row[name] in stored.get(name, ()))),
+            None
+        )
+        if duplicate is not None:
+            where = "earlier in the file" if row[duplicate] in seen[duplicate] else "already registered"
+            chunk.errors.append({"row": number, "message": f"{duplicate} {row[duplicate]} is {where}"})
+            continue
+        for name in spec.unique:
+            if row[name] is not None:
+                seen[name].add(row[name])
+        row.update(spec.defaults)
+        chunk.rows.append(row)
+    return chunk
@@ -0,0 +1,48 @@
+"""
+Fixed-point payroll units
+Money is carried in integer centavos, durations in integer minutes and
+stored hours in integer hundredths of an hour. Decimals and floats only
+appear where rows meet NUMERIC columns or JSON.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Union
+
+import numpy as np
+
+
+MINUTES_PER_HOUR = 60
+HUNDREDTHS = 100
+
+Integers = Union[int, np.ndarray]
+
+
+def divide_rounded(numerator: Integers, denominator: int) -> Integers:
+    """numerator / denominator rounded half away from zero, on ints or int64 arrays"""
+    if isinstance(numerator, np.ndarray):
+        magnitude = (2 * np.abs(numerator) + denominator) // (2 * denominator)
+        return np.sign(numerator) * magnitude
+    if numerator >= 0:
+        return (2 * numerator + denominator) // (2 * denominator)
+    return -((denominator - 2 * numerator) // (2 * denominator))
+
+
+def minutes_to_hundredths(minutes: Integers) -> Integers:
+    """Hours as NUMERIC(5,2) stores them, in hundredths"""
+    return divide_rounded(minutes * HUNDREDTHS, MINUTES_PER_HOUR)
+
+
+def to_hundredths(value) -> int:
+    """A NUMERIC(…,2) value (Decimal, float, str or None) as an integer count of hundredths"""
+    if value is None:
+        return 0
+    return int(Decimal(str(value)).scaleb(2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def to_decimal(hundredths: Integers) -> Decimal:
+    """Integer hundredths (centavos or hundredths of an hour) as a two-place Decimal for the database"""
+    return Decimal(int(hundredths)).scaleb(-2)
+
+
+def to_float(hundredths: Integers) -> float:
+    """Integer hundredths as a float for JSON"""
+    return int(hundredths) / HUNDREDTHS
@@ -0,0 +1,88 @@
+"""
+Holiday calendar
+Process-wide cache of festivos_colombia, one bitmap per year, so holiday
+checks in hour and payroll calculations rarely hit the database
+"""
+import threading
+import time
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+HolidayLoader = Callable[[int], Iterable[date]]
+
+
+class HolidayCalendar:
+    """Holidays as one integer bitmap per year, bit n set for day-of-year n + 1
+
+    Years are loaded lazily through the loader the first time a date in them
+    is checked and kept until refresh() is called or, with ttl_seconds, until
+    they are that old. refresh() only clears this process, so other
+    processes see festivos_colombia changes once their copy expires. Without
+    a loader the calendar is empty. Sundays are not holidays here; callers that pay
+    dominicales like festivos check the weekday themselves.
+    """
+
+    def __init__(self, loader: Optional[HolidayLoader] = None, ttl_seconds: Optional[float] = None):
+        self._loader = loader
+        self._ttl = ttl_seconds or None
+        self._years: Dict[int, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def set_loader(self, loader: Optional[HolidayLoader], ttl_seconds: Optional[float] = None) -> None:
+        """Point the calendar at a new source and drop everything cached"""
+        with self._lock:
+            self._loader = loader
+            self._ttl = ttl_seconds or None
+            self._years.clear()
+
+    def refresh(self, year: Optional[int] = None) -> None:
+        """Forget one year, or every year, after festivos_colombia changes"""
+        with self._lock:
+            if year is None:
+                self._years.clear()
+            else:
+                self._years.pop(year, None)
+
+    def _fresh(self, year: int) -> Optional[int]:
+        entry = self._years.get(year)
+        if entry is None or (self._ttl is not None and time.monotonic() - entry[1] >= self._ttl):
+            return None
+        return entry[0]
+
+    def _bitmap(self, year: int) -> int:
+        bitmap = self._fresh(year)
+        if bitmap is None:
+            with self._lock:
+                bitmap = self._fresh(year)
+                if bitmap is None:
+                    bitmap = 0
+                    for day in (self._loader(year) if self._loader else ()):
+                        if day.year == year:
+                            bitmap |= 1 << (day.timetuple().tm_yday - 1)
+                    self._years[year] = (bitmap, time.monotonic())
+        return bitmap
+
+    def is_holiday(self, day: date) -> bool:
+        return bool(self._bitmap(day.year) >> (day.timetuple().tm_yday - 1) & 1)
+
+    def holidays(self, year: int) -> List[date]:
+        """A year's holidays in date order"""
+        bitmap = self._bitmap(year)
+        first = date(year, 1, 1).toordinal()
+        return [date.fromordinal(first + bit) for bit in range(bitmap.bit_length()) if bitmap >> bit & 1]
+
+    def ordinals(self, start: date, end: date) -> np.ndarray:
+        """Sorted proleptic ordinals of the holidays in [start, end], for vectorized lookups"""
+        days = [
+            day.toordinal()
+            for year in range(start.year, end.year + 1)
+            for day in self.holidays(year)
+            if start <= day <= end
+        ]
+        return np.array(days, dtype=np.int64)
+
+
+holiday_calendar = HolidayCalendar()
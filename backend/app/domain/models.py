@@ -1,7 +1,9 @@
 from datetime import datetime
 from typing import List, Optional
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from .skills import skill_registry
 
 
 class StatusEnum(str, Enum):
@@ -33,6 +35,13 @@ class Vigilante:
     contract_end: datetime
     address: Optional[str] = None
     emergency_contact: Optional[str] = None
+    street_number: Optional[int] = None  # direccion_calle
+    avenue_number: Optional[int] = None  # direccion_carrera
+    # skill_registry mask of skills, computed when the entity is built
+    skill_mask: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.skill_mask = skill_registry.mask(self.skills)
     
     def is_active(self) -> bool:
         return self.status == StatusEnum.ACTIVE
@@ -59,6 +68,15 @@ class Building:
     contact_person: str
     contact_phone: str
     status: StatusEnum
+    shift_type: str = "8_horas"  # tipo_turno: "8_horas", "12_horas" or "24_horas"
+    weekly_hours: int = 48
+    street_number: Optional[int] = None  # direccion_calle
+    avenue_number: Optional[int] = None  # direccion_carrera
+    # skill_registry mask of security_requirements, computed when the entity is built
+    requirement_mask: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.requirement_mask = skill_registry.requirement_mask(self.security_requirements)
     
     def is_active(self) -> bool:
         return self.status == StatusEnum.ACTIVE
@@ -88,6 +106,21 @@ class Shift:
         return self.shift_type == ShiftTypeEnum.OVERTIME
 
 
+@dataclass
+class Novedad:
+    """Domain entity for an incident or absence (novedades)"""
+    id: Optional[int]
+    vigilante_id: int
+    building_id: int
+    start_datetime: datetime
+    end_datetime: datetime
+    novedad_type: str  # "ausencia", "incapacidad", "permiso", ...
+    shift_id: Optional[int] = None
+    replacement_vigilante_id: Optional[int] = None
+    description: Optional[str] = None
+    status: str = "pendiente"  # "pendiente", "resuelta", "cancelada"
+
+
 @dataclass
 class User:
     """Domain entity for System User"""
@@ -0,0 +1,402 @@
+"""
+Roster optimization
+Anytime simulated annealing over a generated roster: moves shifts between
+vigilantes to cut overtime cost, rest violations and load imbalance, and
+returns the best roster found when the time budget runs out
+"""
+import math
+import random
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import Vigilante, Building, Shift
+from .roster import RosterAssignment
+from .holidays import HolidayCalendar, holiday_calendar
+
+
+WEEK_SECONDS = 7 * 24 * 3600
+# PayrollCalculationService defaults when a building has no explicit rate
+OVERTIME_FACTOR = 1.5
+HOLIDAY_FACTOR = 2.0
+TIME_CHECK_INTERVAL = 512
+
+
+@dataclass
+class OptimizationResult:
+    """Best roster found and how it compares with the starting one"""
+    assignments: List[RosterAssignment]
+    initial_cost: float
+    best_cost: float
+    breakdown: Dict[str, float] = field(default_factory=dict)
+    iterations: int = 0
+    accepted: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def improvement(self) -> float:
+        return self.initial_cost - self.best_cost
+
+
+class RosterOptimizer:
+    """Simulated annealing over who works each shift
+
+    The objective adds up:
+    - overtime: hours over the weekly cap per vigilante and week, priced at
+      the hour-weighted overtime rate of that week's shifts (holiday rate for
+      shifts starting on a Sunday or a calendar holiday). The cap is the
+      lowest horas_semanales among the buildings worked that week, the same
+      per-building cap the planner avoids exceeding; weekly_hours only
+      applies to shifts at buildings the optimizer was not given
+    - rest: rest_penalty per pair of consecutive shifts of a vigilante with
+      less than rest_hours between them
+    - balance: balance_weight x the sum of squared monthly hours per
+      vigilante, which is lowest when hours are spread evenly
+
+    Moves reassign one shift to another qualified vigilante or swap the
+    vigilantes of two shifts. Each vigilante's shifts are kept in a list
+    sorted by start, so a move's delta only looks at the neighbours found by
+    bisection and at that vigilante's week totals.
+    """
+
+    def __init__(
+        self,
+        buildings: List[Building],
+        vigilantes: List[Vigilante],
+        previous_shifts: Iterable[Shift] = (),
+        rest_hours: int = 12,
+        weekly_hours: float = 48,
+        calendar: HolidayCalendar = holiday_calendar,
+        rest_penalty: Optional[float] = None,
+        balance_weight: Optional[float] = None,
+        seed: int = 0
+    ):
+        self.vigilantes = [v for v in vigilantes if v.is_active()]
+        self.buildings = {b.id: b for b in buildings}
+        self.previous_shifts = list(previous_shifts)
+        self.rest_seconds = rest_hours * 3600
+        self.weekly_hours = weekly_hours
+        self.calendar = calendar
+        self.seed = seed
+
+        # Penalties scale with the going hourly rate so the terms stay comparable
+        rates = [b.hourly_rate for b in buildings if b.hourly_rate]
+        unit = sum(rates) / len(rates) if rates else 1.0
+        self.rest_penalty = rest_penalty if rest_penalty is not None else 1000 * unit
+        self.balance_weight = balance_weight if balance_weight is not None else 0.01 * unit
+
+    def overtime_price(self, building: Optional[Building], start: datetime) -> float:
+        """Cost of one overtime hour of a shift at this building"""
+        if building is None:
+            return OVERTIME_FACTOR
+        base = building.hourly_rate or 1.0
+        if start.weekday() == 6 or self.calendar.is_holiday(start.date()):
+            return building.holiday_rate or base * HOLIDAY_FACTOR
+        return building.overtime_rate or base * OVERTIME_FACTOR
+
+    def optimize(self, assignments: List[RosterAssignment], time_budget_ms: float = 1000) -> OptimizationResult:
+        """Improve a roster until time_budget_ms elapses; never returns a worse one"""
+        started = time.perf_counter()
+        if not assignments or not self.vigilantes:
+            return OptimizationResult(list(assignments), 0.0, 0.0, elapsed_ms=0.0)
+
+        state = _RosterState(self, assignments)
+        initial_cost = state.cost
+        rng = random.Random(self.seed)
+        deadline = started + time_budget_ms / 1000
+
+        temperature_start = state.sample_temperature(rng)
+        temperature_end = temperature_start * 1e-3
+        temperature = temperature_start
+
+        best_cost = state.cost
+        undo_log: List[Tuple[int, int]] = []
+        iterations = accepted = 0
+        n_shifts = len(state.owner)
+
+        while True:
+            if iterations % TIME_CHECK_INTERVAL == 0:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                progress = (now - started) / (deadline - started)
+                temperature = temperature_start * (temperature_end / temperature_start) ** progress
+            iterations += 1
+
+            i = rng.randrange(n_shifts)
+            if rng.random() < 0.5:
+                candidates = state.eligible[state.building_of[i]]
+                if not candidates:
+                    continue
+                target = candidates[rng.randrange(len(candidates))]
+                if target == state.owner[i] or not state.available(i, target):
+                    continue
+                delta = state.reassign_delta(i, target)
+                if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                    undo_log.append((i, state.owner[i]))
+                    state.move(i, target, delta)
+                    accepted += 1
+            else:
+                j = rng.randrange(n_shifts)
+                first, second = state.owner[i], state.owner[j]
+                if first == second or not (state.qualified(i, second) and state.qualified(j, first)):
+                    continue
+                delta = state.reassign_delta(i, second)
+                state.move(i, second, delta)
+                second_delta = state.reassign_delta(j, first)
+                delta += second_delta
+                if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                    state.move(j, first, second_delta)
+                    undo_log.append((i, first))
+                    undo_log.append((j, second))
+                    accepted += 1
+                else:
+                    state.move(i, first, state.reassign_delta(i, first))
+
+            if state.cost < best_cost - 1e-9:
+                best_cost = state.cost
+                undo_log.clear()
+
+        # Roll back to the last best state
+        for i, owner in reversed(undo_log):
+            state.owner[i] = owner
+
+        best = [
+            RosterAssignment(
+                vigilante_id=self.vigilantes[state.owner[i]].id,
+                building_id=a.building_id,
+                shift_type_id=a.shift_type_id,
+                start_datetime=a.start_datetime,
+                end_datetime=a.end_datetime
+            )
+            for i, a in enumerate(state.assignments)
+        ]
+        breakdown = _RosterState(self, best).breakdown()
+        return OptimizationResult(
+            assignments=best,
+            initial_cost=initial_cost,
+            best_cost=sum(breakdown.values()),
+            breakdown=breakdown,
+            iterations=iterations,
+            accepted=accepted,
+            elapsed_ms=(time.perf_counter() - started) * 1000
+        )
+
+
+class _RosterState:
+    """Mutable roster with incrementally maintained objective terms"""
+
+    def __init__(self, optimizer: RosterOptimizer, assignments: List[RosterAssignment]):
+        self.optimizer = optimizer
+        self.assignments = list(assignments)
+        vigilantes = optimizer.vigilantes
+        column = {v.id: j for j, v in enumerate(vigilantes)}
+
+        starts = [a.start_datetime for a in self.assignments]
+        starts.extend(s.start_datetime for s in optimizer.previous_shifts)
+        first = min(starts)
+        # Weeks run Monday to Sunday
+        self.origin = datetime.combine(first.date() - timedelta(days=first.weekday()), datetime.min.time())
+
+        self.contract = [(self._seconds(v.contract_start), self._seconds(v.contract_end)) for v in vigilantes]
+        self.masks = [v.skill_mask for v in vigilantes]
+
+        building_ids = list(optimizer.buildings)
+        building_row = {building_id: k for k, building_id in enumerate(building_ids)}
+        self.required = [optimizer.buildings[b].requirement_mask for b in building_ids]
+        self.eligible = [
+            [j for j, mask in enumerate(self.masks) if mask & required == required]
+            for required in self.required
+        ]
+
+        n_vigilantes = len(vigilantes)
+        self.sequences: List[List[Tuple[float, float, int]]] = [[] for _ in range(n_vigilantes)]
+        self.week_hours: List[Dict[int, float]] = [{} for _ in range(n_vigilantes)]
+        self.week_price: List[Dict[int, float]] = [{} for _ in range(n_vigilantes)]
+        self.week_caps: List[Dict[int, Counter]] = [{} for _ in range(n_vigilantes)]
+        self.total_hours = [0.0] * n_vigilantes
+
+        self.start, self.end, self.hours, self.price, self.week, self.cap = [], [], [], [], [], []
+        self.owner: List[int] = []
+        self.building_of: List[int] = []
+        for a in self.assignments:
+            building = optimizer.buildings.get(a.building_id)
+            self._add_shift(a.start_datetime, a.end_datetime, optimizer.overtime_price(building, a.start_datetime),
+                            self._weekly_cap(building))
+            self.building_of.append(building_row.get(a.building_id, 0))
+            self.owner.append(column[a.vigilante_id])
+
+        # Shifts before the horizon are fixed: they count for rest and overtime only
+        fixed = []
+        for shift in optimizer.previous_shifts:
+            j = column.get(shift.vigilante_id)
+            if j is None:
+                continue
+            building = optimizer.buildings.get(shift.building_id)
+            fixed.append((j, len(self.start)))
+            self._add_shift(shift.start_datetime, shift.end_datetime,
+                            optimizer.overtime_price(building, shift.start_datetime), self._weekly_cap(building))
+
+        for i, j in enumerate(self.owner):
+            self._insert(i, j)
+        for j, i in fixed:
+            self._insert(i, j, counts_for_balance=False)
+
+        self.cost = sum(self.breakdown().values())
+
+    def _seconds(self, moment: datetime) -> float:
+        return (moment - self.origin).total_seconds()
+
+    def _weekly_cap(self, building: Optional[Building]) -> float:
+        return building.weekly_hours if building is not None else self.optimizer.weekly_hours
+
+    def _add_shift(self, start: datetime, end: datetime, price: float, cap: float) -> None:
+        start_seconds, end_seconds = self._seconds(start), self._seconds(end)
+        self.start.append(start_seconds)
+        self.end.append(end_seconds)
+        self.hours.append((end_seconds - start_seconds) / 3600)
+        self.price.append(price)
+        self.week.append(int(start_seconds // WEEK_SECONDS))
+        self.cap.append(cap)
+
+    def _insert(self, i: int, j: int, counts_for_balance: bool = True) -> None:
+        sequence = self.sequences[j]
+        key = (self.start[i], self.end[i], i)
+        sequence.insert(bisect_left(sequence, key), key)
+        week = self.week[i]
+        self.week_hours[j][week] = self.week_hours[j].get(week, 0.0) + self.hours[i]
+        self.week_price[j][week] = self.week_price[j].get(week, 0.0) + self.hours[i] * self.price[i]
+        self.week_caps[j].setdefault(week, Counter())[self.cap[i]] += 1
+        if counts_for_balance:
+            self.total_hours[j] += self.hours[i]
+
+    def _remove(self, i: int, j: int) -> None:
+        sequence = self.sequences[j]
+        del sequence[bisect_left(sequence, (self.start[i], self.end[i], i))]
+        week = self.week[i]
+        self.week_hours[j][week] -= self.hours[i]
+        self.week_price[j][week] -= self.hours[i] * self.price[i]
+        caps = self.week_caps[j][week]
+        caps[self.cap[i]] -= 1
+        if not caps[self.cap[i]]:
+            del caps[self.cap[i]]
+        self.total_hours[j] -= self.hours[i]
+
+    def _week_cap(self, j: int, week: int, without: Optional[float] = None) -> float:
+        """Lowest building cap among vigilante j's shifts that week, leaving out one shift of cap without"""
+        caps = self.week_caps[j].get(week)
+        if not caps:
+            return math.inf
+        return min((cap for cap, count in caps.items() if count > (cap == without)), default=math.inf)
+
+    @staticmethod
+    def _overtime(hours: float, price: float, cap: float) -> float:
+        excess = hours - cap
+        return excess * price / hours if excess > 0 else 0.0
+
+    def _violation(self, earlier: Tuple[float, float, int], later: Tuple[float, float, int]) -> int:
+        return 1 if later[0] - earlier[1] < self.optimizer.rest_seconds else 0
+
+    def available(self, i: int, j: int) -> bool:
+        contract_start, contract_end = self.contract[j]
+        return contract_start <= self.start[i] <= contract_end
+
+    def qualified(self, i: int, j: int) -> bool:
+        required = self.required[self.building_of[i]]
+        return self.masks[j] & required == required and self.available(i, j)
+
+    def reassign_delta(self, i: int, target: int) -> float:
+        """Objective change of moving shift i to vigilante target, without applying it"""
+        optimizer = self.optimizer
+        source = self.owner[i]
+        key = (self.start[i], self.end[i], i)
+        hours, week, cost, cap = self.hours[i], self.week[i], self.hours[i] * self.price[i], self.cap[i]
+
+        violations = 0
+        sequence = self.sequences[source]
+        position = bisect_left(sequence, key)
+        before = sequence[position - 1] if position > 0 else None
+        after = sequence[position + 1] if position + 1 < len(sequence) else None
+        if before:
+            violations -= self._violation(before, key)
+        if after:
+            violations -= self._violation(key, after)
+        if before and after:
+            violations += self._violation(before, after)
+
+        sequence = self.sequences[target]
+        position = bisect_left(sequence, key)
+        before = sequence[position - 1] if position > 0 else None
+        after = sequence[position] if position < len(sequence) else None
+        if before:
+            violations += self._violation(before, key)
+        if after:
+            violations += self._violation(key, after)
+        if before and after:
+            violations -= self._violation(before, after)
+
+        source_hours = self.week_hours[source][week]
+        source_price = self.week_price[source][week]
+        target_hours = self.week_hours[target].get(week, 0.0)
+        target_price = self.week_price[target].get(week, 0.0)
+        source_cap = self._week_cap(source, week)
+        target_cap = self._week_cap(target, week)
+        overtime = (
+            self._overtime(source_hours - hours, source_price - cost, self._week_cap(source, week, without=cap))
+            - self._overtime(source_hours, source_price, source_cap)
+            + self._overtime(target_hours + hours, target_price + cost, min(target_cap, cap))
+            - self._overtime(target_hours, target_price, target_cap)
+        )
+
+        source_total, target_total = self.total_hours[source], self.total_hours[target]
+        balance = 2 * hours * (hours + target_total - source_total)
+
+        return overtime + optimizer.rest_penalty * violations + optimizer.balance_weight * balance
+
+    def move(self, i: int, target: int, delta: float) -> None:
+        self._remove(i, self.owner[i])
+        self._insert(i, target)
+        self.owner[i] = target
+        self.cost += delta
+
+    def sample_temperature(self, rng: random.Random, samples: int = 200) -> float:
+        """Starting temperature: median size of random worsening moves
+
+        Moves that break a rest constraint are left out, otherwise the
+        penalty would set a temperature that accepts violations freely.
+        """
+        worsening = []
+        for _ in range(samples):
+            i = rng.randrange(len(self.owner))
+            candidates = self.eligible[self.building_of[i]]
+            if not candidates:
+                continue
+            target = candidates[rng.randrange(len(candidates))]
+            if target != self.owner[i] and self.available(i, target):
+                delta = self.reassign_delta(i, target)
+                if 0 < delta < self.optimizer.rest_penalty:
+                    worsening.append(delta)
+        worsening.sort()
+        return worsening[len(worsening) // 2] if worsening else 1.0
+
+    def breakdown(self) -> Dict[str, float]:
+        """Objective terms computed from scratch"""
+        optimizer = self.optimizer
+        overtime = sum(
+            self._overtime(hours, self.week_price[j][week], self._week_cap(j, week))
+            for j, weeks in enumerate(self.week_hours)
+            for week, hours in weeks.items()
+        )
+        violations = sum(
+            self._violation(sequence[k], sequence[k + 1])
+            for sequence in self.sequences
+            for k in range(len(sequence) - 1)
+        )
+        return {
+            "overtime": overtime,
+            "rest": optimizer.rest_penalty * violations,
+            "balance": optimizer.balance_weight * sum(h * h for h in self.total_hours)
+        }
@@ -0,0 +1,48 @@
+"""
+Keyset pagination
+Pages are continued from the sort key of their last row, carried to the
+client as an opaque cursor, so fetching a page costs the same however deep
+into the history it is
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+@dataclass
+class Page:
+    """One page of rows and the cursor of the next one, None on the last page"""
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(start: datetime, row_id: int) -> str:
+    """Opaque token for the (start, id) key of the last row of a page"""
+    payload = json.dumps([start.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """The (start, id) key carried by a cursor; ValueError when it was not made by encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        start, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(start), int(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def page_size(limit: Optional[Any]) -> int:
+    """A requested page size clamped to [1, MAX_PAGE_SIZE]"""
+    if limit in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    try:
+        return max(1, min(int(limit), MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
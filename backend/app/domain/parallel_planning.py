@@ -0,0 +1,355 @@
+"""
+Parallel monthly planning
+Splits buildings into clusters on the calle/carrera grid, solves each
+cluster's month in a worker process and reconciles vigilantes that more
+than one cluster could use
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from .models import Vigilante, Building, Shift
+from .scoring import CandidateScorer, SKILL_WEIGHT, REST_BONUS
+from .roster import (
+    RosterPlanningService, RosterResult, RosterAssignment, ShiftSlot, SHIFT_PATTERNS,
+    INFEASIBLE_COST, LOAD_WINDOW_DAYS, OVERTIME_HOUR_COST
+)
+from .timeline import ShiftTimeline
+
+
+KMEANS_ITERATIONS = 25
+
+# Building clusters per month; fixed so the roster never depends on the worker count
+DEFAULT_CLUSTERS = 8
+
+
+def _coordinates(items: Sequence) -> np.ndarray:
+    """(calle, carrera) per item; NaN where the address grid is unknown"""
+    return np.array(
+        [
+            [
+                item.street_number if item.street_number is not None else np.nan,
+                item.avenue_number if item.avenue_number is not None else np.nan
+            ]
+            for item in items
+        ],
+        dtype=float
+    ).reshape(len(items), 2)
+
+
+def cluster_buildings(buildings: List[Building], n_clusters: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """K-means over the buildings' calle/carrera grid
+
+    Returns (labels, centroids). Buildings without coordinates are placed
+    at the grid mean. Initialisation is seeded so results are reproducible.
+    """
+    coords = _coordinates(buildings)
+    if np.isnan(coords).all():
+        coords = np.zeros_like(coords)
+    coords = np.where(np.isnan(coords), np.nanmean(coords, axis=0), coords)
+    n_clusters = max(1, min(n_clusters, len(buildings)))
+
+    rng = np.random.default_rng(seed)
+    centroids = coords[rng.choice(len(coords), n_clusters, replace=False)]
+    labels = np.zeros(len(coords), dtype=int)
+    for _ in range(KMEANS_ITERATIONS):
+        distances = np.linalg.norm(coords[:, None, :] - centroids[None, :, :], axis=2)
+        labels = distances.argmin(axis=1)
+        updated = np.array([
+            coords[labels == k].mean(axis=0) if np.any(labels == k) else centroids[k]
+            for k in range(n_clusters)
+        ])
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+    return labels, centroids
+
+
+def partition_vigilantes(
+    vigilantes: List[Vigilante],
+    centroids: np.ndarray,
+    demand: np.ndarray,
+    overlap: float = 0.15,
+    seed: int = 0
+) -> List[List[int]]:
+    """Give each vigilante a home cluster, plus any cluster almost as close
+
+    Home clusters are filled nearest-first up to a quota proportional to each
+    cluster's daily slot demand. A vigilante is shared with every other
+    cluster within (1 + overlap) of their nearest centroid, so overlap=0
+    gives disjoint clusters. Returns vigilante indexes per cluster.
+    """
+    n_clusters = len(centroids)
+    members: List[List[int]] = [[] for _ in range(n_clusters)]
+    if not vigilantes:
+        return members
+
+    coords = _coordinates(vigilantes)
+    known = ~np.isnan(coords).any(axis=1)
+    distances = np.full((len(vigilantes), n_clusters), np.inf)
+    distances[known] = np.linalg.norm(coords[known, None, :] - centroids[None, :, :], axis=2)
+
+    # Vigilantes without an address get a seeded random preference order
+    rng = np.random.default_rng(seed)
+    for j in np.flatnonzero(~known):
+        distances[j] = rng.permutation(n_clusters).astype(float)
+
+    share = demand / demand.sum() if demand.sum() else np.full(n_clusters, 1 / n_clusters)
+    quota = np.ceil(share * len(vigilantes)).astype(int)
+    preference = np.argsort(distances, axis=1, kind="stable")
+    order = np.lexsort((np.arange(len(vigilantes)), distances.min(axis=1), ~known))
+
+    for j in order:
+        home = next((k for k in preference[j] if quota[k] > 0), preference[j][0])
+        quota[home] -= 1
+        members[home].append(int(j))
+        if known[j] and overlap > 0:
+            limit = distances[j].min() * (1 + overlap)
+            for k in preference[j]:
+                if k != home and distances[j, k] <= limit:
+                    members[k].append(int(j))
+
+    for cluster in members:
+        cluster.sort()
+    return members
+
+
+def _solve_cluster(args) -> RosterResult:
+    """Worker entry point; module-level so it pickles into the process pool"""
+    mes, anio, buildings, vigilantes, previous_shifts, rest_hours = args
+    return RosterPlanningService.generate_month(mes, anio, buildings, vigilantes, previous_shifts, rest_hours)
+
+
+class ParallelRosterPlanner:
+    """Monthly roster planning fanned out over building clusters
+
+    The output depends on the inputs, seed and cluster count only, never on
+    the worker count; workers=1 solves the clusters inline.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        n_clusters: int = DEFAULT_CLUSTERS,
+        seed: int = 0,
+        overlap: float = 0.15
+    ):
+        self.workers = max(1, workers)
+        self.n_clusters = n_clusters
+        self.seed = seed
+        self.overlap = overlap
+
+    def generate_month(
+        self,
+        mes: int,
+        anio: int,
+        buildings: List[Building],
+        vigilantes: List[Vigilante],
+        previous_shifts: Iterable[Shift] = (),
+        rest_hours: int = 12
+    ) -> RosterResult:
+        buildings = [b for b in buildings if b.is_active()]
+        vigilantes = [v for v in vigilantes if v.is_active()]
+        previous_shifts = list(previous_shifts)
+        if not buildings or not vigilantes:
+            return RosterPlanningService.generate_month(mes, anio, buildings, vigilantes, previous_shifts, rest_hours)
+
+        labels, centroids = cluster_buildings(buildings, self.n_clusters, self.seed)
+        demand = np.zeros(len(centroids))
+        for building, label in zip(buildings, labels):
+            demand[label] += len(SHIFT_PATTERNS.get(building.shift_type, ()))
+        members = partition_vigilantes(vigilantes, centroids, demand, self.overlap, self.seed)
+
+        history: Dict[int, List[Shift]] = {}
+        for shift in previous_shifts:
+            history.setdefault(shift.vigilante_id, []).append(shift)
+
+        tasks = []
+        for k in range(len(centroids)):
+            cluster_vigilantes = [vigilantes[j] for j in members[k]]
+            tasks.append((
+                mes,
+                anio,
+                [b for b, label in zip(buildings, labels) if label == k],
+                cluster_vigilantes,
+                [s for v in cluster_vigilantes for s in history.get(v.id, ())],
+                rest_hours
+            ))
+
+        if self.workers == 1:
+            results = [_solve_cluster(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(_solve_cluster, tasks))
+
+        return self._reconcile(results, buildings, vigilantes, previous_shifts, rest_hours)
+
+    def _reconcile(
+        self,
+        results: List[RosterResult],
+        buildings: List[Building],
+        vigilantes: List[Vigilante],
+        previous_shifts: List[Shift],
+        rest_hours: int
+    ) -> RosterResult:
+        """Drop conflicting picks of shared vigilantes, then refill from the whole pool
+
+        Assignments are replayed in (start, cluster) order so the earliest
+        one keeps a shared vigilante. Dropped and cluster-unfilled slots are
+        then solved again against every vigilante, so a cluster short of
+        vigilantes borrows the idle ones of its neighbours.
+        """
+        timeline = ShiftTimeline(previous_shifts)
+        merged = RosterResult()
+        pending: List[ShiftSlot] = []
+
+        ordered = sorted(
+            ((a.start_datetime, k, i, a) for k, result in enumerate(results) for i, a in enumerate(result.assignments)),
+            key=lambda item: item[:3]
+        )
+        for _, _, _, assignment in ordered:
+            if timeline.has_conflict(
+                assignment.vigilante_id, assignment.start_datetime, assignment.end_datetime, rest_hours
+            ):
+                pending.append(ShiftSlot(
+                    building_id=assignment.building_id,
+                    shift_type_id=assignment.shift_type_id,
+                    start_datetime=assignment.start_datetime,
+                    end_datetime=assignment.end_datetime
+                ))
+                continue
+            timeline.add(assignment.to_shift())
+            merged.assignments.append(assignment)
+
+        for result in results:
+            pending.extend(result.unfilled)
+        if pending:
+            self._refill(pending, merged, buildings, vigilantes, previous_shifts, rest_hours)
+
+        merged.assignments.sort(key=lambda a: (a.start_datetime, a.building_id, a.shift_type_id))
+        return merged
+
+    def _refill(
+        self,
+        pending: List[ShiftSlot],
+        merged: RosterResult,
+        buildings: List[Building],
+        vigilantes: List[Vigilante],
+        previous_shifts: List[Shift],
+        rest_hours: int
+    ) -> None:
+        """Re-solve pending slots day by day as min-cost assignments over every vigilante
+
+        Same costs as RosterPlanningService.generate_month: the negated score
+        (skill match x10, rest bonus, minus starts in the previous 7 days)
+        plus OVERTIME_HOUR_COST per hour over the building's weekly cap in
+        the previous 7 days. Shifts are marked on a (vigilantes x hours) grid
+        so the rest check against shifts on both sides of a slot is one slice
+        per distinct slot time. Shifts off the hour are rounded outwards,
+        which only ever makes the check stricter.
+        """
+        pending = sorted(pending, key=lambda s: (s.start_datetime, s.building_id, s.shift_type_id))
+        rest = timedelta(hours=rest_hours)
+        week_hours = LOAD_WINDOW_DAYS * 24
+        fixed = previous_shifts + merged.assignments
+        origin = pending[0].start_datetime.replace(minute=0, second=0, microsecond=0) - timedelta(hours=week_hours) - rest
+        horizon = max([s.end_datetime for s in pending] + [s.end_datetime for s in fixed]) + rest
+        n_hours = int(math.ceil((horizon - origin).total_seconds() / 3600)) + 1
+
+        scorer = CandidateScorer(vigilantes, origin, rest_hours)
+        column = {v.id: j for j, v in enumerate(vigilantes)}
+
+        def hour_range(start: datetime, end: datetime) -> Tuple[int, int]:
+            """Grid columns of [start, end), clipped; empty for shifts outside the grid"""
+            first = min(max(int(math.floor(scorer.to_seconds(start) / 3600)), 0), n_hours)
+            last = int(math.ceil(scorer.to_seconds(end) / 3600))
+            return first, max(first, min(last, n_hours))
+
+        # Mark the fixed shifts through a difference array in one pass
+        known = [(column[s.vigilante_id], s) for s in fixed if s.vigilante_id in column]
+        marks = np.array(
+            [(j, *hour_range(s.start_datetime, s.end_datetime)) for j, s in known], dtype=int
+        ).reshape(-1, 3)
+        edges = np.zeros((len(vigilantes), n_hours + 1), dtype=np.int32)
+        np.add.at(edges, (marks[:, 0], marks[:, 1]), 1)
+        np.add.at(edges, (marks[:, 0], marks[:, 2]), -1)
+        busy = np.cumsum(edges, axis=1)[:, :n_hours] > 0
+        starts = np.zeros((len(vigilantes), n_hours), dtype=np.int16)
+        inside = (marks[:, 1] < marks[:, 2]) & np.array(
+            [s.start_datetime >= origin for _, s in known], dtype=bool
+        ).reshape(-1)
+        np.add.at(starts, (marks[inside, 0], marks[inside, 1]), 1)
+        # Earliest end per vigilante; the rest bonus needs a shift ending before the slot
+        first_end = np.full(len(vigilantes), np.inf)
+        for j, shift in known:
+            first_end[j] = min(first_end[j], scorer.to_seconds(shift.end_datetime))
+
+        row = {b.id: i for i, b in enumerate(buildings)}
+        weekly_cap = np.array([b.weekly_hours for b in buildings], dtype=float)
+        eligible = scorer.requirements_met(buildings)
+        skill_scores = scorer.skill_matches(buildings) * SKILL_WEIGHT
+
+        days: Dict[date, List[ShiftSlot]] = {}
+        for slot in pending:
+            if slot.building_id in row:
+                days.setdefault(slot.start_datetime.date(), []).append(slot)
+            else:
+                merged.unfilled.append(slot)
+
+        for day_slots in days.values():
+            rows = np.array([row[s.building_id] for s in day_slots])
+            start = np.array([scorer.to_seconds(s.start_datetime) for s in day_slots], dtype=float)
+            duration = np.array([s.get_duration_hours() for s in day_slots], dtype=float)
+
+            # Slots of a day share a handful of times; each window is read once
+            times: Dict[Tuple[datetime, datetime], int] = {}
+            for slot in day_slots:
+                times.setdefault((slot.start_datetime, slot.end_datetime), len(times))
+            free = np.empty((len(times), len(vigilantes)), dtype=bool)
+            worked = np.empty((len(times), len(vigilantes)))
+            recent = np.empty((len(times), len(vigilantes)))
+            for (slot_start, slot_end), k in times.items():
+                first, last = hour_range(slot_start - rest, slot_end + rest)
+                hour, _ = hour_range(slot_start, slot_end)
+                free[k] = ~busy[:, first:last].any(axis=1)
+                worked[k] = busy[:, max(hour - week_hours, 0):hour].sum(axis=1)
+                recent[k] = starts[:, max(hour - week_hours, 0):hour].sum(axis=1)
+            time_of = np.array([times[(s.start_datetime, s.end_datetime)] for s in day_slots])
+
+            feasible = scorer.contract_mask(start) & eligible[rows] & free[time_of]
+            candidates = np.flatnonzero(feasible.any(axis=0))
+            if candidates.size == 0:
+                merged.unfilled.extend(day_slots)
+                continue
+
+            rested = first_end[None, candidates] <= start[:, None]
+            scores = skill_scores[rows][:, candidates] + np.where(rested, REST_BONUS, 0) - recent[time_of][:, candidates]
+            overtime = np.maximum(
+                0.0, worked[time_of][:, candidates] + duration[:, None] - weekly_cap[rows][:, None]
+            )
+            cost = -scores + OVERTIME_HOUR_COST * overtime
+            cost[~feasible[:, candidates]] = INFEASIBLE_COST
+
+            assigned = np.zeros(len(day_slots), dtype=bool)
+            for i, picked in zip(*linear_sum_assignment(cost)):
+                if cost[i, picked] >= INFEASIBLE_COST:
+                    continue
+                j = int(candidates[picked])
+                slot = day_slots[i]
+                assigned[i] = True
+                first, last = hour_range(slot.start_datetime, slot.end_datetime)
+                busy[j, first:last] = True
+                starts[j, first] += 1
+                first_end[j] = min(first_end[j], scorer.to_seconds(slot.end_datetime))
+                merged.assignments.append(RosterAssignment(
+                    vigilante_id=vigilantes[j].id,
+                    building_id=slot.building_id,
+                    shift_type_id=slot.shift_type_id,
+                    start_datetime=slot.start_datetime,
+                    end_datetime=slot.end_datetime
+                ))
+            merged.unfilled.extend(s for s, ok in zip(day_slots, assigned) if not ok)
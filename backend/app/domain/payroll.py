@@ -0,0 +1,225 @@
+"""
+Monthly liquidation
+Aggregates a month of registro_horas into liquidacion_mensual (per
+vigilante) and liquidacion_edificio (per building) rows with group-bys,
+either in full or as signed deltas applied to the running totals.
+All arithmetic is on integers (see fixed_point), so both ways agree exactly.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .fixed_point import MINUTES_PER_HOUR, HUNDREDTHS, divide_rounded, minutes_to_hundredths
+from .hours import REGISTRO_HORAS_COLUMNS
+
+
+# Legal multipliers over the ordinary hourly value per registro_horas column, in percent
+SURCHARGE_PERCENT: Dict[str, int] = {
+    'horas_normales': 100,
+    'horas_extras_diurnas': 125,
+    'horas_extras_nocturnas': 175,
+    'horas_extras_festivas_diurnas': 200,
+    'horas_extras_festivas_nocturnas': 250,
+}
+
+# Ordinary hours in a month; salario / MONTHLY_ORDINARY_HOURS is the hourly value
+MONTHLY_ORDINARY_HOURS = 240
+
+# value in centavos = salario centavos * minutes * percent / VALUE_DENOMINATOR
+VALUE_DENOMINATOR = MONTHLY_ORDINARY_HOURS * MINUTES_PER_HOUR * HUNDREDTHS
+
+TOTAL_COLUMNS = ['total_' + column for column in REGISTRO_HORAS_COLUMNS]
+VALUE_COLUMNS = ['valor_' + column for column in REGISTRO_HORAS_COLUMNS]
+ACCUMULATED_COLUMNS = TOTAL_COLUMNS + VALUE_COLUMNS + ['valor_total']
+
+_PERCENT = np.array([SURCHARGE_PERCENT[column] for column in REGISTRO_HORAS_COLUMNS], dtype=np.int64)
+
+
+def row_amounts(minutes, salario_centavos) -> np.ndarray:
+    """ACCUMULATED_COLUMNS of each registro_horas row as int64
+
+    minutes is (rows, 5) in REGISTRO_HORAS_COLUMNS order. Hours become the
+    hundredths each row is stored with and values are rounded to the
+    centavo per row, so totals are plain integer sums whichever way rows
+    are grouped or added.
+    """
+    minutes = np.asarray(minutes, dtype=np.int64).reshape(-1, len(REGISTRO_HORAS_COLUMNS))
+    salario = np.asarray(salario_centavos, dtype=np.int64).reshape(-1, 1)
+    values = divide_rounded(salario * minutes * _PERCENT, VALUE_DENOMINATOR)
+    return np.hstack([minutes_to_hundredths(minutes), values, values.sum(axis=1, keepdims=True)])
+
+
+@dataclass
+class MonthlyLiquidation:
+    """Liquidation rows for one month, ready to upsert
+
+    total_* columns are hundredths of an hour and valor_* columns centavos,
+    both int64.
+    """
+    mes: int
+    anio: int
+    vigilantes: pd.DataFrame
+    buildings: pd.DataFrame
+
+    @property
+    def valor_total(self) -> int:
+        return int(self.vigilantes['valor_total'].sum())
+
+    def vigilante_rows(self) -> List[Dict]:
+        return self._rows(self.vigilantes)
+
+    def building_rows(self) -> List[Dict]:
+        return self._rows(self.buildings)
+
+    def including(self, vigilante_ids, building_ids) -> 'MonthlyLiquidation':
+        """A copy with zero rows for the given ids that have no hours, to clear stale totals"""
+        def padded(frame: pd.DataFrame, key: str, ids) -> pd.DataFrame:
+            missing = sorted(set(int(i) for i in ids) - set(frame[key].astype(int)))
+            if not missing:
+                return frame
+            zeros = pd.DataFrame(0, index=range(len(missing)), columns=ACCUMULATED_COLUMNS, dtype=np.int64)
+            zeros.insert(0, key, missing)
+            return pd.concat([frame, zeros], ignore_index=True)
+
+        return MonthlyLiquidation(
+            self.mes,
+            self.anio,
+            padded(self.vigilantes, 'id_vigilante', vigilante_ids),
+            padded(self.buildings, 'id_edificio', building_ids)
+        )
+
+    def _rows(self, frame: pd.DataFrame) -> List[Dict]:
+        rows = frame.to_dict('records')
+        for row in rows:
+            row['mes'], row['anio'] = self.mes, self.anio
+        return rows
+
+
+def _grouped(keys: np.ndarray, amounts: np.ndarray, key: str) -> pd.DataFrame:
+    frame = pd.DataFrame(amounts, columns=ACCUMULATED_COLUMNS)
+    frame.insert(0, key, keys)
+    return frame.groupby(key, sort=True)[ACCUMULATED_COLUMNS].sum().reset_index()
+
+
+def liquidate_month(mes: int, anio: int, hours: pd.DataFrame) -> MonthlyLiquidation:
+    """Hours and values per vigilante and per building
+
+    hours holds one registro_horas row per assignment with id_vigilante,
+    id_edificio, salario_centavos and the five hour columns in whole
+    minutes. Each hour is valued at the vigilante's salario /
+    MONTHLY_ORDINARY_HOURS times the column's surcharge; building totals
+    use the value of whoever worked them.
+    """
+    minutes = hours[list(REGISTRO_HORAS_COLUMNS)].to_numpy(dtype=np.int64)
+    amounts = row_amounts(minutes, hours['salario_centavos'].to_numpy(dtype=np.int64))
+    return MonthlyLiquidation(
+        mes,
+        anio,
+        _grouped(hours['id_vigilante'].to_numpy(dtype=np.int64), amounts, 'id_vigilante'),
+        _grouped(hours['id_edificio'].to_numpy(dtype=np.int64), amounts, 'id_edificio')
+    )
+
+
+@dataclass
+class LiquidationDelta:
+    """Signed changes to the monthly totals, one row per (id, mes, anio), in the units of MonthlyLiquidation"""
+    vigilantes: List[Dict]
+    buildings: List[Dict]
+
+    @property
+    def empty(self) -> bool:
+        return not self.vigilantes and not self.buildings
+
+    @property
+    def valor_total(self) -> int:
+        return sum(row['valor_total'] for row in self.vigilantes)
+
+    def vigilante_rows(self) -> List[Dict]:
+        return [dict(row) for row in self.vigilantes]
+
+    def building_rows(self) -> List[Dict]:
+        return [dict(row) for row in self.buildings]
+
+
+def liquidation_delta(before: Sequence[Dict], after: Sequence[Dict]) -> LiquidationDelta:
+    """What replacing the before registro_horas rows with the after rows adds to each month
+
+    Rows carry id_vigilante, id_edificio, fecha, the five hour columns in
+    minutes and salario_aplicado in centavos; before is empty for a first
+    completion. Each row is valued at its own salario_aplicado, so a before
+    row takes back exactly what it added even if the salario changed since.
+    Every row goes through row_amounts, as in liquidate_month, so adding
+    deltas reproduces a full recompute exactly. A correction that
+    moves an assignment to another vigilante, building or month yields a
+    negative row for the old key and a positive one for the new. Keys whose
+    change is zero are dropped.
+    """
+    rows = list(before) + list(after)
+    if not rows:
+        return LiquidationDelta([], [])
+    signs = np.array([-1] * len(before) + [1] * len(after), dtype=np.int64).reshape(-1, 1)
+    amounts = signs * row_amounts(
+        [[row[column] or 0 for column in REGISTRO_HORAS_COLUMNS] for row in rows],
+        [row['salario_aplicado'] or 0 for row in rows]
+    )
+
+    vigilantes: Dict[tuple, np.ndarray] = {}
+    buildings: Dict[tuple, np.ndarray] = {}
+    for row, amount in zip(rows, amounts):
+        fecha = row['fecha']
+        for totals, identifier in ((vigilantes, row['id_vigilante']), (buildings, row['id_edificio'])):
+            key = (int(identifier), fecha.month, fecha.year)
+            totals[key] = totals[key] + amount if key in totals else amount
+
+    def changed(totals: Dict[tuple, np.ndarray], key: str) -> List[Dict]:
+        return [
+            dict(zip(ACCUMULATED_COLUMNS, amount.tolist()), **{key: identifier, 'mes': mes, 'anio': anio})
+            for (identifier, mes, anio), amount in sorted(totals.items())
+            if amount.any()
+        ]
+
+    return LiquidationDelta(changed(vigilantes, 'id_vigilante'), changed(buildings, 'id_edificio'))
+
+
+@dataclass
+class LiquidationDrift:
+    """Accumulated figures that disagree with a full recompute
+
+    Each entry names the key, the column, the accumulated and the expected
+    value in the units of MonthlyLiquidation; keys present on only one side
+    compare against zero.
+    """
+    vigilantes: List[Dict] = field(default_factory=list)
+    buildings: List[Dict] = field(default_factory=list)
+
+    @property
+    def clean(self) -> bool:
+        return not self.vigilantes and not self.buildings
+
+
+def _drift(expected: pd.DataFrame, accumulated: pd.DataFrame, key: str) -> List[Dict]:
+    merged = expected[[key, *ACCUMULATED_COLUMNS]].merge(
+        accumulated[[key, *ACCUMULATED_COLUMNS]], on=key, how='outer', suffixes=('_expected', '_accumulated')
+    ).fillna(0).astype(np.int64)
+    entries = []
+    for column in ACCUMULATED_COLUMNS:
+        difference = merged[column + '_accumulated'] - merged[column + '_expected']
+        for index in merged.index[difference != 0]:
+            entries.append({
+                key: int(merged.at[index, key]),
+                'column': column,
+                'accumulated': int(merged.at[index, column + '_accumulated']),
+                'expected': int(merged.at[index, column + '_expected']),
+                'difference': int(difference[index]),
+            })
+    return sorted(entries, key=lambda entry: (entry[key], entry['column']))
+
+
+def compare_liquidations(expected: MonthlyLiquidation, vigilantes: pd.DataFrame, buildings: pd.DataFrame) -> LiquidationDrift:
+    """Drift of the accumulated liquidacion rows of a month against a full recompute"""
+    return LiquidationDrift(
+        _drift(expected.vigilantes, vigilantes, 'id_vigilante'),
+        _drift(expected.buildings, buildings, 'id_edificio')
+    )
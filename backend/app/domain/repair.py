@@ -0,0 +1,183 @@
+"""
+Incremental roster repair
+Closes the gaps left by an absence with short swap chains over the
+published roster instead of regenerating it
+"""
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .models import Vigilante, Building, Shift, Novedad
+from .skills import SkillRegistry
+from .timeline import ShiftTimeline
+
+
+@dataclass
+class AssignmentChange:
+    """One asignaciones_turnos row moved to another vigilante"""
+    shift_id: Optional[int]
+    building_id: int
+    start_datetime: datetime
+    end_datetime: datetime
+    from_vigilante_id: int
+    to_vigilante_id: int
+
+
+@dataclass
+class RepairResult:
+    """Changes needed to cover an absence"""
+    changes: List[AssignmentChange] = field(default_factory=list)
+    unfilled: List[Shift] = field(default_factory=list)
+    timed_out: bool = False
+    elapsed_ms: float = 0.0
+
+    @property
+    def resolved(self) -> bool:
+        return not self.unfilled
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class LocalRepairSearch:
+    """Bounded search for swap chains around an absence
+
+    A chain moves vigilante A into the open shift, the shift A vacates is
+    taken by B, and so on until someone free closes it. Chains are searched
+    by iterative deepening up to max_depth, so the first one found changes
+    the fewest assignments. Only shifts starting within a day of the
+    absence may be moved, and the search stops at time_budget_ms.
+    """
+
+    def __init__(
+        self,
+        roster: List[Shift],
+        vigilantes: List[Vigilante],
+        buildings: Dict[int, Building],
+        rest_hours: int = 12,
+        max_depth: int = 3,
+        max_branching: int = 25,
+        time_budget_ms: float = 200
+    ):
+        self.timeline = ShiftTimeline(roster)
+        self.roster = roster
+        self.vigilantes = vigilantes
+        self.buildings = buildings
+        self.rest_hours = rest_hours
+        self.max_depth = max_depth
+        self.max_branching = max_branching
+        self.time_budget_ms = time_budget_ms
+        self._candidates_cache: Dict[int, Tuple[List[Vigilante], List[Tuple[Vigilante, Shift]]]] = {}
+        self._deadline = 0.0
+        self._window: Tuple[datetime, datetime] = (datetime.min, datetime.max)
+
+    def repair(self, novedad: Novedad) -> RepairResult:
+        """Find the minimal reassignments that cover the absent vigilante's shifts"""
+        started = time.perf_counter()
+        self._deadline = started + self.time_budget_ms / 1000
+        day_start = datetime.combine(novedad.start_datetime.date(), datetime.min.time())
+        self._window = (day_start - timedelta(days=1), day_start + timedelta(days=2))
+        self._candidates_cache.clear()
+
+        gaps = self.timeline.conflicts(novedad.vigilante_id, novedad.start_datetime, novedad.end_datetime)
+        if novedad.shift_id is not None and all(g.id != novedad.shift_id for g in gaps):
+            gaps.extend(s for s in self.roster if s.id == novedad.shift_id)
+
+        result = RepairResult()
+        used = {novedad.vigilante_id}
+        for gap in gaps:
+            chain = None
+            try:
+                for depth in range(1, self.max_depth + 1):
+                    chain = self._search(gap, depth, used)
+                    if chain:
+                        break
+            except _BudgetExceeded:
+                result.timed_out = True
+            if chain:
+                result.changes.extend(chain)
+                used.update(change.to_vigilante_id for change in chain)
+            else:
+                result.unfilled.append(gap)
+
+        result.elapsed_ms = (time.perf_counter() - started) * 1000
+        return result
+
+    def _search(self, open_shift: Shift, depth: int, used: set) -> Optional[List[AssignmentChange]]:
+        free, busy = self._candidates(open_shift)
+        for vigilante in free:
+            if vigilante.id not in used:
+                return [self._change(open_shift, vigilante)]
+        if depth == 1:
+            return None
+
+        for vigilante, blocking in busy:
+            if time.perf_counter() > self._deadline:
+                raise _BudgetExceeded()
+            if vigilante.id in used:
+                continue
+            rest = self._search(blocking, depth - 1, used | {vigilante.id})
+            if rest is not None:
+                return [self._change(open_shift, vigilante)] + rest
+        return None
+
+    def _candidates(self, open_shift: Shift) -> Tuple[List[Vigilante], List[Tuple[Vigilante, Shift]]]:
+        """Vigilantes free for the shift, and those blocked only by one movable shift"""
+        key = id(open_shift)
+        if key in self._candidates_cache:
+            return self._candidates_cache[key]
+
+        building = self.buildings.get(open_shift.building_id)
+        required = building.requirement_mask if building else 0
+        window_start, window_end = self._window
+
+        free, busy = [], []
+        for vigilante in self.vigilantes:
+            if vigilante.id == open_shift.vigilante_id:
+                continue
+            if not vigilante.is_available_for_shift(open_shift.start_datetime):
+                continue
+            if not SkillRegistry.covers(vigilante.skill_mask, required):
+                continue
+            conflicts = self.timeline.conflicts(
+                vigilante.id, open_shift.start_datetime, open_shift.end_datetime, self.rest_hours
+            )
+            score = self._score(vigilante, required)
+            if not conflicts:
+                free.append((score, vigilante))
+            elif (
+                len(conflicts) == 1
+                and conflicts[0] is not open_shift
+                and window_start <= conflicts[0].start_datetime < window_end
+            ):
+                busy.append((score, vigilante, conflicts[0]))
+
+        free.sort(key=lambda item: -item[0])
+        busy.sort(key=lambda item: -item[0])
+        candidates = (
+            [v for _, v in free[:self.max_branching]],
+            [(v, blocking) for _, v, blocking in busy[:self.max_branching]]
+        )
+        self._candidates_cache[key] = candidates
+        return candidates
+
+    def _score(self, vigilante: Vigilante, required: int) -> int:
+        """Skill match x10 minus shifts already held around the absence"""
+        window_start, window_end = self._window
+        return (
+            SkillRegistry.match_count(vigilante.skill_mask, required) * 10
+            - self.timeline.count_starting_between(vigilante.id, window_start, window_end)
+        )
+
+    @staticmethod
+    def _change(shift: Shift, vigilante: Vigilante) -> AssignmentChange:
+        return AssignmentChange(
+            shift_id=shift.id,
+            building_id=shift.building_id,
+            start_datetime=shift.start_datetime,
+            end_datetime=shift.end_datetime,
+            from_vigilante_id=shift.vigilante_id,
+            to_vigilante_id=vigilante.id
+        )
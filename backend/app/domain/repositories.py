@@ -3,8 +3,10 @@ Repository interfaces for Clean Architecture
 These define the contracts that infrastructure layer must implement
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
 from .models import Vigilante, Building, Shift, User, Report
+from .pagination import DEFAULT_PAGE_SIZE, Page
 
 
 class VigilanteRepository(ABC):
@@ -79,7 +81,9 @@ class ShiftRepository(ABC):
         pass
     
     @abstractmethod
-    def get_all(self, filters: Optional[Dict[str, Any]] = None) -> List[Shift]:
+    def get_all(self, filters: Optional[Dict[str, Any]] = None, limit: int = DEFAULT_PAGE_SIZE,
+                after: Optional[Tuple[datetime, int]] = None) -> Page:
+        """One page of shifts ordered by start time, continuing after the (start, id) key"""
         pass
     
     @abstractmethod
@@ -94,6 +98,16 @@ class ShiftRepository(ABC):
     def get_shifts_by_vigilante(self, vigilante_id: int) -> List[Shift]:
         pass
     
+    @abstractmethod
+    def get_shifts_by_vigilante_in_window(self, vigilante_id: int, start_datetime, end_datetime) -> List[Shift]:
+        """Shifts of a vigilante overlapping [start_datetime, end_datetime)"""
+        pass
+
+    @abstractmethod
+    def get_shifts_for_vigilantes_in_window(self, vigilante_ids, start_datetime, end_datetime) -> List[Shift]:
+        """Shifts of several vigilantes overlapping [start_datetime, end_datetime)"""
+        pass
+
     @abstractmethod
     def get_shifts_by_building(self, building_id: int) -> List[Shift]:
         pass
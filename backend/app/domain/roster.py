@@ -0,0 +1,199 @@
+"""
+Monthly roster generation
+Fills a planilla_turnos month by solving one min-cost assignment per day
+instead of picking vigilantes shift by shift
+"""
+import calendar
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from .models import Vigilante, Building, Shift, ShiftTypeEnum
+from .scoring import CandidateScorer
+from .timeline import ShiftTimeline
+
+
+# Coverage pattern per edificios.tipo_turno: (id_tipo_turno, start hour, duration)
+# Mirrors the standard rows seeded into tipos_turnos
+SHIFT_PATTERNS: Dict[str, List[Tuple[int, int, int]]] = {
+    "8_horas": [(1, 6, 8), (2, 14, 8), (3, 22, 8)],
+    "12_horas": [(4, 7, 12), (5, 19, 12)],
+    "24_horas": [(6, 7, 24)],
+}
+
+INFEASIBLE_COST = 1e9
+OVERTIME_HOUR_COST = 2.0
+LOAD_WINDOW_DAYS = 7
+
+
+@dataclass
+class ShiftSlot:
+    """A building shift that needs one vigilante"""
+    building_id: int
+    shift_type_id: int
+    start_datetime: datetime
+    end_datetime: datetime
+
+    def get_duration_hours(self) -> float:
+        return (self.end_datetime - self.start_datetime).total_seconds() / 3600
+
+
+@dataclass
+class RosterAssignment:
+    """A slot assigned to a vigilante, ready to become an asignaciones_turnos row"""
+    vigilante_id: int
+    building_id: int
+    shift_type_id: int
+    start_datetime: datetime
+    end_datetime: datetime
+
+    @property
+    def fecha(self) -> date:
+        return self.start_datetime.date()
+
+    def to_shift(self) -> Shift:
+        return Shift(
+            id=None,
+            vigilante_id=self.vigilante_id,
+            building_id=self.building_id,
+            start_datetime=self.start_datetime,
+            end_datetime=self.end_datetime,
+            shift_type=ShiftTypeEnum.NORMAL,
+            notes=None
+        )
+
+
+@dataclass
+class RosterResult:
+    """Outcome of a roster run"""
+    assignments: List[RosterAssignment] = field(default_factory=list)
+    unfilled: List[ShiftSlot] = field(default_factory=list)
+
+    @property
+    def coverage(self) -> float:
+        total = len(self.assignments) + len(self.unfilled)
+        return len(self.assignments) / total if total else 1.0
+
+
+class RosterPlanningService:
+    """Batch roster engine for a whole month"""
+
+    @staticmethod
+    def build_month_slots(mes: int, anio: int, buildings: List[Building]) -> List[ShiftSlot]:
+        """Expand each building's tipo_turno into the slots of every day of the month"""
+        slots = []
+        days_in_month = calendar.monthrange(anio, mes)[1]
+        for day in range(1, days_in_month + 1):
+            day_start = datetime(anio, mes, day)
+            for building in buildings:
+                for shift_type_id, start_hour, duration in SHIFT_PATTERNS.get(building.shift_type, ()):
+                    start = day_start + timedelta(hours=start_hour)
+                    slots.append(ShiftSlot(
+                        building_id=building.id,
+                        shift_type_id=shift_type_id,
+                        start_datetime=start,
+                        end_datetime=start + timedelta(hours=duration)
+                    ))
+        return slots
+
+    @staticmethod
+    def generate_month(
+        mes: int,
+        anio: int,
+        buildings: List[Building],
+        vigilantes: List[Vigilante],
+        previous_shifts: Iterable[Shift] = (),
+        rest_hours: int = 12
+    ) -> RosterResult:
+        """Assign every slot of the month to vigilantes
+
+        Each day is solved as one min-cost assignment between that day's slots
+        and the vigilante pool, so a vigilante takes at most one slot per day.
+        Contract window, required skills and minimum rest are hard constraints;
+        the cost is the negated CandidateScorer score (with the load term taken
+        over the 7 days before each slot) plus a penalty per hour over the
+        building's horas_semanales in the trailing week. previous_shifts is the
+        history before the month, used for rest and load at the boundary.
+        """
+        buildings = [b for b in buildings if b.is_active()]
+        vigilantes = [v for v in vigilantes if v.is_active()]
+        slots = RosterPlanningService.build_month_slots(mes, anio, buildings)
+        if not slots or not vigilantes:
+            return RosterResult(unfilled=slots)
+
+        origin = datetime(anio, mes, 1)
+        scorer = CandidateScorer(vigilantes, origin, rest_hours)
+        n_vigilantes = len(vigilantes)
+
+        building_index = {b.id: i for i, b in enumerate(buildings)}
+        weekly_cap = np.array([b.weekly_hours for b in buildings], dtype=float)
+        skill_match = scorer.skill_matches(buildings)
+        skill_ok = scorer.requirements_met(buildings)
+
+        # Trailing-window state: row k + LOAD_WINDOW_DAYS holds day k of the month
+        days_in_month = calendar.monthrange(anio, mes)[1]
+        starts_per_day = np.zeros((days_in_month + LOAD_WINDOW_DAYS, n_vigilantes))
+        hours_per_day = np.zeros((days_in_month + LOAD_WINDOW_DAYS, n_vigilantes))
+
+        timeline = ShiftTimeline(previous_shifts)
+        last_end = scorer.last_end_seconds(timeline)
+        for j, vigilante in enumerate(vigilantes):
+            for shift in timeline.shifts_for(vigilante.id):
+                offset = (shift.start_datetime.date() - origin.date()).days
+                if -LOAD_WINDOW_DAYS <= offset < 0:
+                    starts_per_day[offset + LOAD_WINDOW_DAYS, j] += 1
+                    hours_per_day[offset + LOAD_WINDOW_DAYS, j] += shift.get_duration_hours()
+
+        slots_by_day: List[List[ShiftSlot]] = [[] for _ in range(days_in_month)]
+        for slot in slots:
+            slots_by_day[slot.start_datetime.day - 1].append(slot)
+
+        result = RosterResult()
+        for day, day_slots in enumerate(slots_by_day):
+            if not day_slots:
+                continue
+            rows = np.array([building_index[s.building_id] for s in day_slots])
+            start = np.array([scorer.to_seconds(s.start_datetime) for s in day_slots])
+            end = np.array([scorer.to_seconds(s.end_datetime) for s in day_slots])
+
+            window = slice(day, day + LOAD_WINDOW_DAYS)
+            matrix = scorer.score(start, skill_match[rows], last_end, starts_per_day[window].sum(axis=0))
+            feasible = matrix.feasible & skill_ok[rows]
+            candidates = np.flatnonzero(feasible.any(axis=0))
+            if candidates.size == 0:
+                result.unfilled.extend(day_slots)
+                continue
+
+            recent_hours = hours_per_day[window].sum(axis=0)
+            duration_hours = (end - start) / 3600
+            overtime = np.maximum(
+                0.0,
+                recent_hours[candidates][None, :] + duration_hours[:, None] - weekly_cap[rows][:, None]
+            )
+            cost = -matrix.scores[:, candidates] + OVERTIME_HOUR_COST * overtime
+            cost[~feasible[:, candidates]] = INFEASIBLE_COST
+
+            slot_rows, picked = linear_sum_assignment(cost)
+            assigned = np.zeros(len(day_slots), dtype=bool)
+            for slot_row, column in zip(slot_rows, picked):
+                if cost[slot_row, column] >= INFEASIBLE_COST:
+                    continue
+                j = candidates[column]
+                slot = day_slots[slot_row]
+                assigned[slot_row] = True
+                last_end[j] = np.fmax(last_end[j], end[slot_row])
+                starts_per_day[day + LOAD_WINDOW_DAYS, j] += 1
+                hours_per_day[day + LOAD_WINDOW_DAYS, j] += duration_hours[slot_row]
+                result.assignments.append(RosterAssignment(
+                    vigilante_id=vigilantes[j].id,
+                    building_id=slot.building_id,
+                    shift_type_id=slot.shift_type_id,
+                    start_datetime=slot.start_datetime,
+                    end_datetime=slot.end_datetime
+                ))
+            result.unfilled.extend(s for s, ok in zip(day_slots, assigned) if not ok)
+
+        return result
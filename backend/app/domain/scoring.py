@@ -0,0 +1,151 @@
+"""
+Vectorized candidate scoring
+Computes the ShiftAssignmentService score for many shifts and vigilantes at
+once as (shifts x vigilantes) NumPy matrices
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .models import Vigilante, Building
+from .skills import popcount
+from .timeline import ShiftTimeline
+
+
+SKILL_WEIGHT = 10
+REST_BONUS = 5
+RECENT_DAYS = 7
+
+
+@dataclass
+class ScoreMatrix:
+    """Scores and feasibility for every (shift, vigilante) pair"""
+    scores: np.ndarray
+    feasible: np.ndarray
+
+    def best(self) -> np.ndarray:
+        """Column of the best feasible vigilante per shift, -1 when none
+
+        Ties resolve to the first vigilante in input order, like the stable
+        sort in the scalar path.
+        """
+        masked = np.where(self.feasible, self.scores, -np.inf)
+        best = masked.argmax(axis=1) if masked.shape[1] else np.zeros(masked.shape[0], dtype=int)
+        best[~self.feasible.any(axis=1)] = -1
+        return best
+
+
+class CandidateScorer:
+    """Scores vigilantes for shifts with the same weights as the scalar path
+
+    Times are float seconds from an origin so contract, rest and load terms
+    are plain array arithmetic: skills x10, +5 when rested since the last
+    shift, minus the number of shifts started in the last 7 days.
+    """
+
+    def __init__(
+        self,
+        vigilantes: List[Vigilante],
+        origin: datetime,
+        rest_hours: int = 12
+    ):
+        self.vigilantes = vigilantes
+        self.origin = origin
+        self.rest_seconds = rest_hours * 3600
+        self.active = np.array([v.is_active() for v in vigilantes], dtype=bool)
+        self.contract_start = np.array([self.to_seconds(v.contract_start) for v in vigilantes], dtype=float)
+        self.contract_end = np.array([self.to_seconds(v.contract_end) for v in vigilantes], dtype=float)
+        self.skill_masks = np.array([v.skill_mask for v in vigilantes], dtype=np.uint64)
+
+    def to_seconds(self, moment: datetime) -> float:
+        return (moment - self.origin).total_seconds()
+
+    def skill_matches(self, buildings: Sequence[Building]) -> np.ndarray:
+        """Count of each building's requirements held by each vigilante (buildings x vigilantes)"""
+        required = self._requirement_masks(buildings)
+        return popcount(required[:, None] & self.skill_masks[None, :]).astype(float)
+
+    def requirements_met(self, buildings: Sequence[Building]) -> np.ndarray:
+        """Whether each vigilante holds all of each building's requirements"""
+        required = self._requirement_masks(buildings)[:, None]
+        return (required & self.skill_masks[None, :]) == required
+
+    @staticmethod
+    def _requirement_masks(buildings: Sequence[Building]) -> np.ndarray:
+        return np.array([b.requirement_mask for b in buildings], dtype=np.uint64)
+
+    def contract_mask(self, start_seconds: np.ndarray) -> np.ndarray:
+        """Active and inside the contract window at each shift start"""
+        start = start_seconds[:, None]
+        return (
+            self.active[None, :]
+            & (self.contract_start[None, :] <= start)
+            & (start <= self.contract_end[None, :])
+        )
+
+    def last_end_seconds(self, timeline: ShiftTimeline) -> np.ndarray:
+        """End of each vigilante's latest shift, NaN when there is none"""
+        last_end = np.full(len(self.vigilantes), np.nan)
+        for j, vigilante in enumerate(self.vigilantes):
+            last_shift = timeline.last_shift(vigilante.id)
+            if last_shift:
+                last_end[j] = self.to_seconds(last_shift.end_datetime)
+        return last_end
+
+    def recent_counts(self, timeline: ShiftTimeline, now: datetime) -> np.ndarray:
+        """Shifts started in the RECENT_DAYS before now, per vigilante"""
+        cutoff = now - timedelta(days=RECENT_DAYS)
+        return np.array(
+            [timeline.count_starting_between(v.id, cutoff) for v in self.vigilantes],
+            dtype=float
+        )
+
+    def score(
+        self,
+        start_seconds: np.ndarray,
+        skill_matches: np.ndarray,
+        last_end: np.ndarray,
+        recent_counts: np.ndarray
+    ) -> ScoreMatrix:
+        """Combine the scoring terms for shifts starting at start_seconds
+
+        skill_matches holds one row per shift (already gathered by building).
+        """
+        has_last = ~np.isnan(last_end)
+        rested = (start_seconds[:, None] - np.where(has_last, last_end, 0.0)[None, :]) >= self.rest_seconds
+        rest_ok = rested | ~has_last[None, :]
+        feasible = self.contract_mask(start_seconds) & rest_ok
+        scores = (
+            skill_matches * SKILL_WEIGHT
+            + np.where(has_last[None, :] & rested, REST_BONUS, 0)
+            - recent_counts[None, :]
+        )
+        return ScoreMatrix(scores=scores, feasible=feasible)
+
+    def score_shifts(
+        self,
+        buildings: Sequence[Building],
+        shift_datetimes: Sequence[datetime],
+        timeline: ShiftTimeline,
+        now: Optional[datetime] = None
+    ) -> ScoreMatrix:
+        """Score each (building, start) shift against every vigilante
+
+        Equivalent to running find_best_vigilante_for_shift's scoring once
+        per shift with the same timeline.
+        """
+        start_seconds = np.array([self.to_seconds(t) for t in shift_datetimes], dtype=float)
+        index, unique, rows = {}, [], []
+        for building in buildings:
+            if building.id not in index:
+                index[building.id] = len(unique)
+                unique.append(building)
+            rows.append(index[building.id])
+        return self.score(
+            start_seconds,
+            self.skill_matches(unique)[np.array(rows, dtype=int)],
+            self.last_end_seconds(timeline),
+            self.recent_counts(timeline, now or datetime.now())
+        )
@@ -3,26 +3,45 @@ Domain services contain business logic that doesn't belong to a specific entity
 These are pure business logic functions without external dependencies
 """
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
-from .models import Vigilante, Building, Shift, ShiftTypeEnum, StatusEnum
+import numpy as np
+from typing import List, Optional, Dict, Any, Tuple
+from .models import Vigilante, Building, Shift, Novedad, ShiftTypeEnum, StatusEnum
+from .repair import LocalRepairSearch, RepairResult
+from .timeline import ShiftTimeline
+from .scoring import CandidateScorer
+from .skills import SkillRegistry
+from .spatial import SpatialGridIndex
+from .holidays import HolidayCalendar, holiday_calendar
+from .hours import REGISTRO_HORAS_COLUMNS, split_hours
+from .payroll import ACCUMULATED_COLUMNS, TOTAL_COLUMNS, row_amounts
+from .fixed_point import MINUTES_PER_HOUR, to_float
 
 
 class ShiftAssignmentService:
     """Service for intelligent shift assignment logic"""
     
     @staticmethod
-    def calculate_shift_hours(shift: Shift) -> Dict[str, float]:
+    def calculate_shift_hours(shift: Shift, calendar: HolidayCalendar = holiday_calendar) -> Dict[str, float]:
         """Calculate different types of hours for a shift"""
-        total_hours = shift.get_duration_hours()
+        minutes = ShiftAssignmentService.calculate_shift_minutes(shift, calendar)
+        return {
+            hour_type.replace("_minutes", "_hours"): value / MINUTES_PER_HOUR
+            for hour_type, value in minutes.items()
+        }
+    
+    @staticmethod
+    def calculate_shift_minutes(shift: Shift, calendar: HolidayCalendar = holiday_calendar) -> Dict[str, int]:
+        """Whole minutes of each hour type for a shift"""
+        total_minutes = int((shift.end_datetime - shift.start_datetime).total_seconds()) // 60
         
         # Business rules for hour calculation
-        normal_hours = 0
-        overtime_hours = 0
-        holiday_hours = 0
-        night_hours = 0
+        normal_minutes = 0
+        overtime_minutes = 0
+        holiday_minutes = 0
+        night_minutes = 0
         
-        # Check if it's a holiday (simplified - you might want to use a holiday calendar)
-        is_holiday = shift.start_datetime.weekday() == 6  # Sunday
+        # Sundays and festivos_colombia dates are paid as holidays
+        is_holiday = shift.start_datetime.weekday() == 6 or calendar.is_holiday(shift.start_datetime.date())
         
         # Check if it's night shift (between 6 PM and 6 AM)
         start_hour = shift.start_datetime.hour
@@ -30,20 +49,20 @@ class ShiftAssignmentService:
         is_night_shift = start_hour >= 18 or end_hour <= 6
         
         if is_holiday:
-            holiday_hours = total_hours
+            holiday_minutes = total_minutes
         elif shift.shift_type == ShiftTypeEnum.OVERTIME:
-            overtime_hours = total_hours
+            overtime_minutes = total_minutes
         elif is_night_shift:
-            night_hours = total_hours
+            night_minutes = total_minutes
         else:
-            normal_hours = total_hours
+            normal_minutes = total_minutes
         
         return {
-            "normal_hours": normal_hours,
-            "overtime_hours": overtime_hours,
-            "holiday_hours": holiday_hours,
-            "night_hours": night_hours,
-            "total_hours": total_hours
+            "normal_minutes": normal_minutes,
+            "overtime_minutes": overtime_minutes,
+            "holiday_minutes": holiday_minutes,
+            "night_minutes": night_minutes,
+            "total_minutes": total_minutes
         }
     
     @staticmethod
@@ -51,13 +70,23 @@ class ShiftAssignmentService:
         available_vigilantes: List[Vigilante],
         building: Building,
         shift_datetime: datetime,
-        previous_shifts: List[Shift]
+        previous_shifts: List[Shift],
+        timeline: Optional[ShiftTimeline] = None
     ) -> Optional[Vigilante]:
-        """Find the best vigilante for a shift based on business rules"""
+        """Find the best vigilante for a shift based on business rules
+        
+        Pass a prebuilt timeline when scoring many shifts in one planning run;
+        otherwise one is built from previous_shifts for this call.
+        """
         
         if not available_vigilantes:
             return None
         
+        if timeline is None:
+            timeline = ShiftTimeline(previous_shifts)
+        recent_cutoff = datetime.now() - timedelta(days=7)
+        required_mask = building.requirement_mask
+        
         # Score each vigilante
         scored_vigilantes = []
         
@@ -68,15 +97,11 @@ class ShiftAssignmentService:
             score = 0
             
             # Check skills match
-            building_requirements = set(building.security_requirements)
-            vigilante_skills = set(vigilante.skills)
-            skill_match = len(building_requirements.intersection(vigilante_skills))
+            skill_match = SkillRegistry.match_count(vigilante.skill_mask, required_mask)
             score += skill_match * 10
             
             # Check rest time (minimum 12 hours between shifts)
-            last_shift = ShiftAssignmentService._get_last_shift_for_vigilante(
-                vigilante.id, previous_shifts
-            )
+            last_shift = timeline.last_shift(vigilante.id)
             if last_shift:
                 time_since_last_shift = shift_datetime - last_shift.end_datetime
                 if time_since_last_shift >= timedelta(hours=12):
@@ -85,9 +110,7 @@ class ShiftAssignmentService:
                     continue  # Skip if not enough rest
             
             # Prefer vigilantes with fewer recent shifts (load balancing)
-            recent_shifts_count = ShiftAssignmentService._count_recent_shifts(
-                vigilante.id, previous_shifts, days=7
-            )
+            recent_shifts_count = timeline.count_starting_between(vigilante.id, recent_cutoff)
             score -= recent_shifts_count
             
             scored_vigilantes.append((vigilante, score))
@@ -100,23 +123,25 @@ class ShiftAssignmentService:
         return scored_vigilantes[0][0]
     
     @staticmethod
-    def _get_last_shift_for_vigilante(vigilante_id: int, shifts: List[Shift]) -> Optional[Shift]:
-        """Get the most recent shift for a vigilante"""
-        vigilante_shifts = [s for s in shifts if s.vigilante_id == vigilante_id]
-        if not vigilante_shifts:
-            return None
+    def find_best_vigilantes_for_shifts(
+        available_vigilantes: List[Vigilante],
+        shifts: List[Tuple[Building, datetime]],
+        previous_shifts: List[Shift],
+        timeline: Optional[ShiftTimeline] = None
+    ) -> List[Optional[Vigilante]]:
+        """Vectorized find_best_vigilante_for_shift over many (building, start) pairs
         
-        return max(vigilante_shifts, key=lambda s: s.end_datetime)
-    
-    @staticmethod
-    def _count_recent_shifts(vigilante_id: int, shifts: List[Shift], days: int = 7) -> int:
-        """Count shifts for a vigilante in the last N days"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_shifts = [
-            s for s in shifts 
-            if s.vigilante_id == vigilante_id and s.start_datetime >= cutoff_date
-        ]
-        return len(recent_shifts)
+        Each shift is scored independently against the same history, so the
+        result matches calling the scalar method once per shift.
+        """
+        if not available_vigilantes or not shifts:
+            return [None] * len(shifts)
+        
+        if timeline is None:
+            timeline = ShiftTimeline(previous_shifts)
+        scorer = CandidateScorer(available_vigilantes, origin=min(t for _, t in shifts))
+        matrix = scorer.score_shifts([b for b, _ in shifts], [t for _, t in shifts], timeline)
+        return [available_vigilantes[j] if j >= 0 else None for j in matrix.best()]
 
 
 class PayrollCalculationService:
@@ -126,54 +151,53 @@ class PayrollCalculationService:
     def calculate_vigilante_payment(
         vigilante: Vigilante,
         shifts: List[Shift],
-        building_rates: Dict[int, Dict[str, float]]
+        salario_centavos: int,
+        calendar: HolidayCalendar = holiday_calendar
     ) -> Dict[str, Any]:
-        """Calculate total payment for a vigilante based on their shifts"""
-        
-        total_payment = 0
-        hours_breakdown = {
-            "normal_hours": 0,
-            "overtime_hours": 0,
-            "holiday_hours": 0,
-            "night_hours": 0
-        }
-        
-        for shift in shifts:
-            # Get building rates
-            building_id = shift.building_id
-            rates = building_rates.get(building_id, {})
-            
-            # Calculate hours for this shift
-            shift_hours = ShiftAssignmentService.calculate_shift_hours(shift)
-            
-            # Calculate payment for each type of hour
-            normal_rate = rates.get("hourly_rate", 0)
-            overtime_rate = rates.get("overtime_rate", normal_rate * 1.5)
-            holiday_rate = rates.get("holiday_rate", normal_rate * 2.0)
-            night_rate = normal_rate * 1.25  # 25% night differential
-            
-            shift_payment = (
-                shift_hours["normal_hours"] * normal_rate +
-                shift_hours["overtime_hours"] * overtime_rate +
-                shift_hours["holiday_hours"] * holiday_rate +
-                shift_hours["night_hours"] * night_rate
-            )
-            
-            total_payment += shift_payment
-            
-            # Accumulate hours
-            for hour_type, hours in shift_hours.items():
-                if hour_type in hours_breakdown:
-                    hours_breakdown[hour_type] += hours
+        """Hours and pay of a vigilante's shifts, valued as in the monthly liquidation
         
+        Shifts are split into the registro_horas columns by the same splitter
+        and each column is valued at salario / MONTHLY_ORDINARY_HOURS times its
+        surcharge, rounded to the centavo per shift, so the result matches the
+        liquidacion_mensual row for the same shifts.
+        """
+        split = split_hours([s.start_datetime for s in shifts], [s.end_datetime for s in shifts], calendar)
+        minutes = split.minutes()
+        amounts = row_amounts(
+            np.column_stack([minutes[column] for column in REGISTRO_HORAS_COLUMNS]),
+            np.full(len(shifts), salario_centavos, dtype=np.int64)
+        )
+        totals = dict(zip(ACCUMULATED_COLUMNS, amounts.sum(axis=0).tolist()))
         return {
             "vigilante_id": vigilante.id,
             "vigilante_name": vigilante.name,
-            "total_payment": total_payment,
-            "hours_breakdown": hours_breakdown,
-            "total_hours": sum(hours_breakdown.values())
+            "total_payment": to_float(totals["valor_total"]),
+            "total_payment_centavos": totals["valor_total"],
+            "hours_breakdown": {column: to_float(totals["total_" + column]) for column in REGISTRO_HORAS_COLUMNS},
+            "total_hours": to_float(sum(totals[column] for column in TOTAL_COLUMNS))
         }
 
+    @staticmethod
+    def split_registro_horas(
+        shifts: List[Shift],
+        calendar: HolidayCalendar = holiday_calendar
+    ) -> List[Dict[str, Any]]:
+        """registro_horas columns for each shift in whole minutes, split at night and holiday boundaries"""
+        split = split_hours(
+            [s.start_datetime for s in shifts],
+            [s.end_datetime for s in shifts],
+            calendar
+        )
+        minutes = {column: values.tolist() for column, values in split.minutes().items()}
+        holiday = split.holiday.tolist()
+        return [
+            dict(
+                {column: values[i] for column, values in minutes.items()},
+                es_festivo=holiday[i]
+            )
+            for i in range(len(shifts))
+        ]
+
 
 class ContingencyManagementService:
     """Service for handling contingencies like absences and replacements"""
@@ -184,9 +208,23 @@ class ContingencyManagementService:
         shift: Shift,
         available_vigilantes: List[Vigilante],
         building: Building,
-        previous_shifts: List[Shift]
+        previous_shifts: List[Shift],
+        timeline: Optional[ShiftTimeline] = None,
+        spatial_index: Optional[SpatialGridIndex] = None
     ) -> Optional[Vigilante]:
-        """Handle vigilante absence by finding a replacement"""
+        """Handle vigilante absence by finding a replacement
+        
+        With a spatial index the nearest feasible vigilante is chosen instead
+        of the best scored one.
+        """
+        
+        if spatial_index is not None:
+            nearest = ContingencyManagementService.find_nearest_replacements(
+                shift, building, spatial_index, k=1,
+                previous_shifts=previous_shifts, timeline=timeline,
+                excluded_ids={absent_vigilante_id}
+            )
+            return nearest[0][0] if nearest else None
         
         # Filter out the absent vigilante
         replacement_candidates = [
@@ -199,25 +237,95 @@ class ContingencyManagementService:
             replacement_candidates,
             building,
             shift.start_datetime,
-            previous_shifts
+            previous_shifts,
+            timeline
+        )
+    
+    @staticmethod
+    def find_nearest_replacements(
+        shift: Shift,
+        building: Building,
+        spatial_index: SpatialGridIndex,
+        k: int = 5,
+        previous_shifts: List[Shift] = (),
+        timeline: Optional[ShiftTimeline] = None,
+        minimum_hours: int = 12,
+        max_distance: Optional[float] = None,
+        excluded_ids: Optional[set] = None
+    ) -> List[Tuple[Vigilante, Optional[float]]]:
+        """Up to k vigilantes who can take the shift, nearest to the building first
+        
+        Feasible means available on the shift date, holding the building's
+        requirements and rested before and after it; the shift's own
+        vigilante is never offered. Distance is None for vigilantes without
+        an address, who come last.
+        """
+        if timeline is None:
+            timeline = ShiftTimeline(previous_shifts)
+        required_mask = building.requirement_mask
+        excluded = set(excluded_ids or ()) | {shift.vigilante_id}
+        
+        def feasible(vigilante: Vigilante) -> bool:
+            return (
+                vigilante.id not in excluded
+                and vigilante.is_available_for_shift(shift.start_datetime)
+                and SkillRegistry.covers(vigilante.skill_mask, required_mask)
+                and not timeline.has_conflict(
+                    vigilante.id, shift.start_datetime, shift.end_datetime, minimum_hours, exclude_id=shift.id
+                )
+            )
+        
+        return spatial_index.nearest(
+            building.street_number, building.avenue_number, k, feasible, max_distance
+        )
+    
+    @staticmethod
+    def repair_absence(
+        novedad: Novedad,
+        roster: List[Shift],
+        available_vigilantes: List[Vigilante],
+        buildings: Dict[int, Building],
+        minimum_hours: int = 12,
+        max_depth: int = 3,
+        time_budget_ms: float = 200
+    ) -> RepairResult:
+        """Cover an absence by reassigning as few published shifts as possible
+        
+        roster should hold the published shifts around the novedad (its day
+        +/- 1 plus the rest margin); nothing outside it is touched.
+        """
+        search = LocalRepairSearch(
+            roster,
+            available_vigilantes,
+            buildings,
+            rest_hours=minimum_hours,
+            max_depth=max_depth,
+            time_budget_ms=time_budget_ms
         )
+        return search.repair(novedad)
     
     @staticmethod
     def validate_minimum_rest_time(
         vigilante_id: int,
         new_shift: Shift,
         existing_shifts: List[Shift],
-        minimum_hours: int = 12
+        minimum_hours: int = 12,
+        timeline: Optional[ShiftTimeline] = None
     ) -> bool:
-        """Validate that a vigilante has minimum rest time between shifts"""
+        """Validate that a vigilante has minimum rest time between shifts
         
-        vigilante_shifts = [s for s in existing_shifts if s.vigilante_id == vigilante_id]
+        The new shift conflicts with any shift of the vigilante that overlaps
+        it or leaves less than minimum_hours before its start or after its end.
+        When a timeline is given it is used instead of existing_shifts.
+        """
         
-        for existing_shift in vigilante_shifts:
-            # Check if shifts overlap or are too close
-            time_between = abs((new_shift.start_datetime - existing_shift.end_datetime).total_seconds()) / 3600
-            
-            if time_between < minimum_hours:
-                return False
+        if timeline is None:
+            timeline = ShiftTimeline(s for s in existing_shifts if s.vigilante_id == vigilante_id)
         
-        return True
+        return not timeline.has_conflict(
+            vigilante_id,
+            new_shift.start_datetime,
+            new_shift.end_datetime,
+            minimum_hours,
+            exclude_id=new_shift.id
+        )
@@ -0,0 +1,142 @@
+"""
+Shift batches
+Validates thousands of submitted shifts together, in memory, against the
+active vigilantes and buildings and one window of history loaded up front
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .models import Vigilante, Building, Shift
+from .roster import RosterAssignment, SHIFT_PATTERNS
+from .timeline import ShiftTimeline
+
+
+REQUIRED_FIELDS = ('vigilante_id', 'building_id', 'start_datetime', 'end_datetime')
+
+
+@dataclass
+class ShiftBatchResult:
+    """Rows that passed validation, in submission order, and one error per rejected row"""
+    accepted: List[Tuple[int, RosterAssignment]] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def assignments(self) -> List[RosterAssignment]:
+        return [assignment for _, assignment in self.accepted]
+
+
+def infer_shift_type(building: Building, start: datetime, end: datetime) -> Optional[int]:
+    """id_tipo_turno of the building's pattern matching the shift, by start hour and duration"""
+    duration = (end - start).total_seconds() / 3600
+    patterns = SHIFT_PATTERNS.get(building.shift_type, ())
+    for shift_type_id, start_hour, hours in patterns:
+        if hours == duration and start_hour == start.hour:
+            return shift_type_id
+    for shift_type_id, _, hours in patterns:
+        if hours == duration:
+            return shift_type_id
+    return None
+
+
+def _parse(row: Mapping[str, Any]) -> Tuple[int, int, datetime, datetime, Optional[int]]:
+    if not isinstance(row, Mapping):
+        raise ValueError("Each shift must be an object")
+    missing = [name for name in REQUIRED_FIELDS if row.get(name) in (None, '')]
+    if missing:
+        raise ValueError(f"Missing required field: {missing[0]}")
+    start, end = row['start_datetime'], row['end_datetime']
+    start = start if isinstance(start, datetime) else datetime.fromisoformat(start)
+    end = end if isinstance(end, datetime) else datetime.fromisoformat(end)
+    if end <= start:
+        raise ValueError("End time must be after start time")
+    shift_type_id = row.get('shift_type_id')
+    return (
+        int(row['vigilante_id']),
+        int(row['building_id']),
+        start,
+        end,
+        int(shift_type_id) if shift_type_id is not None else None
+    )
+
+
+def history_window(
+    rows: Iterable[Mapping[str, Any]],
+    rest_hours: float = 12
+) -> Optional[Tuple[Set[int], datetime, datetime]]:
+    """Vigilantes and time span whose stored shifts can conflict with the batch
+
+    Rows that do not parse are left out; None when no row does.
+    """
+    vigilante_ids: Set[int] = set()
+    start = end = None
+    for row in rows:
+        try:
+            vigilante_id, _, row_start, row_end, _ = _parse(row)
+        except (TypeError, ValueError):
+            continue
+        vigilante_ids.add(vigilante_id)
+        start = row_start if start is None else min(start, row_start)
+        end = row_end if end is None else max(end, row_end)
+    if start is None:
+        return None
+    rest = timedelta(hours=rest_hours)
+    return vigilante_ids, start - rest, end + rest
+
+
+def validate_shift_batch(
+    rows: Iterable[Mapping[str, Any]],
+    vigilantes: Mapping[int, Vigilante],
+    buildings: Mapping[int, Building],
+    history: Iterable[Shift],
+    minimum_rest_hours: int = 12
+) -> ShiftBatchResult:
+    """Check every row and keep the ones that can be inserted together
+
+    vigilantes and buildings hold the active ones by id; history holds the
+    stored shifts of the batch's vigilantes around the batch's time span.
+    Rows are checked in submission order against the history and against
+    the rows accepted before them, so of two conflicting rows the first one
+    wins. Errors carry the row index and a message.
+    """
+    result = ShiftBatchResult()
+    timeline = ShiftTimeline(history)
+    accepted_rows: Dict[int, int] = {}  # id() of a batch shift -> its row index
+
+    for index, row in enumerate(rows):
+        try:
+            vigilante_id, building_id, start, end, shift_type_id = _parse(row)
+        except (TypeError, ValueError) as e:
+            result.errors.append({"index": index, "message": str(e)})
+            continue
+
+        if vigilante_id not in vigilantes:
+            result.errors.append({"index": index, "message": "Vigilante not found or inactive"})
+            continue
+        building = buildings.get(building_id)
+        if building is None:
+            result.errors.append({"index": index, "message": "Building not found or inactive"})
+            continue
+        if shift_type_id is None:
+            shift_type_id = infer_shift_type(building, start, end)
+            if shift_type_id is None:
+                result.errors.append({"index": index, "message": "shift_type_id is required for non-standard shifts"})
+                continue
+
+        conflicts = timeline.conflicts(vigilante_id, start, end, minimum_rest_hours)
+        if conflicts:
+            other = conflicts[0]
+            source = f"row {accepted_rows[id(other)]}" if id(other) in accepted_rows else f"shift {other.id}"
+            result.errors.append({
+                "index": index,
+                "message": f"Overlaps or leaves less than {minimum_rest_hours} hours of rest with {source}"
+            })
+            continue
+
+        assignment = RosterAssignment(vigilante_id, building_id, shift_type_id, start, end)
+        shift = assignment.to_shift()
+        timeline.add(shift)
+        accepted_rows[id(shift)] = index
+        result.accepted.append((index, assignment))
+
+    return result
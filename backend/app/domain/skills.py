@@ -0,0 +1,104 @@
+"""
+Skill registry
+Interns skill, certification and security requirement names into integer
+bitmasks so matching is a popcount of an AND instead of set intersections
+"""
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+
+# Boolean columns of certificaciones_vigilantes; they always take bits 0-3 so
+# masks can be translated straight into SQL filters
+CERTIFICATION_FLAGS = ('curso_vigilancia', 'manejo_armas', 'medios_electronicos', 'primeros_auxilios')
+
+MAX_SKILLS = 64
+
+# Top bit, never registered: a requirement naming an unknown skill gets it, so
+# no vigilante covers it
+UNSATISFIABLE = 1 << (MAX_SKILLS - 1)
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """Element-wise count of set bits of a uint64 array"""
+    masks = np.asarray(masks, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks).astype(np.int64)
+    # NumPy < 2.0: count per byte through a lookup table
+    as_bytes = masks[..., None].view(np.uint8)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+class SkillRegistry:
+    """Maps skill names to bit positions
+
+    Names get a bit only through intern; lookups never register them.
+    """
+
+    def __init__(self, names: Iterable[str] = CERTIFICATION_FLAGS):
+        self._bits: Dict[str, int] = {}
+        for name in names:
+            self.intern(name)
+        self._certification_mask = self.mask(CERTIFICATION_FLAGS)
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def intern(self, name: str) -> int:
+        """Get the single-bit mask for a name, registering it if new"""
+        bit = self._bits.get(name)
+        if bit is None:
+            if len(self._bits) >= MAX_SKILLS - 1:
+                raise ValueError(f"Skill registry is limited to {MAX_SKILLS - 1} distinct skills")
+            bit = self._bits[name] = len(self._bits)
+        return 1 << bit
+
+    def mask(self, names: Iterable[str]) -> int:
+        """Mask of the skills a vigilante holds; unknown names are ignored"""
+        mask = 0
+        for name in names:
+            bit = self._bits.get(name)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def requirement_mask(self, names: Iterable[str]) -> int:
+        """Mask of the skills a building requires; unknown names add UNSATISFIABLE"""
+        mask = 0
+        for name in names:
+            bit = self._bits.get(name)
+            mask |= UNSATISFIABLE if bit is None else 1 << bit
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        """Names whose bits are set in mask, in registration order"""
+        return [name for name, bit in self._bits.items() if mask >> bit & 1]
+
+    def mask_from_flags(self, record) -> int:
+        """Mask of the certification flags set on a certificaciones_vigilantes row"""
+        mask = 0
+        for name in CERTIFICATION_FLAGS:
+            if getattr(record, name, False):
+                mask |= 1 << self._bits[name]
+        return mask
+
+    @property
+    def certification_mask(self) -> int:
+        """Bits that map to certificaciones_vigilantes columns"""
+        return self._certification_mask
+
+    @staticmethod
+    def covers(mask: int, required: int) -> bool:
+        """Whether mask holds every bit of required"""
+        return mask & required == required
+
+    @staticmethod
+    def match_count(mask: int, required: int) -> int:
+        return (mask & required).bit_count()
+
+
+skill_registry = SkillRegistry()
+
+ARMED_GUARD_MASK = skill_registry.mask(['manejo_armas'])
@@ -0,0 +1,127 @@
+"""
+Spatial index over vigilantes' addresses
+Buckets vigilantes by their calle/carrera on a uniform grid so nearest
+candidate searches look at a few cells instead of every vigilante
+"""
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .models import Vigilante
+
+
+DEFAULT_CELL_SIZE = 10
+
+
+def grid_distance(street_a: int, avenue_a: int, street_b: int, avenue_b: int) -> float:
+    """Straight-line distance in blocks, as calcular_distancia computes it"""
+    return math.hypot(street_b - street_a, avenue_b - avenue_a)
+
+
+class SpatialGridIndex:
+    """Uniform grid of cell_size x cell_size blocks
+
+    nearest() walks square rings of cells outwards from the query point.
+    Once ring r is done, anything not yet seen is at least r * cell_size
+    away, so the walk stops as soon as k accepted candidates are that close.
+    Vigilantes without an address are kept aside and only offered after
+    every located one.
+    """
+
+    def __init__(self, vigilantes: Iterable[Vigilante] = (), cell_size: int = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[Vigilante]] = {}
+        self._unlocated: List[Vigilante] = []
+        self._bounds: Optional[Tuple[int, int, int, int]] = None
+        self._size = 0
+        for vigilante in vigilantes:
+            self.add(vigilante)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _cell(self, street: float, avenue: float) -> Tuple[int, int]:
+        return int(street // self.cell_size), int(avenue // self.cell_size)
+
+    def add(self, vigilante: Vigilante) -> None:
+        self._size += 1
+        if vigilante.street_number is None or vigilante.avenue_number is None:
+            self._unlocated.append(vigilante)
+            return
+        cell = self._cell(vigilante.street_number, vigilante.avenue_number)
+        self._cells.setdefault(cell, []).append(vigilante)
+        if self._bounds is None:
+            self._bounds = (cell[0], cell[0], cell[1], cell[1])
+        else:
+            min_x, max_x, min_y, max_y = self._bounds
+            self._bounds = (min(min_x, cell[0]), max(max_x, cell[0]), min(min_y, cell[1]), max(max_y, cell[1]))
+
+    def remove(self, vigilante_id: int) -> None:
+        for bucket in list(self._cells.values()) + [self._unlocated]:
+            for position, vigilante in enumerate(bucket):
+                if vigilante.id == vigilante_id:
+                    del bucket[position]
+                    self._size -= 1
+                    return
+
+    def nearest(
+        self,
+        street: Optional[int],
+        avenue: Optional[int],
+        k: int,
+        accept: Callable[[Vigilante], bool] = lambda v: True,
+        max_distance: Optional[float] = None
+    ) -> List[Tuple[Vigilante, Optional[float]]]:
+        """Up to k accepted vigilantes ordered by distance, then id
+
+        Unlocated vigilantes (distance None) fill any remaining places, as do
+        all vigilantes when the query point itself has no address.
+        """
+        if k <= 0:
+            return []
+        if street is None or avenue is None:
+            everyone = [v for bucket in self._cells.values() for v in bucket] + self._unlocated
+            return [(v, None) for v in sorted(everyone, key=lambda v: v.id) if accept(v)][:k]
+
+        found: List[Tuple[float, int, Vigilante]] = []
+        if self._bounds is not None:
+            center_x, center_y = self._cell(street, avenue)
+            min_x, max_x, min_y, max_y = self._bounds
+            last_ring = max(center_x - min_x, max_x - center_x, center_y - min_y, max_y - center_y)
+            for ring in range(last_ring + 1):
+                for cell in self._ring(center_x, center_y, ring):
+                    for vigilante in self._cells.get(cell, ()):
+                        distance = grid_distance(street, avenue, vigilante.street_number, vigilante.avenue_number)
+                        if max_distance is not None and distance > max_distance:
+                            continue
+                        if accept(vigilante):
+                            found.append((distance, vigilante.id, vigilante))
+                covered = ring * self.cell_size
+                if max_distance is not None and covered > max_distance:
+                    break
+                if len(found) >= k:
+                    found.sort(key=lambda item: item[:2])
+                    if found[k - 1][0] <= covered:
+                        break
+
+        found.sort(key=lambda item: item[:2])
+        result: List[Tuple[Vigilante, Optional[float]]] = [(v, d) for d, _, v in found[:k]]
+        if len(result) < k and max_distance is None:
+            for vigilante in sorted(self._unlocated, key=lambda v: v.id):
+                if accept(vigilante):
+                    result.append((vigilante, None))
+                    if len(result) == k:
+                        break
+        return result
+
+    @staticmethod
+    def _ring(center_x: int, center_y: int, ring: int) -> Iterable[Tuple[int, int]]:
+        """Cells at Chebyshev distance ring from the center cell"""
+        if ring == 0:
+            yield center_x, center_y
+            return
+        for x in range(center_x - ring, center_x + ring + 1):
+            yield x, center_y - ring
+            yield x, center_y + ring
+        for y in range(center_y - ring + 1, center_y + ring):
+            yield center_x - ring, y
+            yield center_x + ring, y
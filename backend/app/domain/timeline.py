@@ -0,0 +1,136 @@
+"""
+Time-ordered indexes over shifts
+Used by domain services to answer per-vigilante time queries without
+scanning the full shift history for every candidate
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from .models import Shift
+
+
+class ShiftTimeline:
+    """Shifts grouped by vigilante, kept sorted by start and by end time
+
+    Build it once per planning run and pass it to the assignment and
+    contingency services. Lookups are O(log n) in the vigilante's history.
+
+    The start-ordered arrays carry a running maximum of end times, which
+    makes the timeline an interval index: conflicts() reports the shifts
+    near a time range in O(log n + k) for a vigilante's (non-nested) shifts.
+    """
+
+    def __init__(self, shifts: Iterable[Shift] = ()):
+        self._starts: Dict[int, List[datetime]] = {}
+        self._ends: Dict[int, List[datetime]] = {}
+        self._by_end: Dict[int, List[Shift]] = {}
+        self._by_start: Dict[int, List[Shift]] = {}
+        self._max_end: Dict[int, List[datetime]] = {}
+
+        grouped: Dict[int, List[Shift]] = {}
+        for shift in shifts:
+            grouped.setdefault(shift.vigilante_id, []).append(shift)
+
+        for vigilante_id, vigilante_shifts in grouped.items():
+            vigilante_shifts.sort(key=lambda s: s.end_datetime)
+            self._by_end[vigilante_id] = vigilante_shifts
+            self._ends[vigilante_id] = [s.end_datetime for s in vigilante_shifts]
+            by_start = sorted(vigilante_shifts, key=lambda s: s.start_datetime)
+            self._by_start[vigilante_id] = by_start
+            self._starts[vigilante_id] = [s.start_datetime for s in by_start]
+            self._refresh_max_end(vigilante_id, 0)
+
+    def __len__(self) -> int:
+        return sum(len(ends) for ends in self._ends.values())
+
+    def add(self, shift: Shift) -> None:
+        """Insert a shift keeping the per-vigilante arrays sorted"""
+        ends = self._ends.setdefault(shift.vigilante_id, [])
+        by_end = self._by_end.setdefault(shift.vigilante_id, [])
+        position = bisect_right(ends, shift.end_datetime)
+        ends.insert(position, shift.end_datetime)
+        by_end.insert(position, shift)
+        starts = self._starts.setdefault(shift.vigilante_id, [])
+        position = bisect_right(starts, shift.start_datetime)
+        starts.insert(position, shift.start_datetime)
+        self._by_start.setdefault(shift.vigilante_id, []).insert(position, shift)
+        self._refresh_max_end(shift.vigilante_id, position)
+
+    def shifts_for(self, vigilante_id: int) -> List[Shift]:
+        """Get a vigilante's shifts ordered by end time"""
+        return list(self._by_end.get(vigilante_id, ()))
+
+    def last_shift(self, vigilante_id: int, before: Optional[datetime] = None) -> Optional[Shift]:
+        """Get the shift with the latest end time, optionally ending at or before a moment"""
+        ends = self._ends.get(vigilante_id)
+        if not ends:
+            return None
+        position = len(ends) if before is None else bisect_right(ends, before)
+        if position == 0:
+            return None
+        return self._by_end[vigilante_id][position - 1]
+
+    def count_starting_between(
+        self,
+        vigilante_id: int,
+        since: datetime,
+        until: Optional[datetime] = None
+    ) -> int:
+        """Count shifts starting in [since, until); open-ended when until is None"""
+        starts = self._starts.get(vigilante_id)
+        if not starts:
+            return 0
+        upper = len(starts) if until is None else bisect_left(starts, until)
+        return max(0, upper - bisect_left(starts, since))
+
+    def conflicts(
+        self,
+        vigilante_id: int,
+        start: datetime,
+        end: datetime,
+        rest_hours: float = 0,
+        exclude_id: Optional[int] = None
+    ) -> List[Shift]:
+        """Shifts overlapping [start - rest_hours, end + rest_hours]
+
+        Covers overlaps and too-short gaps on both sides of the range.
+        Touching the boundary exactly (a gap of rest_hours) is not a conflict.
+        """
+        starts = self._starts.get(vigilante_id)
+        if not starts:
+            return []
+        rest = timedelta(hours=rest_hours)
+        lower, upper = start - rest, end + rest
+        by_start = self._by_start[vigilante_id]
+        max_end = self._max_end[vigilante_id]
+
+        found = []
+        # Candidates start before upper; walk back while some earlier shift
+        # can still end after lower
+        index = bisect_left(starts, upper) - 1
+        while index >= 0 and max_end[index] > lower:
+            shift = by_start[index]
+            if shift.end_datetime > lower and (exclude_id is None or shift.id != exclude_id):
+                found.append(shift)
+            index -= 1
+        found.reverse()
+        return found
+
+    def has_conflict(
+        self,
+        vigilante_id: int,
+        start: datetime,
+        end: datetime,
+        rest_hours: float = 0,
+        exclude_id: Optional[int] = None
+    ) -> bool:
+        return bool(self.conflicts(vigilante_id, start, end, rest_hours, exclude_id))
+
+    def _refresh_max_end(self, vigilante_id: int, position: int) -> None:
+        by_start = self._by_start[vigilante_id]
+        max_end = self._max_end.setdefault(vigilante_id, [])
+        del max_end[position:]
+        running = max_end[-1] if max_end else None
+        for shift in by_start[position:]:
+            running = shift.end_datetime if running is None else max(running, shift.end_datetime)
+            max_end.append(running)
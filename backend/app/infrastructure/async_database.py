@@ -0,0 +1,248 @@
+"""
+Async database access for the read API
+Async engines (asyncpg on PostgreSQL, aiosqlite on SQLite) and read-only
+repositories that return the same dicts and Pages as their SQL*
+counterparts in database.py, whose statements and converters they reuse
+"""
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.domain.pagination import DEFAULT_PAGE_SIZE, Page
+from .database import (
+    BuildingModel,
+    DatabaseSession,
+    LiquidacionEdificioModel,
+    LiquidacionMensualModel,
+    ReplicaSet,
+    SQLBuildingRepository,
+    SQLPayrollRepository,
+    SQLReportRepository,
+    SQLShiftRepository,
+    SQLVigilanteRepository,
+    ShiftModel,
+    VigilanteModel,
+    _filtered,
+    _keyset_query,
+    _rows_to_page,
+)
+
+
+# Async driver used when a URL names a backend with a sync driver
+ASYNC_DRIVERS = {
+    'postgresql': 'asyncpg',
+    'sqlite': 'aiosqlite',
+    'mysql': 'aiomysql',
+    'mariadb': 'aiomysql',
+}
+
+
+def async_database_url(database_url):
+    """The same database behind its async driver: postgresql:// becomes postgresql+asyncpg://"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None or url.drivername == f'{backend}+{driver}':
+        return url
+    return url.set(drivername=f'{backend}+{driver}')
+
+
+class AsyncDatabaseSession:
+    """Async engines of the read API
+
+    session() opens an AsyncSession on the next replica in turn, or on the
+    primary when there are none: everything served through here only reads.
+    URLs may name sync drivers; they are switched to the async ones.
+    """
+
+    def __init__(
+        self,
+        database_url,
+        replica_urls=(),
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False
+    ):
+        options = {
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_timeout': pool_timeout,
+            'pool_recycle': pool_recycle,
+            'pool_pre_ping': pool_pre_ping
+        }
+        self.engine = self._create_engine(database_url, **options)
+        self.replicas = ReplicaSet(self._create_engine(url, **options) for url in replica_urls)
+        self.Session = async_sessionmaker(expire_on_commit=False)
+
+    @staticmethod
+    def _create_engine(database_url, pool_pre_ping, **pool_options):
+        url = async_database_url(database_url)
+        options = {'pool_pre_ping': pool_pre_ping}
+        if url.get_backend_name() != 'sqlite':
+            options.update(pool_options)
+        return create_async_engine(url, echo=False, **options)
+
+    def session(self):
+        """A new AsyncSession, to be used as an async context manager"""
+        return self.Session(bind=self.replicas.next() if self.replicas else self.engine)
+
+    def pool_status(self):
+        """Pool occupancy of the primary and of each replica"""
+        status = DatabaseSession._pool_status(self.engine.sync_engine)
+        if self.replicas:
+            status['replicas'] = [DatabaseSession._pool_status(engine.sync_engine) for engine in self.replicas.engines]
+        return status
+
+    async def dispose(self):
+        """Close every pooled connection"""
+        for engine in [self.engine, *self.replicas.engines]:
+            await engine.dispose()
+
+
+# Repository implementations
+class AsyncSQLVigilanteRepository:
+    """Async read-only counterpart of SQLVigilanteRepository"""
+
+    def __init__(self, database: AsyncDatabaseSession):
+        self.database = database
+
+    async def get_all(self, filters=None) -> List[dict]:
+        """Get all active vigilantes"""
+        try:
+            async with self.database.session() as session:
+                vigilantes = await session.scalars(select(VigilanteModel).where(VigilanteModel.activo == True))
+                return [SQLVigilanteRepository._to_dict(v) for v in vigilantes]
+        except Exception as e:
+            print(f"Error getting vigilantes: {e}")
+            return []
+
+    async def get_by_id(self, vigilante_id) -> Optional[dict]:
+        """Get vigilante by ID"""
+        try:
+            async with self.database.session() as session:
+                vigilante = await session.scalar(select(VigilanteModel).where(
+                    VigilanteModel.id_vigilante == vigilante_id,
+                    VigilanteModel.activo == True
+                ))
+                return SQLVigilanteRepository._to_dict(vigilante) if vigilante else None
+        except Exception as e:
+            print(f"Error getting vigilante {vigilante_id}: {e}")
+            return None
+
+
+class AsyncSQLBuildingRepository:
+    """Async read-only counterpart of SQLBuildingRepository"""
+
+    def __init__(self, database: AsyncDatabaseSession):
+        self.database = database
+
+    async def get_all(self) -> List[dict]:
+        """Get all active buildings"""
+        try:
+            async with self.database.session() as session:
+                buildings = await session.scalars(select(BuildingModel).where(BuildingModel.activo == True))
+                return [SQLBuildingRepository._to_dict(b) for b in buildings]
+        except Exception as e:
+            print(f"Error getting buildings: {e}")
+            return []
+
+    async def get_by_id(self, building_id) -> Optional[dict]:
+        """Get building by ID"""
+        try:
+            async with self.database.session() as session:
+                building = await session.scalar(select(BuildingModel).where(
+                    BuildingModel.id_edificio == building_id,
+                    BuildingModel.activo == True
+                ))
+                return SQLBuildingRepository._to_dict(building) if building else None
+        except Exception as e:
+            print(f"Error getting building {building_id}: {e}")
+            return None
+
+
+class AsyncSQLShiftRepository:
+    """Async read-only counterpart of SQLShiftRepository"""
+
+    def __init__(self, database: AsyncDatabaseSession):
+        self.database = database
+
+    async def get_all(self, filters=None, limit=DEFAULT_PAGE_SIZE, after=None) -> Page:
+        """Get one page of shifts ordered by (hora_inicio, id_asignacion); see SQLShiftRepository.get_all"""
+        query = _filtered(
+            select(ShiftModel).options(*SQLShiftRepository.READ_OPTIONS),
+            filters, ShiftModel.hora_inicio, SQLShiftRepository.FILTER_COLUMNS
+        )
+        query = _keyset_query(query, ShiftModel.hora_inicio, ShiftModel.id_asignacion, limit, after)
+        async with self.database.session() as session:
+            rows = (await session.scalars(query)).all()
+            return _rows_to_page(rows, ShiftModel.hora_inicio, ShiftModel.id_asignacion, limit, SQLShiftRepository._to_dict)
+
+    async def get_by_id(self, shift_id) -> Optional[dict]:
+        """Get shift by ID"""
+        try:
+            async with self.database.session() as session:
+                shift = await session.scalar(
+                    select(ShiftModel).options(*SQLShiftRepository.READ_OPTIONS).where(ShiftModel.id_asignacion == shift_id)
+                )
+                return SQLShiftRepository._to_dict(shift) if shift else None
+        except Exception as e:
+            print(f"Error getting shift {shift_id}: {e}")
+            return None
+
+
+class AsyncSQLPayrollRepository:
+    """Async read-only counterpart of the liquidation lookups of SQLPayrollRepository"""
+
+    def __init__(self, database: AsyncDatabaseSession):
+        self.database = database
+
+    async def get_vigilante_liquidation(self, vigilante_id, mes, anio) -> Optional[dict]:
+        """Current liquidacion_mensual row of a vigilante, by its unique key"""
+        async with self.database.session() as session:
+            model = await session.scalar(
+                SQLPayrollRepository._liquidation_query(LiquidacionMensualModel, 'id_vigilante', vigilante_id, mes, anio)
+            )
+            return SQLPayrollRepository._liquidation_to_dict(model, 'id_vigilante') if model else None
+
+    async def get_building_liquidation(self, building_id, mes, anio) -> Optional[dict]:
+        """Current liquidacion_edificio row of a building, by its unique key"""
+        async with self.database.session() as session:
+            model = await session.scalar(
+                SQLPayrollRepository._liquidation_query(LiquidacionEdificioModel, 'id_edificio', building_id, mes, anio)
+            )
+            return SQLPayrollRepository._liquidation_to_dict(model, 'id_edificio') if model else None
+
+
+class AsyncSQLReportRepository:
+    """Async read-only counterpart of SQLReportRepository"""
+
+    def __init__(self, database: AsyncDatabaseSession):
+        self.database = database
+
+    async def get_vigilante_hours(self, vigilante_id, start_date, end_date) -> List[dict]:
+        """Get vigilante hours for a period"""
+        try:
+            async with self.database.session() as session:
+                hours = await session.scalars(
+                    SQLReportRepository._vigilante_hours_query(vigilante_id, start_date, end_date)
+                )
+                return [SQLReportRepository._hours_to_dict(h) for h in hours]
+        except Exception as e:
+            print(f"Error getting hours for vigilante {vigilante_id}: {e}")
+            return []
+
+    async def get_building_report(self, building_id, start_date, end_date) -> List[dict]:
+        """Get building report for a period"""
+        try:
+            async with self.database.session() as session:
+                shifts = await session.scalars(
+                    SQLReportRepository._building_report_query(building_id, start_date, end_date)
+                )
+                return [SQLReportRepository._shift_to_dict(s) for s in shifts]
+        except Exception as e:
+            print(f"Error getting building report {building_id}: {e}")
+            return []
@@ -0,0 +1,248 @@
+"""
+Repository cache
+Read-mostly repository results kept in a per-process LRU in front of an
+optional shared backend (Redis), invalidated on writes by bumping a version
+number that is part of every key of the namespace
+"""
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .database import primary_reads
+
+
+class InMemoryCacheBackend:
+    """Shared-backend stand-in living in one process, for tests and single-process runs
+
+    Same get/set/incr contract as RedisCacheBackend: values are strings,
+    set takes a TTL in seconds and incr creates missing counters at 0.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._values: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            expires = self._expires.get(key)
+            if expires is not None and expires <= self._clock():
+                self._values.pop(key, None)
+                self._expires.pop(key, None)
+            value = self._values.get(key)
+            return None if value is None else str(value)
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._values[key] = value
+            if ttl:
+                self._expires[key] = self._clock() + ttl
+            else:
+                self._expires.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._values.get(key) or 0) + 1
+            self._values[key] = value
+            return value
+
+
+class RedisCacheBackend:
+    """Shared backend on Redis; the client is created on first use"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url, decode_responses=True)
+        return self._client
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self.client.set(key, value, ex=int(ttl) if ttl else None)
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(key)
+
+
+class RepositoryCache:
+    """Two-level cache of JSON-serializable repository results by namespace
+
+    Keys are prefix:namespace:version:key. invalidate() bumps the namespace's
+    version, so every entry written before it stops being found at once, in
+    this process and, through the shared backend, in every other one after
+    at most version_check_seconds. Entries are stored as JSON and decoded on
+    every hit, so callers never share a mutable result. A shared backend that
+    fails is counted in errors and skipped; reads then go to the loader.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300,
+        version_check_seconds: float = 1.0,
+        prefix: str = 'schedules',
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self.prefix = prefix
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (expires, json)
+        self._versions: Dict[str, tuple] = {}  # namespace -> (version, checked_at)
+        self._counters = dict.fromkeys(('local_hits', 'shared_hits', 'misses', 'invalidations', 'errors'), 0)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _version_key(self, namespace: str) -> str:
+        return f'{self.prefix}:{namespace}:version'
+
+    def version(self, namespace: str) -> int:
+        """Current version of a namespace, re-read from the shared backend every version_check_seconds"""
+        now = self._clock()
+        with self._lock:
+            version, checked_at = self._versions.get(namespace, (0, None))
+        if self.backend is None or (checked_at is not None and now - checked_at < self.version_check_seconds):
+            return version
+        try:
+            version = int(self.backend.get(self._version_key(namespace)) or 0)
+        except Exception:
+            self._count('errors')
+        with self._lock:
+            self._versions[namespace] = (version, now)
+        return version
+
+    def get_or_load(self, namespace: str, key: str, loader: Callable[[], Any]) -> Any:
+        """Cached value of key, or loader() stored for next time; None results are not cached"""
+        full_key = f'{self.prefix}:{namespace}:{self.version(namespace)}:{key}'
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(full_key)
+                self._counters['local_hits'] += 1
+                return json.loads(entry[1])
+
+        if self.backend is not None:
+            try:
+                encoded = self.backend.get(full_key)
+            except Exception:
+                self._count('errors')
+                encoded = None
+            if encoded is not None:
+                self._count('shared_hits')
+                self._remember(full_key, encoded, now)
+                return json.loads(encoded)
+
+        self._count('misses')
+        value = loader()
+        if value is None:
+            return None
+        encoded = json.dumps(value)
+        self._remember(full_key, encoded, now)
+        if self.backend is not None:
+            try:
+                self.backend.set(full_key, encoded, self.ttl_seconds)
+            except Exception:
+                self._count('errors')
+        return json.loads(encoded)
+
+    def _remember(self, full_key: str, encoded: str, now: float) -> None:
+        with self._lock:
+            self._entries[full_key] = (now + self.ttl_seconds, encoded)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace: str) -> None:
+        """Retire every cached entry of a namespace by moving it to a new version"""
+        version = self.version(namespace) + 1
+        if self.backend is not None:
+            try:
+                version = max(version, int(self.backend.incr(self._version_key(namespace))))
+            except Exception:
+                self._count('errors')
+        with self._lock:
+            self._versions[namespace] = (version, self._clock())
+            self._counters['invalidations'] += 1
+
+    def clear(self) -> None:
+        """Drop this process's entries; shared entries stay until their version moves or they expire"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss, invalidation and backend error counters, and the local entry count"""
+        with self._lock:
+            stats = dict(self._counters, entries=len(self._entries))
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['local_hits'] + stats['shared_hits']) / lookups, 4) if lookups else 0.0
+        stats['backend'] = type(self.backend).__name__ if self.backend is not None else None
+        return stats
+
+
+class CachedRepository:
+    """Caching decorator over a repository
+
+    Calls to the reads methods are answered from cache, keyed by method and
+    arguments; calls to the writes methods go to the repository and then
+    invalidate the namespace, whether or not they succeed. Any other
+    attribute is the repository's own.
+    """
+
+    def __init__(
+        self,
+        repository,
+        cache: RepositoryCache,
+        namespace: str,
+        reads: Iterable[str] = ('get_by_id', 'get_all'),
+        writes: Iterable[str] = ('create', 'update', 'delete')
+    ):
+        self.repository = repository
+        self.cache = cache
+        self.namespace = namespace
+        self.reads = frozenset(reads)
+        self.writes = frozenset(writes)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.repository, name)
+        if name in self.reads:
+            return functools.partial(self._read, name, attribute)
+        if name in self.writes:
+            return functools.partial(self._write, attribute)
+        return attribute
+
+    def _read(self, name, method, *args, **kwargs):
+        key = json.dumps([name, args, sorted(kwargs.items())], default=str, sort_keys=True)
+        return self.cache.get_or_load(self.namespace, key, lambda: self._load(method, *args, **kwargs))
+
+    def _load(self, method, *args, **kwargs):
+        # A lagging replica read right after an invalidation would be cached
+        # for the whole TTL, so misses read the primary
+        session = getattr(self.repository, 'session', None)
+        if session is None:
+            return method(*args, **kwargs)
+        with primary_reads(session):
+            return method(*args, **kwargs)
+
+    def _write(self, method, *args, **kwargs):
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self.cache.invalidate(self.namespace)
@@ -1,13 +1,27 @@
 from celery import Celery
+from celery.schedules import crontab
+from datetime import date
 import os
 
 def make_celery(app):
+    """Celery bound to the Flask app's config, running every task inside its app context"""
     celery = Celery(app.import_name, backend=app.config['CELERY_RESULT_BACKEND'], broker=app.config['CELERY_BROKER_URL'])
     celery.conf.update(app.config)
+
+    class ContextTask(celery.Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                return self.run(*args, **kwargs)
+
+    celery.Task = ContextTask
     return celery
 
-# Initialize Celery
-app = ...  # Import your Flask app here
+# Initialize Celery on the API's app, which also builds the shared database
+# and wires the holiday calendar. Start with:
+#     celery -A app.infrastructure.celery_worker.celery worker --beat
+from app.main import create_app
+
+app = create_app()
 celery = make_celery(app)
 
 @celery.task
@@ -15,4 +29,44 @@ def example_task(arg1, arg2):
     # Example task that could be run asynchronously
     return arg1 + arg2
 
-# Additional tasks can be defined here as needed.
\ No newline at end of file
+@celery.task
+def reconcile_payroll(mes=None, anio=None, repair=False):
+    """Check a month's running payroll totals (default: the current one) against a full recompute"""
+    from app.application.services import PayrollService
+    from app.infrastructure.database import SQLPayrollRepository
+    from app.interface.api.db import database
+
+    today = date.today()
+    session = database.get_session()
+    try:
+        service = PayrollService(SQLPayrollRepository(session))
+        return service.reconcile_month(mes or today.month, anio or today.year, repair=repair)
+    finally:
+        session.close()
+
+@celery.task
+def refresh_availability():
+    """Rewrite the disponibilidad_vigilantes rows whose next shift has started or ended since they were computed"""
+    from app.infrastructure.database import SQLDashboardRepository
+    from app.interface.api.db import database
+
+    session = database.get_session()
+    try:
+        return SQLDashboardRepository(session).refresh_due_availability()
+    finally:
+        session.close()
+
+# Nightly drift report; pass repair=True to overwrite drifting totals instead.
+# Availability rows past their vigente_hasta are read live until refreshed
+celery.conf.beat_schedule = {
+    'reconcile-payroll': {
+        'task': reconcile_payroll.name,
+        'schedule': crontab(hour=2, minute=30),
+    },
+    'refresh-availability': {
+        'task': refresh_availability.name,
+        'schedule': crontab(minute='*/5'),
+    },
+}
+
+# Additional tasks can be defined here as needed.
@@ -3,12 +3,24 @@ Database models and configuration for SchedulesApp
 Implements SQLAlchemy models that map to PostgreDB.sql schema
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, Date, DateTime, Time, Text, DECIMAL, ForeignKey, CheckConstraint
+from sqlalchemy import create_engine, insert, select, update, cast, tuple_, or_, case, extract, literal, text, table as table_clause, column as column_clause, Column, Integer, BigInteger, String, Boolean, Date, DateTime, Time, Text, DECIMAL, ForeignKey, CheckConstraint, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy import event
+from sqlalchemy.orm import Session, scoped_session, sessionmaker, relationship, joinedload, selectinload
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.sql import func
+from contextlib import contextmanager
 from datetime import datetime, date
+import functools
+import io
+import itertools
 import os
+import threading
+import time
+
+import pandas as pd
 
 Base = declarative_base()
 
@@ -33,6 +45,132 @@ def create_tables():
     engine = create_engine_instance()
     Base.metadata.create_all(engine)
 
+def _copy_field(value) -> str:
+    """One field of COPY's CSV format: None as an unquoted empty field, which COPY reads as NULL,
+    and anything that could be mistaken for it or for a delimiter quoted"""
+    if value is None:
+        return ''
+    field = str(value)
+    if field in ('', '\\.') or any(character in field for character in ',"\r\n'):
+        return '"' + field.replace('"', '""') + '"'
+    return field
+
+
+def _copy_csv(rows, columns) -> io.StringIO:
+    """rows as the CSV body of a COPY ... FROM STDIN, keeping empty strings apart from NULLs"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(','.join(_copy_field(row[column]) for column in columns))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+
+def copy_rows(session, model, rows) -> int:
+    """Insert many rows into a model's table (or a plain table()) inside the session's transaction
+
+    On PostgreSQL the rows are streamed with COPY ... FROM STDIN as CSV; other
+    dialects get a single executemany. Every row must carry the same keys and
+    set every column it relies on, since COPY skips ORM-side defaults.
+    """
+    if not rows:
+        return 0
+    target = getattr(model, '__table__', model)
+    connection = session.connection()
+    if connection.dialect.name != 'postgresql':
+        session.execute(insert(target), rows)
+        return len(rows)
+
+    # COPY bypasses the ORM, so nothing else tells the session it wrote
+    pin_to_primary(session)
+
+    columns = list(rows[0])
+    buffer = _copy_csv(rows, columns)
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {target.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+class StagedImport:
+    """Rows of one bulk import, loaded chunk by chunk and published together
+
+    On PostgreSQL each chunk is COPYed into a temporary copy of the table
+    (dropped at commit) and finish() merges it into the table with one
+    INSERT ... SELECT, skipping rows whose conflict_column value was
+    inserted concurrently. Other dialects insert the chunks straight into
+    the table. Either way nothing is visible before finish() commits and
+    abort() leaves the table untouched.
+    """
+
+    def __init__(self, session, model, conflict_column=None):
+        self.session = session
+        self.model = model
+        self.conflict_column = conflict_column
+        self.staging_name = f'importacion_{model.__tablename__}'
+        self.columns = None
+        self.staged = 0
+        self._postgres = session.connection().dialect.name == 'postgresql'
+
+    def _staging(self):
+        return table_clause(self.staging_name, *(column_clause(name) for name in self.columns))
+
+    def stage(self, rows) -> int:
+        """Load a chunk of validated rows; every chunk must carry the same columns"""
+        if not rows:
+            return 0
+        if self.columns is None:
+            self.columns = list(rows[0])
+            if self._postgres:
+                self.session.execute(text(
+                    f"CREATE TEMP TABLE {self.staging_name} ON COMMIT DROP AS "
+                    f"SELECT {', '.join(self.columns)} FROM {self.model.__tablename__} WITH NO DATA"
+                ))
+        copy_rows(self.session, self._staging() if self._postgres else self.model, rows)
+        self.staged += len(rows)
+        return len(rows)
+
+    def finish(self) -> int:
+        """Publish the staged rows and commit; returns how many were inserted"""
+        inserted = self.staged
+        if self._postgres and self.staged:
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+            staging = self._staging()
+            statement = pg_insert(self.model.__table__).from_select(
+                self.columns, select(*(staging.c[name] for name in self.columns))
+            )
+            if self.conflict_column:
+                statement = statement.on_conflict_do_nothing(index_elements=[self.conflict_column])
+            inserted = self.session.execute(statement).rowcount
+        self.session.commit()
+        return inserted
+
+    def abort(self) -> None:
+        self.session.rollback()
+
+
+def _stored_values(session, columns, values):
+    """Which of the given values each column already holds, for all columns in one query
+
+    columns maps a name to the column expression to compare (e.g. lower() of
+    an email), values maps the same names to the candidate values.
+    """
+    found = {name: set() for name in values}
+    conditions = [columns[name].in_(candidates) for name, candidates in values.items() if candidates]
+    if not conditions:
+        return found
+    query = select(*(columns[name].label(name) for name in values)).where(or_(*conditions))
+    for row in session.execute(query):
+        for name, candidates in values.items():
+            if getattr(row, name) in candidates:
+                found[name].add(getattr(row, name))
+    return found
+
 # User Management Models
 class UserModel(Base):
     """Users table - usuarios"""
@@ -77,6 +215,7 @@ class VigilanteModel(Base):
     
     __table_args__ = (
         CheckConstraint("tipo_contrato IN ('fijo_full_time', 'relevo_part_time')"),
+        Index('idx_vigilantes_activos', 'id_vigilante', postgresql_where=activo == True, sqlite_where=activo == True),
     )
 
 class CertificacionVigilanteModel(Base):
@@ -93,6 +232,10 @@ class CertificacionVigilanteModel(Base):
     
     # Relationship
     vigilante = relationship("VigilanteModel", backref="certificaciones")
+    
+    __table_args__ = (
+        Index('idx_certificaciones_vigilante', 'id_vigilante'),
+    )
 
 # Buildings Management Models
 class BuildingModel(Base):
@@ -114,6 +257,7 @@ class BuildingModel(Base):
     __table_args__ = (
         CheckConstraint("tipo_turno IN ('8_horas', '12_horas', '24_horas')"),
         CheckConstraint("horas_semanales >= 40 AND horas_semanales <= 48"),
+        Index('idx_edificios_activos', 'id_edificio', postgresql_where=activo == True, sqlite_where=activo == True),
     )
 
 # Shift Types and Planning Models
@@ -169,6 +313,12 @@ class ShiftModel(Base):
     
     __table_args__ = (
         CheckConstraint("estado IN ('programado', 'confirmado', 'completado', 'ausente')"),
+        # Rest windows and per-vigilante listings; id_asignacion completes the keyset order
+        Index('idx_asignaciones_vigilante_inicio', 'id_vigilante', 'hora_inicio', 'id_asignacion'),
+        Index('idx_asignaciones_edificio_fecha', 'id_edificio', 'fecha'),
+        # Date-range reads and the keyset-paginated listing
+        Index('idx_asignaciones_inicio', 'hora_inicio', 'id_asignacion'),
+        Index('idx_asignaciones_planilla', 'id_planilla'),
     )
 
 # Contingencies and Incidents Models
@@ -199,6 +349,10 @@ class NovedadModel(Base):
     __table_args__ = (
         CheckConstraint("tipo_novedad IN ('incapacidad', 'ausencia', 'contingencia', 'despido', 'calamidad', 'permiso', 'vacaciones', 'solicitud_vigilante')"),
         CheckConstraint("estado IN ('pendiente', 'resuelta', 'cancelada')"),
+        Index('idx_novedades_vigilante_inicio', 'id_vigilante_original', 'hora_inicio'),
+        Index('idx_novedades_inicio', 'hora_inicio', 'id_novedad'),
+        Index('idx_novedades_edificio_fecha', 'id_edificio', 'fecha_novedad'),
+        Index('idx_novedades_asignacion', 'id_asignacion_original'),
     )
 
 # Hours Registration and Payroll Models
@@ -207,23 +361,95 @@ class RegistroHorasModel(Base):
     __tablename__ = 'registro_horas'
     
     id_registro = Column(Integer, primary_key=True, autoincrement=True)
-    id_asignacion = Column(Integer, ForeignKey('asignaciones_turnos.id_asignacion'), nullable=False)
+    id_asignacion = Column(Integer, ForeignKey('asignaciones_turnos.id_asignacion'), nullable=False, unique=True)
     id_vigilante = Column(Integer, ForeignKey('vigilantes.id_vigilante'), nullable=False)
     id_edificio = Column(Integer, ForeignKey('edificios.id_edificio'), nullable=False)
     fecha = Column(Date, nullable=False)
     hora_inicio = Column(DateTime, nullable=False)
     hora_fin = Column(DateTime, nullable=False)
     horas_normales = Column(DECIMAL(5, 2), default=0)
-    horas_extras = Column(DECIMAL(5, 2), default=0)
-    horas_festivas = Column(DECIMAL(5, 2), default=0)
-    observaciones = Column(Text)
-    registrado_por = Column(Integer, ForeignKey('usuarios.id_usuario'))
-    fecha_registro = Column(DateTime, default=func.now())
+    horas_extras_diurnas = Column(DECIMAL(5, 2), default=0)
+    horas_extras_nocturnas = Column(DECIMAL(5, 2), default=0)
+    horas_extras_festivas_diurnas = Column(DECIMAL(5, 2), default=0)
+    horas_extras_festivas_nocturnas = Column(DECIMAL(5, 2), default=0)
+    es_festivo = Column(Boolean, default=False)
+    # salario the row was valued at; NULL rows are valued at the current salario
+    salario_aplicado = Column(DECIMAL(10, 2))
+    calculado_por = Column(Integer, ForeignKey('usuarios.id_usuario'))
+    fecha_calculo = Column(DateTime, default=func.now())
     
     # Relationships
     asignacion = relationship("ShiftModel")
     vigilante = relationship("VigilanteModel")
     edificio = relationship("BuildingModel")
+    
+    __table_args__ = (
+        Index('idx_registro_horas_fecha', 'fecha'),
+        Index('idx_registro_horas_vigilante_fecha', 'id_vigilante', 'fecha'),
+        Index('idx_registro_horas_edificio_fecha', 'id_edificio', 'fecha'),
+    )
+
+class LiquidacionMensualModel(Base):
+    """Monthly payroll per vigilante - liquidacion_mensual"""
+    __tablename__ = 'liquidacion_mensual'
+    
+    id_liquidacion = Column(Integer, primary_key=True, autoincrement=True)
+    id_vigilante = Column(Integer, ForeignKey('vigilantes.id_vigilante'), nullable=False)
+    mes = Column(Integer, nullable=False)
+    anio = Column(Integer, nullable=False)
+    total_horas_normales = Column(DECIMAL(6, 2), default=0)
+    total_horas_extras_diurnas = Column(DECIMAL(6, 2), default=0)
+    total_horas_extras_nocturnas = Column(DECIMAL(6, 2), default=0)
+    total_horas_extras_festivas_diurnas = Column(DECIMAL(6, 2), default=0)
+    total_horas_extras_festivas_nocturnas = Column(DECIMAL(6, 2), default=0)
+    valor_horas_normales = Column(DECIMAL(10, 2), default=0)
+    valor_horas_extras_diurnas = Column(DECIMAL(10, 2), default=0)
+    valor_horas_extras_nocturnas = Column(DECIMAL(10, 2), default=0)
+    valor_horas_extras_festivas_diurnas = Column(DECIMAL(10, 2), default=0)
+    valor_horas_extras_festivas_nocturnas = Column(DECIMAL(10, 2), default=0)
+    valor_total = Column(DECIMAL(12, 2), default=0)
+    procesado_por = Column(Integer, ForeignKey('usuarios.id_usuario'))
+    fecha_procesamiento = Column(DateTime, default=func.now())
+    
+    __table_args__ = (
+        CheckConstraint("mes >= 1 AND mes <= 12"),
+        UniqueConstraint('id_vigilante', 'mes', 'anio'),
+    )
+
+class LiquidacionEdificioModel(Base):
+    """Monthly payroll per building - liquidacion_edificio"""
+    __tablename__ = 'liquidacion_edificio'
+    
+    id_liquidacion_edificio = Column(Integer, primary_key=True, autoincrement=True)
+    id_edificio = Column(Integer, ForeignKey('edificios.id_edificio'), nullable=False)
+    mes = Column(Integer, nullable=False)
+    anio = Column(Integer, nullable=False)
+    total_horas_normales = Column(DECIMAL(6, 2), default=0)
+    total_horas_extras_diurnas = Column(DECIMAL(6, 2), default=0)
+    total_horas_extras_nocturnas = Column(DECIMAL(6, 2), default=0)
+    total_horas_extras_festivas_diurnas = Column(DECIMAL(6, 2), default=0)
+    total_horas_extras_festivas_nocturnas = Column(DECIMAL(6, 2), default=0)
+    valor_horas_normales = Column(DECIMAL(10, 2), default=0)
+    valor_horas_extras_diurnas = Column(DECIMAL(10, 2), default=0)
+    valor_horas_extras_nocturnas = Column(DECIMAL(10, 2), default=0)
+    valor_horas_extras_festivas_diurnas = Column(DECIMAL(10, 2), default=0)
+    valor_horas_extras_festivas_nocturnas = Column(DECIMAL(10, 2), default=0)
+    valor_total = Column(DECIMAL(12, 2), default=0)
+    procesado_por = Column(Integer, ForeignKey('usuarios.id_usuario'))
+    fecha_procesamiento = Column(DateTime, default=func.now())
+    
+    __table_args__ = (
+        CheckConstraint("mes >= 1 AND mes <= 12"),
+        UniqueConstraint('id_edificio', 'mes', 'anio'),
+    )
+
+class FestivoModel(Base):
+    """Colombian holidays table - festivos_colombia"""
+    __tablename__ = 'festivos_colombia'
+    
+    id_festivo = Column(Integer, primary_key=True, autoincrement=True)
+    fecha = Column(Date, nullable=False, unique=True)
+    descripcion = Column(String(100))
 
 # System Configuration Model
 class ConfiguracionSistemaModel(Base):
@@ -241,10 +467,57 @@ class ConfiguracionSistemaModel(Base):
         CheckConstraint("minimo_horas_descanso >= 1 AND minimo_horas_descanso <= 12"),
     )
 
+# Dashboard Summary Models
+# Materialized forms of vista_cobertura_edificios and vista_vigilantes_disponibles,
+# kept up to date by SQLDashboardRepository.refresh() in every transaction that
+# writes asignaciones_turnos
+class CoberturaEdificioModel(Base):
+    """Vigilantes per building, day and starting hour - cobertura_edificios"""
+    __tablename__ = 'cobertura_edificios'
+    
+    id_edificio = Column(Integer, ForeignKey('edificios.id_edificio', ondelete='CASCADE'), primary_key=True)
+    fecha = Column(Date, primary_key=True)
+    hora = Column(Integer, primary_key=True)
+    vigilantes_asignados = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        # The dashboard reads a date window across all buildings
+        Index('idx_cobertura_fecha', 'fecha', 'id_edificio', 'hora'),
+    )
+
+class DisponibilidadVigilanteModel(Base):
+    """Last finished and next upcoming shift per vigilante - disponibilidad_vigilantes"""
+    __tablename__ = 'disponibilidad_vigilantes'
+    
+    id_vigilante = Column(Integer, ForeignKey('vigilantes.id_vigilante', ondelete='CASCADE'), primary_key=True)
+    ultimo_turno_fin = Column(DateTime)
+    proximo_turno_inicio = Column(DateTime)
+    # First moment at which a shift starts or ends and the two values above change
+    vigente_hasta = Column(DateTime)
+    calculado_en = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index('idx_disponibilidad_vigente_hasta', 'vigente_hasta'),
+    )
+
 # Repository Base Classes for Clean Architecture
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from app.domain.models import User as DomainUser
+from app.domain.models import Vigilante as DomainVigilante, Building as DomainBuilding, Shift as DomainShift
+from app.domain.models import Novedad as DomainNovedad
+from app.domain.models import StatusEnum, ShiftTypeEnum
+from app.domain.skills import SkillRegistry, skill_registry
+from app.domain.hours import REGISTRO_HORAS_COLUMNS
+from app.domain.payroll import ACCUMULATED_COLUMNS
+from app.domain.pagination import DEFAULT_PAGE_SIZE, Page, encode_cursor
+from app.domain.fixed_point import MINUTES_PER_HOUR, HUNDREDTHS, minutes_to_hundredths, to_decimal
+
+def _to_datetime(value: Optional[date]) -> Optional[datetime]:
+    """Widen a DATE column value to a datetime at midnight"""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.combine(value, datetime.min.time())
 
 class UserRepository(ABC):
     """Abstract repository for User operations"""
@@ -551,20 +824,239 @@ class SQLBuildingRepository(BuildingRepository):
             'active': model.activo
         }
 
-class DatabaseSession:
-    """Database session manager for the application"""
+class PoolMetrics:
+    """Checkout counters for one engine's pool, safe to read from any thread"""
     
-    def __init__(self, database_url=None):
-        if database_url:
-            self.engine = create_engine(database_url, echo=False)
-        else:
-            self.engine = create_engine_instance()
-        self.Session = sessionmaker(bind=self.engine)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+    
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+    
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_ms_total': round(self.wait_seconds_total * 1000, 3),
+                'wait_ms_avg': round(self.wait_seconds_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                'wait_ms_max': round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+    
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+# Session.info keys used by RoutingSession
+REPLICA_READS = 'replica_reads'
+REPLICA_ENGINE = 'replica_engine'
+PINNED_TO_PRIMARY = 'pinned_to_primary'
+PRIMARY_READS = 'primary_reads'
+
+
+class ReplicaSet:
+    """Read replica engines handed out round-robin, safe to share between threads"""
+    
+    def __init__(self, engines=()):
+        self.engines = list(engines)
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(self.engines)
+    
+    def __bool__(self):
+        return bool(self.engines)
+    
+    def next(self):
+        with self._lock:
+            return next(self._cycle)
+
+
+class RoutingSession(Session):
+    """Session that sends read-only repository calls to a read replica
+    
+    Statements go to the primary unless they are plain SELECTs issued inside
+    replica_reads() and not inside primary_reads(). A session keeps the first replica it was given, so one
+    request reads from one replica. Once the session writes, every later read
+    stays on the primary until the session is closed, so a request sees its
+    own writes even when the replicas lag behind.
+    """
+    
+    def __init__(self, *args, replicas=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+    
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if (
+            self.replicas
+            and self.info.get(REPLICA_READS)
+            and not self.info.get(PRIMARY_READS)
+            and not self.info.get(PINNED_TO_PRIMARY)
+            and not self._flushing
+            and getattr(clause, 'is_select', False)
+            and getattr(clause, '_for_update_arg', None) is None
+        ):
+            engine = self.info.get(REPLICA_ENGINE)
+            if engine is None:
+                engine = self.info[REPLICA_ENGINE] = self.replicas.next()
+            return engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
+    
+    def close(self):
+        super().close()
+        self.info.pop(PINNED_TO_PRIMARY, None)
+        self.info.pop(REPLICA_ENGINE, None)
+
+
+def pin_to_primary(session) -> None:
+    """Send the session's reads to the primary until it is closed"""
+    session.info[PINNED_TO_PRIMARY] = True
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _pin_after_flush(session, flush_context):
+    pin_to_primary(session)
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _pin_after_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        pin_to_primary(orm_execute_state.session)
+
+
+@contextmanager
+def replica_reads(session):
+    """Let the session send the block's plain SELECTs to a read replica"""
+    info = session.info
+    info[REPLICA_READS] = info.get(REPLICA_READS, 0) + 1
+    try:
+        yield session
+    finally:
+        info[REPLICA_READS] -= 1
+
+
+@contextmanager
+def primary_reads(session):
+    """Keep the block's reads on the primary, even inside read_only methods"""
+    info = session.info
+    info[PRIMARY_READS] = info.get(PRIMARY_READS, 0) + 1
+    try:
+        yield session
+    finally:
+        info[PRIMARY_READS] -= 1
+
+
+def read_only(method):
+    """Run a repository method under replica_reads() on the repository's session"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with replica_reads(self.session):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class DatabaseSession:
+    """Database session manager for the application
+    
+    get_session() hands out independent sessions for scripts and workers.
+    scoped is a scoped_session proxy for web requests: each scope (as given
+    by scopefunc, the current thread by default) gets its own session until
+    remove() is called at the end of the scope. Server databases use a
+    TimedQueuePool sized by the pool arguments; SQLite keeps its default pool.
+    With replica_urls, sessions are RoutingSessions: repository methods marked
+    read_only read from the replicas in turn, everything else uses the primary.
+    """
+    
+    def __init__(
+        self,
+        database_url=None,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        scopefunc=None,
+        replica_urls=()
+    ):
+        options = {
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_timeout': pool_timeout,
+            'pool_recycle': pool_recycle,
+            'pool_pre_ping': pool_pre_ping
+        }
+        self.engine = self._create_engine(database_url or get_database_url(), **options)
+        self.replicas = ReplicaSet(self._create_engine(url, **options) for url in replica_urls)
+        self.Session = sessionmaker(bind=self.engine, class_=RoutingSession, replicas=self.replicas)
+        self.scoped = scoped_session(self.Session, scopefunc=scopefunc)
+    
+    @staticmethod
+    def _create_engine(database_url, pool_pre_ping, **pool_options):
+        url = make_url(database_url)
+        options = {'pool_pre_ping': pool_pre_ping}
+        if url.get_backend_name() != 'sqlite':
+            options.update(poolclass=TimedQueuePool, **pool_options)
+        return create_engine(url, echo=False, **options)
     
     def get_session(self):
         """Get a new database session"""
         return self.Session()
     
+    def remove(self):
+        """Close the current scope's session, rolling back anything left uncommitted"""
+        self.scoped.remove()
+    
+    def pool_status(self) -> Dict[str, Any]:
+        """Pool occupancy and checkout wait times, with one entry per replica"""
+        status = self._pool_status(self.engine)
+        if self.replicas:
+            status['replicas'] = [self._pool_status(engine) for engine in self.replicas.engines]
+        return status
+    
+    @staticmethod
+    def _pool_status(engine) -> Dict[str, Any]:
+        pool = engine.pool
+        status = {'pool': type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            status.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=pool.overflow()
+            )
+        metrics = getattr(pool, 'metrics', None)
+        if metrics is not None:
+            status.update(metrics.snapshot())
+        return status
+    
     def create_tables(self):
         """Create all database tables"""
         Base.metadata.create_all(self.engine)
@@ -576,8 +1068,9 @@ class SQLVigilanteRepository:
     def __init__(self, session=None):
         self.session = session or get_session()
     
-    def get_all(self):
-        """Get all vigilantes"""
+    @read_only
+    def get_all(self, filters=None):
+        """Get all active vigilantes"""
         try:
             vigilantes = self.session.query(VigilanteModel).filter(VigilanteModel.activo == True).all()
             return [self._to_dict(v) for v in vigilantes]
@@ -585,6 +1078,7 @@ class SQLVigilanteRepository:
             print(f"Error getting vigilantes: {e}")
             return []
     
+    @read_only
     def get_by_id(self, vigilante_id):
         """Get vigilante by ID"""
         try:
@@ -642,7 +1136,23 @@ class SQLVigilanteRepository:
             print(f"Error deleting vigilante {vigilante_id}: {e}")
             return False
     
-    def _to_dict(self, model):
+    def existing_keys(self, values):
+        """The given identification numbers and emails that are already registered, in one query"""
+        return _stored_values(self.session, {
+            'numero_identificacion': VigilanteModel.numero_identificacion,
+            'correo_electronico': func.lower(VigilanteModel.correo_electronico),
+        }, values)
+    
+    def start_import(self) -> StagedImport:
+        """A bulk import into vigilantes; identification numbers registered meanwhile are skipped"""
+        return StagedImport(self.session, VigilanteModel, conflict_column='numero_identificacion')
+    
+    def finish_import(self, staged: StagedImport) -> int:
+        """Publish a bulk import; returns the number of vigilantes created"""
+        return staged.finish()
+    
+    @staticmethod
+    def _to_dict(model):
         """Convert model to dictionary"""
         if not model:
             return None
@@ -657,6 +1167,54 @@ class SQLVigilanteRepository:
             'active': model.activo
         }
 
+    def get_active_vigilantes(self, required_mask: int = 0) -> List[DomainVigilante]:
+        """Get active vigilantes as domain entities, certifications loaded in one extra query
+        
+        required_mask is a skill_registry mask (e.g. ARMED_GUARD_MASK); its
+        certification bits are filtered in SQL, any other bits in Python.
+        """
+        query = (
+            self.session.query(VigilanteModel)
+            .options(selectinload(VigilanteModel.certificaciones))
+            .filter(VigilanteModel.activo == True)
+        )
+        for flag in skill_registry.names(required_mask & skill_registry.certification_mask):
+            query = query.filter(
+                VigilanteModel.certificaciones.any(getattr(CertificacionVigilanteModel, flag) == True)
+            )
+        vigilantes = [self._to_entity(v) for v in query.all()]
+        if required_mask & ~skill_registry.certification_mask:
+            vigilantes = [
+                v for v in vigilantes
+                if SkillRegistry.covers(v.skill_mask, required_mask)
+            ]
+        return vigilantes
+    
+    def _to_entity(self, model) -> DomainVigilante:
+        """Convert model to domain entity"""
+        mask = 0
+        for certificacion in model.certificaciones:
+            mask |= skill_registry.mask_from_flags(certificacion)
+        certifications = skill_registry.names(mask)
+        hire_date = _to_datetime(model.fecha_contratacion)
+        return DomainVigilante(
+            id=model.id_vigilante,
+            name=model.nombre_completo,
+            email=model.correo_electronico or '',
+            phone=model.telefono_celular,
+            document_id=model.numero_identificacion,
+            skills=certifications,
+            certifications=certifications,
+            status=StatusEnum.ACTIVE if model.activo else StatusEnum.INACTIVE,
+            hire_date=hire_date,
+            contract_start=hire_date,
+            contract_end=datetime.max,  # vigilantes has no contract end column
+            address=model.direccion_completa,
+            emergency_contact=model.contacto_emergencia_nombre,
+            street_number=model.direccion_calle,
+            avenue_number=model.direccion_carrera
+        )
+
 
 class SQLBuildingRepository:
     """SQL implementation of Building repository"""
@@ -664,6 +1222,7 @@ class SQLBuildingRepository:
     def __init__(self, session=None):
         self.session = session or get_session()
     
+    @read_only
     def get_all(self):
         """Get all buildings"""
         try:
@@ -673,6 +1232,7 @@ class SQLBuildingRepository:
             print(f"Error getting buildings: {e}")
             return []
     
+    @read_only
     def get_by_id(self, building_id):
         """Get building by ID"""
         try:
@@ -730,7 +1290,20 @@ class SQLBuildingRepository:
             print(f"Error deleting building {building_id}: {e}")
             return False
     
-    def _to_dict(self, model):
+    def existing_keys(self, values):
+        """The given addresses that already have a building, in one query"""
+        return _stored_values(self.session, {'direccion_completa': BuildingModel.direccion_completa}, values)
+    
+    def start_import(self) -> StagedImport:
+        """A bulk import into edificios"""
+        return StagedImport(self.session, BuildingModel)
+    
+    def finish_import(self, staged: StagedImport) -> int:
+        """Publish a bulk import; returns the number of buildings created"""
+        return staged.finish()
+    
+    @staticmethod
+    def _to_dict(model):
         """Convert model to dictionary"""
         if not model:
             return None
@@ -747,27 +1320,113 @@ class SQLBuildingRepository:
             'weekly_hours': model.horas_semanales,
             'active': model.activo
         }
+    
+    def get_active_buildings(self) -> List[DomainBuilding]:
+        """Get active buildings as domain entities"""
+        buildings = self.session.query(BuildingModel).filter(BuildingModel.activo == True).all()
+        return [self._to_entity(b) for b in buildings]
+    
+    @read_only
+    def get_active_building(self, building_id: int) -> Optional[DomainBuilding]:
+        """Get one active building as a domain entity, by primary key"""
+        building = self.session.get(BuildingModel, building_id)
+        return self._to_entity(building) if building and building.activo else None
+    
+    def _to_entity(self, model) -> DomainBuilding:
+        """Convert model to domain entity"""
+        return DomainBuilding(
+            id=model.id_edificio,
+            name=model.nombre,
+            address=model.direccion_completa,
+            description=None,
+            security_requirements=[],
+            hourly_rate=0.0,  # edificios carries no rates
+            overtime_rate=0.0,
+            holiday_rate=0.0,
+            contact_person=model.administrador or '',
+            contact_phone=model.telefono_administrador or '',
+            status=StatusEnum.ACTIVE if model.activo else StatusEnum.INACTIVE,
+            shift_type=model.tipo_turno,
+            weekly_hours=model.horas_semanales,
+            street_number=model.direccion_calle,
+            avenue_number=model.direccion_carrera
+        )
+
+
+def _filtered(query, filters, start_column, columns):
+    """Apply equality filters by key and a start_from/start_to range on start_column"""
+    filters = filters or {}
+    for key, column in columns.items():
+        if filters.get(key) is not None:
+            query = query.filter(column == filters[key])
+    if filters.get('start_from') is not None:
+        query = query.filter(start_column >= filters['start_from'])
+    if filters.get('start_to') is not None:
+        query = query.filter(start_column < filters['start_to'])
+    return query
+
+def _keyset_query(query, start_column, id_column, limit, after):
+    """query (a Query or a select()) ordered by (start_column, id_column), seeking past the after key instead of using OFFSET"""
+    if after is not None:
+        query = query.filter(tuple_(start_column, id_column) > tuple_(*after))
+    # One extra row tells whether another page follows
+    return query.order_by(start_column, id_column).limit(limit + 1)
+
+def _keyset_page(query, start_column, id_column, limit, after, to_dict):
+    """One page of query ordered by (start_column, id_column)"""
+    return _rows_to_page(_keyset_query(query, start_column, id_column, limit, after).all(), start_column, id_column, limit, to_dict)
+
+def _rows_to_page(rows, start_column, id_column, limit, to_dict):
+    """Page of the rows fetched by _keyset_query, with the cursor of the next one"""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], start_column.key), getattr(rows[-1], id_column.key))
+    return Page([to_dict(row) for row in rows], next_cursor)
 
 
 class SQLShiftRepository:
     """SQL implementation of Shift repository"""
     
+    # Vigilante, building and shift type names loaded with every shift that is read
+    READ_OPTIONS = (
+        joinedload(ShiftModel.vigilante, innerjoin=True).load_only(VigilanteModel.nombre_completo),
+        joinedload(ShiftModel.edificio, innerjoin=True).load_only(BuildingModel.nombre),
+        joinedload(ShiftModel.tipo_turno, innerjoin=True).load_only(TipoTurnoModel.nombre)
+    )
+    
+    # Listing filters and the columns they compare
+    FILTER_COLUMNS = {
+        'vigilante_id': ShiftModel.id_vigilante,
+        'building_id': ShiftModel.id_edificio,
+        'planilla_id': ShiftModel.id_planilla,
+        'status': ShiftModel.estado,
+    }
+    
     def __init__(self, session=None):
         self.session = session or get_session()
     
-    def get_all(self):
-        """Get all shifts"""
-        try:
-            shifts = self.session.query(ShiftModel).all()
-            return [self._to_dict(s) for s in shifts]
-        except Exception as e:
-            print(f"Error getting shifts: {e}")
-            return []
-    
+    @read_only
+    def get_all(self, filters=None, limit=DEFAULT_PAGE_SIZE, after=None) -> Page:
+        """Get one page of shifts ordered by (hora_inicio, id_asignacion)
+        
+        filters may hold vigilante_id, building_id, planilla_id, status and a
+        start_from/start_to range on hora_inicio, all applied in SQL. after is
+        the (hora_inicio, id_asignacion) key of the previous page's last row;
+        the page seeks past it instead of skipping rows with OFFSET.
+        """
+        query = _filtered(self._read_query(), filters, ShiftModel.hora_inicio, self.FILTER_COLUMNS)
+        return _keyset_page(query, ShiftModel.hora_inicio, ShiftModel.id_asignacion, limit, after, self._to_dict)
+    
+    def _read_query(self):
+        """Shifts with the vigilante, building and shift type names joined into the same statement"""
+        return self.session.query(ShiftModel).options(*self.READ_OPTIONS)
+    
+    @read_only
     def get_by_id(self, shift_id):
         """Get shift by ID"""
         try:
-            shift = self.session.query(ShiftModel).filter(
+            shift = self._read_query().filter(
                 ShiftModel.id_asignacion == shift_id
             ).first()
             return self._to_dict(shift) if shift else None
@@ -780,6 +1439,8 @@ class SQLShiftRepository:
         try:
             shift = ShiftModel(**shift_data)
             self.session.add(shift)
+            self.session.flush()
+            SQLDashboardRepository(self.session).refresh({(shift.id_edificio, shift.fecha)}, {shift.id_vigilante})
             self.session.commit()
             return self._to_dict(shift)
         except Exception as e:
@@ -787,22 +1448,611 @@ class SQLShiftRepository:
             print(f"Error creating shift: {e}")
             return None
     
-    def _to_dict(self, model):
+    def get_shifts_by_date_range(self, start_date, end_date) -> List[DomainShift]:
+        """Get shifts overlapping [start_date, end_date) as domain entities"""
+        shifts = self.session.query(ShiftModel).filter(
+            ShiftModel.hora_fin > start_date,
+            ShiftModel.hora_inicio < end_date
+        ).all()
+        return [self._to_entity(s) for s in shifts]
+    
+    def get_shifts_by_vigilante_in_window(self, vigilante_id, start_datetime, end_datetime) -> List[DomainShift]:
+        """Get a vigilante's shifts overlapping [start_datetime, end_datetime) as domain entities"""
+        shifts = self.session.query(ShiftModel).filter(
+            ShiftModel.id_vigilante == vigilante_id,
+            ShiftModel.hora_fin > start_datetime,
+            ShiftModel.hora_inicio < end_datetime
+        ).order_by(ShiftModel.hora_inicio).all()
+        return [self._to_entity(s) for s in shifts]
+    
+    def get_shifts_for_vigilantes_in_window(self, vigilante_ids, start_datetime, end_datetime) -> List[DomainShift]:
+        """Get the shifts of several vigilantes overlapping [start_datetime, end_datetime) in one query"""
+        if not vigilante_ids:
+            return []
+        shifts = self.session.query(ShiftModel).filter(
+            ShiftModel.id_vigilante.in_(list(vigilante_ids)),
+            ShiftModel.hora_fin > start_datetime,
+            ShiftModel.hora_inicio < end_datetime
+        ).all()
+        return [self._to_entity(s) for s in shifts]
+    
+    def bulk_create_assignments(self, id_planilla, assignments, creado_por=None) -> int:
+        """Insert roster assignments in one executemany and a single commit"""
+        rows = [
+            {
+                'id_planilla': id_planilla,
+                'id_vigilante': a.vigilante_id,
+                'id_edificio': a.building_id,
+                'id_tipo_turno': a.shift_type_id,
+                'fecha': a.fecha,
+                'hora_inicio': a.start_datetime,
+                'hora_fin': a.end_datetime,
+                'creado_por': creado_por,
+            }
+            for a in assignments
+        ]
+        if not rows:
+            return 0
+        try:
+            self.session.execute(insert(ShiftModel), rows)
+            SQLDashboardRepository(self.session).refresh(*SQLDashboardRepository.keys(rows))
+            self.session.commit()
+            return len(rows)
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    def copy_assignments(self, planilla_assignments, creado_por=None) -> int:
+        """Insert (id_planilla, assignment) pairs with COPY in a single transaction"""
+        now = datetime.now()
+        rows = [
+            {
+                'id_planilla': id_planilla,
+                'id_vigilante': a.vigilante_id,
+                'id_edificio': a.building_id,
+                'id_tipo_turno': a.shift_type_id,
+                'fecha': a.fecha,
+                'hora_inicio': a.start_datetime,
+                'hora_fin': a.end_datetime,
+                'es_turno_habitual': True,
+                'estado': 'programado',
+                'creado_por': creado_por,
+                'fecha_creacion': now,
+            }
+            for id_planilla, a in planilla_assignments
+        ]
+        try:
+            created = copy_rows(self.session, ShiftModel, rows)
+            SQLDashboardRepository(self.session).refresh(*SQLDashboardRepository.keys(rows))
+            self.session.commit()
+            return created
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    def apply_reassignments(self, changes, resolved_novedad_id: Optional[int] = None) -> Optional[int]:
+        """Move assignments to their new vigilantes in a single transaction
+        
+        A shift only moves while it is still held by the change's
+        from_vigilante_id; if any is not, nothing is written and None is
+        returned. With resolved_novedad_id that novedad is marked resolved,
+        replaced by the first change's vigilante, in the same transaction,
+        also when there was nothing to move.
+        """
+        rows = [c for c in changes if c.shift_id is not None]
+        try:
+            if rows:
+                dashboard = SQLDashboardRepository(self.session)
+                building_days, vigilantes = dashboard.current_keys([c.shift_id for c in rows])
+                moved = sum(
+                    self.session.execute(
+                        update(ShiftModel)
+                        .where(ShiftModel.id_asignacion == c.shift_id, ShiftModel.id_vigilante == c.from_vigilante_id)
+                        .values(id_vigilante=c.to_vigilante_id)
+                        .execution_options(synchronize_session=False)
+                    ).rowcount
+                    for c in rows
+                )
+                if moved < len(rows):
+                    self.session.rollback()
+                    return None
+                dashboard.refresh(building_days, vigilantes | {c.to_vigilante_id for c in rows})
+            if resolved_novedad_id is not None:
+                self.session.execute(
+                    update(NovedadModel)
+                    .where(NovedadModel.id_novedad == resolved_novedad_id)
+                    .values(id_vigilante_reemplazo=changes[0].to_vigilante_id if changes else None, estado='resuelta')
+                )
+            self.session.commit()
+            return len(rows)
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    def _to_entity(self, model) -> DomainShift:
+        """Convert model to domain entity"""
+        return DomainShift(
+            id=model.id_asignacion,
+            vigilante_id=model.id_vigilante,
+            building_id=model.id_edificio,
+            start_datetime=model.hora_inicio,
+            end_datetime=model.hora_fin,
+            shift_type=ShiftTypeEnum.NORMAL,
+            notes=None,
+            is_confirmed=model.estado in ('confirmado', 'completado'),
+            created_at=model.fecha_creacion
+        )
+    
+    @staticmethod
+    def _to_dict(model):
         """Convert model to dictionary"""
         if not model:
             return None
         return {
             'id': model.id_asignacion,
+            'planilla_id': model.id_planilla,
             'vigilante_id': model.id_vigilante,
+            'vigilante_name': model.vigilante.nombre_completo,
             'building_id': model.id_edificio,
+            'building_name': model.edificio.nombre,
             'shift_type_id': model.id_tipo_turno,
-            'start_date': model.fecha_inicio.isoformat() if model.fecha_inicio else None,
-            'end_date': model.fecha_fin.isoformat() if model.fecha_fin else None,
+            'shift_type_name': model.tipo_turno.nombre,
+            'date': model.fecha.isoformat() if model.fecha else None,
             'start_time': model.hora_inicio.isoformat() if model.hora_inicio else None,
             'end_time': model.hora_fin.isoformat() if model.hora_fin else None,
+            'is_regular': model.es_turno_habitual,
+            'status': model.estado
+        }
+
+
+class SQLNovedadRepository:
+    """SQL implementation of incidents (novedades) repository"""
+    
+    def __init__(self, session=None):
+        self.session = session or get_session()
+    
+    def get_by_id(self, novedad_id) -> Optional[DomainNovedad]:
+        """Get novedad by ID as a domain entity"""
+        novedad = self.session.query(NovedadModel).filter(NovedadModel.id_novedad == novedad_id).first()
+        return self._to_entity(novedad) if novedad else None
+    
+    @read_only
+    def get_all(self, filters=None, limit=DEFAULT_PAGE_SIZE, after=None) -> Page:
+        """Get one page of novedades ordered by (hora_inicio, id_novedad), with names, in one statement
+        
+        filters may hold vigilante_id (the absent vigilante), building_id,
+        status and a start_from/start_to range on hora_inicio.
+        """
+        query = self.session.query(NovedadModel).options(
+            joinedload(NovedadModel.vigilante_original, innerjoin=True).load_only(VigilanteModel.nombre_completo),
+            joinedload(NovedadModel.vigilante_reemplazo).load_only(VigilanteModel.nombre_completo),
+            joinedload(NovedadModel.edificio, innerjoin=True).load_only(BuildingModel.nombre)
+        )
+        query = _filtered(query, filters, NovedadModel.hora_inicio, {
+            'vigilante_id': NovedadModel.id_vigilante_original,
+            'building_id': NovedadModel.id_edificio,
+            'status': NovedadModel.estado,
+        })
+        return _keyset_page(query, NovedadModel.hora_inicio, NovedadModel.id_novedad, limit, after, self._to_dict)
+    
+    def resolve(self, novedad_id, replacement_vigilante_id) -> bool:
+        """Record the replacement and mark the novedad as resolved"""
+        try:
+            novedad = self.session.query(NovedadModel).filter(NovedadModel.id_novedad == novedad_id).first()
+            if not novedad:
+                return False
+            novedad.id_vigilante_reemplazo = replacement_vigilante_id
+            novedad.estado = 'resuelta'
+            self.session.commit()
+            return True
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    def _to_dict(self, model):
+        """Convert an eagerly loaded model to a listing row"""
+        replacement = model.vigilante_reemplazo
+        return {
+            'id': model.id_novedad,
+            'type': model.tipo_novedad,
             'status': model.estado,
-            'active': model.activo
+            'shift_id': model.id_asignacion_original,
+            'vigilante_id': model.id_vigilante_original,
+            'vigilante_name': model.vigilante_original.nombre_completo,
+            'replacement_vigilante_id': model.id_vigilante_reemplazo,
+            'replacement_vigilante_name': replacement.nombre_completo if replacement else None,
+            'building_id': model.id_edificio,
+            'building_name': model.edificio.nombre,
+            'date': model.fecha_novedad.isoformat() if model.fecha_novedad else None,
+            'start_time': model.hora_inicio.isoformat() if model.hora_inicio else None,
+            'end_time': model.hora_fin.isoformat() if model.hora_fin else None,
+            'description': model.descripcion
+        }
+    
+    def _to_entity(self, model) -> DomainNovedad:
+        """Convert model to domain entity"""
+        return DomainNovedad(
+            id=model.id_novedad,
+            vigilante_id=model.id_vigilante_original,
+            building_id=model.id_edificio,
+            start_datetime=model.hora_inicio,
+            end_datetime=model.hora_fin,
+            novedad_type=model.tipo_novedad,
+            shift_id=model.id_asignacion_original,
+            replacement_vigilante_id=model.id_vigilante_reemplazo,
+            description=model.descripcion,
+            status=model.estado
+        )
+
+
+class SQLPlanillaRepository:
+    """SQL implementation of monthly planning (planilla_turnos) repository"""
+    
+    def __init__(self, session=None):
+        self.session = session or get_session()
+    
+    def get_or_create(self, mes, anio, generado_por=None):
+        """Get the planilla for a month, creating a draft if none exists"""
+        planilla = self.session.query(PlanillaTurnoModel).filter(
+            PlanillaTurnoModel.mes == mes,
+            PlanillaTurnoModel.anio == anio
+        ).first()
+        if planilla:
+            return planilla
+        try:
+            planilla = PlanillaTurnoModel(mes=mes, anio=anio, generado_por=generado_por)
+            self.session.add(planilla)
+            self.session.commit()
+            return planilla
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    def count_assignments(self, id_planilla) -> int:
+        """Count assignments already stored for a planilla"""
+        return self.session.query(ShiftModel).filter(ShiftModel.id_planilla == id_planilla).count()
+
+
+class SQLHolidayRepository:
+    """SQL implementation of the holidays (festivos_colombia) repository"""
+    
+    def __init__(self, session=None):
+        self.session = session or get_session()
+    
+    def get_dates_for_year(self, year) -> List[date]:
+        """All holiday dates of a year, in one query"""
+        rows = self.session.query(FestivoModel.fecha).filter(
+            FestivoModel.fecha >= date(year, 1, 1),
+            FestivoModel.fecha <= date(year, 12, 31)
+        ).all()
+        return [row.fecha for row in rows]
+
+
+class SQLShiftTypeRepository:
+    """SQL implementation of the shift types (tipos_turnos) repository"""
+    
+    def __init__(self, session=None):
+        self.session = session or get_session()
+    
+    @read_only
+    def get_all(self) -> List[dict]:
+        """All shift types by id"""
+        return [self._to_dict(t) for t in self.session.query(TipoTurnoModel).order_by(TipoTurnoModel.id_tipo_turno)]
+    
+    @read_only
+    def get_by_id(self, shift_type_id) -> Optional[dict]:
+        shift_type = self.session.get(TipoTurnoModel, shift_type_id)
+        return self._to_dict(shift_type) if shift_type else None
+    
+    @staticmethod
+    def _to_dict(model):
+        return {
+            'id': model.id_tipo_turno,
+            'name': model.nombre,
+            'start_time': model.hora_inicio.isoformat() if model.hora_inicio else None,
+            'end_time': model.hora_fin.isoformat() if model.hora_fin else None,
+            'duration': model.duracion,
+            'description': model.descripcion
+        }
+
+
+class SQLSystemConfigRepository:
+    """SQL implementation of the system settings (configuracion_sistema) repository
+    
+    The settings in force are the most recently updated row.
+    """
+    
+    # Settings that update() may change
+    FIELDS = ('minimo_horas_descanso', 'ultimo_backup', 'ultima_limpieza_trimestral')
+    
+    def __init__(self, session=None):
+        self.session = session or get_session()
+    
+    def _current(self):
+        return self.session.query(ConfiguracionSistemaModel).order_by(
+            ConfiguracionSistemaModel.fecha_actualizacion.desc(),
+            ConfiguracionSistemaModel.id_configuracion.desc()
+        ).first()
+    
+    @read_only
+    def get_current(self) -> Optional[dict]:
+        """Settings in force"""
+        config = self._current()
+        return self._to_dict(config) if config else None
+    
+    def update(self, config_data, updated_by=None) -> Optional[dict]:
+        """Change the settings in force, creating the row when there is none"""
+        try:
+            config = self._current()
+            if config is None:
+                config = ConfiguracionSistemaModel()
+                self.session.add(config)
+            for key in self.FIELDS:
+                if key in config_data:
+                    setattr(config, key, config_data[key])
+            config.actualizado_por = updated_by
+            config.fecha_actualizacion = datetime.now()
+            self.session.commit()
+            return self._to_dict(config)
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error updating system configuration: {e}")
+            return None
+    
+    @staticmethod
+    def _to_dict(model):
+        return {
+            'id': model.id_configuracion,
+            'minimum_rest_hours': model.minimo_horas_descanso,
+            'last_backup': model.ultimo_backup.isoformat() if model.ultimo_backup else None,
+            'last_quarterly_cleanup': model.ultima_limpieza_trimestral.isoformat() if model.ultima_limpieza_trimestral else None,
+            'updated_by': model.actualizado_por,
+            'updated_at': model.fecha_actualizacion.isoformat() if model.fecha_actualizacion else None
+        }
+
+
+def _scaled(column, factor):
+    """A NUMERIC column times factor as a rounded integer, converted by the database"""
+    return cast(func.round(func.coalesce(column, 0) * factor), BigInteger)
+
+
+def _applied_salary():
+    """salario a registro_horas row is valued at in centavos: the one stored on it, else the vigilante's current one"""
+    current = select(VigilanteModel.salario).where(
+        VigilanteModel.id_vigilante == RegistroHorasModel.id_vigilante
+    ).scalar_subquery()
+    return _scaled(func.coalesce(RegistroHorasModel.salario_aplicado, current), HUNDREDTHS)
+
+
+def _registro_minutes():
+    return [
+        _scaled(getattr(RegistroHorasModel, column), MINUTES_PER_HOUR).label(column)
+        for column in REGISTRO_HORAS_COLUMNS
+    ]
+
+
+def _to_numeric(row: Dict) -> Dict:
+    """Integer hundredths of a liquidation row as Decimals for the NUMERIC columns, in place"""
+    for column in ACCUMULATED_COLUMNS:
+        row[column] = to_decimal(row[column])
+    return row
+
+
+class SQLPayrollRepository:
+    """SQL implementation of the monthly liquidation repository
+    
+    Hours are read as integer minutes, money as integer centavos and
+    liquidation totals as integer hundredths; Decimals only appear in the
+    rows written back.
+    """
+    
+    def __init__(self, session=None):
+        self.session = session or get_session()
+    
+    def load_month_hours(self, mes, anio) -> pd.DataFrame:
+        """A month of registro_horas in minutes with the salario each row is valued at in centavos, in one query"""
+        start = date(anio, mes, 1)
+        end = date(anio + mes // 12, mes % 12 + 1, 1)
+        query = select(
+            RegistroHorasModel.id_vigilante,
+            RegistroHorasModel.id_edificio,
+            _applied_salary().label('salario_centavos'),
+            *_registro_minutes()
+        ).where(
+            RegistroHorasModel.fecha >= start,
+            RegistroHorasModel.fecha < end
+        )
+        result = self.session.execute(query)
+        return pd.DataFrame.from_records(result.all(), columns=list(result.keys()))
+    
+    def upsert_liquidation(self, liquidation, procesado_por=None) -> Dict[str, int]:
+        """Write both liquidation tables with one INSERT ... ON CONFLICT each, in one transaction"""
+        try:
+            counts = {}
+            for model, key, rows in (
+                (LiquidacionMensualModel, 'id_vigilante', liquidation.vigilante_rows()),
+                (LiquidacionEdificioModel, 'id_edificio', liquidation.building_rows()),
+            ):
+                for row in rows:
+                    _to_numeric(row)
+                    row['procesado_por'] = procesado_por
+                counts[model.__tablename__] = len(rows)
+                if rows:
+                    self.session.execute(self._upsert(model, [key, 'mes', 'anio'], rows, 'fecha_procesamiento'))
+            self.session.commit()
+            return counts
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    def lock_assignments(self, assignment_ids) -> List[DomainShift]:
+        """Assignments to record hours for, locked until the next commit; absences are skipped"""
+        models = self.session.query(ShiftModel).filter(
+            ShiftModel.id_asignacion.in_(assignment_ids),
+            ShiftModel.estado != 'ausente'
+        ).order_by(ShiftModel.id_asignacion).with_for_update().all()
+        shifts = SQLShiftRepository(self.session)
+        return [shifts._to_entity(m) for m in models]
+    
+    def load_assignment_hours(self, assignment_ids) -> List[Dict]:
+        """Current registro_horas rows of the given assignments in minutes, with the
+        salario they were valued at in centavos, locked until the next commit"""
+        query = select(
+            RegistroHorasModel.id_asignacion,
+            RegistroHorasModel.id_vigilante,
+            RegistroHorasModel.id_edificio,
+            RegistroHorasModel.fecha,
+            _applied_salary().label('salario_aplicado'),
+            *_registro_minutes()
+        ).where(RegistroHorasModel.id_asignacion.in_(assignment_ids)).with_for_update()
+        return [dict(row) for row in self.session.execute(query).mappings()]
+    
+    def get_salaries(self, vigilante_ids) -> Dict[int, int]:
+        """salario per vigilante in centavos, in one query"""
+        rows = self.session.execute(
+            select(VigilanteModel.id_vigilante, _scaled(VigilanteModel.salario, HUNDREDTHS).label('salario'))
+            .where(VigilanteModel.id_vigilante.in_(vigilante_ids))
+        ).all()
+        return {row.id_vigilante: row.salario for row in rows}
+    
+    def save_assignment_hours(self, shifts, registros, delta) -> Dict[str, int]:
+        """Complete the assignments, write their registro_horas and add the delta to the running totals
+        
+        Everything happens in one transaction, so the monthly totals never
+        disagree with registro_horas. Totals are incremented in the database
+        (column = column + delta) rather than read and written back, which
+        keeps concurrent completions for the same vigilante or building safe.
+        """
+        try:
+            dashboard = SQLDashboardRepository(self.session)
+            building_days, vigilantes = dashboard.current_keys([s.id for s in shifts])
+            building_days |= {(s.building_id, s.start_datetime.date()) for s in shifts}
+            vigilantes |= {s.vigilante_id for s in shifts}
+            if shifts:
+                self.session.execute(update(ShiftModel), [
+                    {
+                        'id_asignacion': s.id,
+                        'id_vigilante': s.vigilante_id,
+                        'id_edificio': s.building_id,
+                        'fecha': s.start_datetime.date(),
+                        'hora_inicio': s.start_datetime,
+                        'hora_fin': s.end_datetime,
+                        'estado': 'completado',
+                    }
+                    for s in shifts
+                ])
+            if registros:
+                rows = [
+                    dict(
+                        r,
+                        salario_aplicado=to_decimal(r['salario_aplicado']),
+                        **{column: to_decimal(minutes_to_hundredths(r[column])) for column in REGISTRO_HORAS_COLUMNS}
+                    )
+                    for r in registros
+                ]
+                self.session.execute(self._upsert(RegistroHorasModel, ['id_asignacion'], rows, 'fecha_calculo'))
+            counts = {}
+            for model, key, rows in (
+                (LiquidacionMensualModel, 'id_vigilante', delta.vigilante_rows()),
+                (LiquidacionEdificioModel, 'id_edificio', delta.building_rows()),
+            ):
+                counts[model.__tablename__] = len(rows)
+                if rows:
+                    self.session.execute(self._increment(model, [key, 'mes', 'anio'], [_to_numeric(r) for r in rows]))
+            dashboard.refresh(building_days, vigilantes)
+            self.session.commit()
+            return counts
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    @read_only
+    def get_vigilante_liquidation(self, vigilante_id, mes, anio) -> Optional[dict]:
+        """Current liquidacion_mensual row of a vigilante, by its unique key"""
+        model = self.session.execute(
+            self._liquidation_query(LiquidacionMensualModel, 'id_vigilante', vigilante_id, mes, anio)
+        ).scalar()
+        return self._liquidation_to_dict(model, 'id_vigilante') if model else None
+    
+    @read_only
+    def get_building_liquidation(self, building_id, mes, anio) -> Optional[dict]:
+        """Current liquidacion_edificio row of a building, by its unique key"""
+        model = self.session.execute(
+            self._liquidation_query(LiquidacionEdificioModel, 'id_edificio', building_id, mes, anio)
+        ).scalar()
+        return self._liquidation_to_dict(model, 'id_edificio') if model else None
+    
+    @staticmethod
+    def _liquidation_query(model, key, key_id, mes, anio):
+        return select(model).where(getattr(model, key) == key_id, model.mes == mes, model.anio == anio).limit(1)
+    
+    def load_month_liquidation(self, mes, anio) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Accumulated liquidacion_mensual and liquidacion_edificio rows of a month, in integer hundredths"""
+        frames = []
+        for model, key in ((LiquidacionMensualModel, 'id_vigilante'), (LiquidacionEdificioModel, 'id_edificio')):
+            result = self.session.execute(
+                select(
+                    getattr(model, key),
+                    *[_scaled(getattr(model, column), HUNDREDTHS).label(column) for column in ACCUMULATED_COLUMNS]
+                ).where(model.mes == mes, model.anio == anio)
+            )
+            frames.append(pd.DataFrame.from_records(result.all(), columns=list(result.keys())))
+        return frames[0], frames[1]
+    
+    @staticmethod
+    def _liquidation_to_dict(model, key):
+        data = {key: getattr(model, key), 'mes': model.mes, 'anio': model.anio}
+        data.update({column: float(getattr(model, column) or 0) for column in ACCUMULATED_COLUMNS})
+        data['fecha_procesamiento'] = model.fecha_procesamiento.isoformat() if model.fecha_procesamiento else None
+        return data
+    
+    def _insert(self, model):
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect in ('mysql', 'mariadb'):
+            from sqlalchemy.dialects.mysql import insert as dialect_insert
+        else:
+            raise NotImplementedError(f"Upsert is not supported on {dialect}")
+        return dialect_insert(model)
+    
+    @staticmethod
+    def _on_conflict(statement, conflict_columns, updated):
+        """ON CONFLICT DO UPDATE, or ON DUPLICATE KEY UPDATE on MySQL/MariaDB,
+        where the conflict is on the table's unique key over conflict_columns"""
+        if hasattr(statement, 'on_duplicate_key_update'):
+            return statement.on_duplicate_key_update(updated)
+        return statement.on_conflict_do_update(index_elements=conflict_columns, set_=updated)
+    
+    @staticmethod
+    def _proposed(statement):
+        """The row being inserted: excluded on PostgreSQL/SQLite, inserted on MySQL/MariaDB"""
+        return statement.inserted if hasattr(statement, 'on_duplicate_key_update') else statement.excluded
+    
+    def _upsert(self, model, conflict_columns, rows, timestamp_column):
+        """INSERT ... ON CONFLICT that overwrites the existing row"""
+        statement = self._insert(model).values(rows)
+        proposed = self._proposed(statement)
+        updated = {
+            column: proposed[column]
+            for column in rows[0]
+            if column not in conflict_columns
+        }
+        updated[timestamp_column] = func.now()
+        return self._on_conflict(statement, conflict_columns, updated)
+    
+    def _increment(self, model, conflict_columns, rows):
+        """INSERT ... ON CONFLICT that adds the row to the existing one"""
+        statement = self._insert(model).values(rows)
+        proposed = self._proposed(statement)
+        updated = {
+            column: getattr(model, column) + proposed[column]
+            for column in ACCUMULATED_COLUMNS
         }
+        updated['fecha_procesamiento'] = func.now()
+        return self._on_conflict(statement, conflict_columns, updated)
 
 
 class SQLReportRepository:
@@ -811,54 +2061,293 @@ class SQLReportRepository:
     def __init__(self, session=None):
         self.session = session or get_session()
     
+    @read_only
     def get_vigilante_hours(self, vigilante_id, start_date, end_date):
         """Get vigilante hours for a period"""
         try:
-            hours = self.session.query(RegistroHorasModel).filter(
-                RegistroHorasModel.id_vigilante == vigilante_id,
-                RegistroHorasModel.fecha >= start_date,
-                RegistroHorasModel.fecha <= end_date
-            ).all()
+            hours = self.session.execute(self._vigilante_hours_query(vigilante_id, start_date, end_date)).scalars()
             return [self._hours_to_dict(h) for h in hours]
         except Exception as e:
             print(f"Error getting hours for vigilante {vigilante_id}: {e}")
             return []
     
+    @read_only
     def get_building_report(self, building_id, start_date, end_date):
         """Get building report for a period"""
         try:
-            shifts = self.session.query(ShiftModel).filter(
-                ShiftModel.id_edificio == building_id,
-                ShiftModel.fecha_inicio >= start_date,
-                ShiftModel.fecha_fin <= end_date
-            ).all()
+            shifts = self.session.execute(self._building_report_query(building_id, start_date, end_date)).scalars()
             return [self._shift_to_dict(s) for s in shifts]
         except Exception as e:
             print(f"Error getting building report {building_id}: {e}")
             return []
     
-    def _hours_to_dict(self, model):
+    @staticmethod
+    def _vigilante_hours_query(vigilante_id, start_date, end_date):
+        """registro_horas rows of a vigilante between two dates, with vigilante and building names"""
+        return select(RegistroHorasModel).options(
+            joinedload(RegistroHorasModel.vigilante, innerjoin=True).load_only(VigilanteModel.nombre_completo),
+            joinedload(RegistroHorasModel.edificio, innerjoin=True).load_only(BuildingModel.nombre)
+        ).where(
+            RegistroHorasModel.id_vigilante == vigilante_id,
+            RegistroHorasModel.fecha >= start_date,
+            RegistroHorasModel.fecha <= end_date
+        ).order_by(RegistroHorasModel.fecha, RegistroHorasModel.hora_inicio)
+    
+    @staticmethod
+    def _building_report_query(building_id, start_date, end_date):
+        """Shifts of a building between two dates, with vigilante names"""
+        return select(ShiftModel).options(
+            joinedload(ShiftModel.vigilante, innerjoin=True).load_only(VigilanteModel.nombre_completo)
+        ).where(
+            ShiftModel.id_edificio == building_id,
+            ShiftModel.fecha >= start_date,
+            ShiftModel.fecha <= end_date
+        ).order_by(ShiftModel.fecha, ShiftModel.hora_inicio)
+    
+    @staticmethod
+    def _hours_to_dict(model):
         """Convert hours model to dictionary"""
         if not model:
             return None
         return {
             'date': model.fecha.isoformat() if model.fecha else None,
             'vigilante_id': model.id_vigilante,
+            'vigilante_name': model.vigilante.nombre_completo,
             'building_id': model.id_edificio,
-            'normal_hours': float(model.horas_normales) if model.horas_normales else 0,
-            'overtime_hours': float(model.horas_extras) if model.horas_extras else 0,
-            'holiday_hours': float(model.horas_festivos) if model.horas_festivos else 0
+            'building_name': model.edificio.nombre,
+            'normal_hours': float(model.horas_normales or 0),
+            'overtime_hours': float((model.horas_extras_diurnas or 0) + (model.horas_extras_nocturnas or 0)),
+            'holiday_hours': float(
+                (model.horas_extras_festivas_diurnas or 0) + (model.horas_extras_festivas_nocturnas or 0)
+            )
         }
     
-    def _shift_to_dict(self, model):
+    @staticmethod
+    def _shift_to_dict(model):
         """Convert shift model to dictionary"""
         if not model:
             return None
         return {
             'id': model.id_asignacion,
             'vigilante_id': model.id_vigilante,
+            'vigilante_name': model.vigilante.nombre_completo,
             'building_id': model.id_edificio,
-            'start_date': model.fecha_inicio.isoformat() if model.fecha_inicio else None,
-            'end_date': model.fecha_fin.isoformat() if model.fecha_fin else None,
+            'date': model.fecha.isoformat() if model.fecha else None,
+            'start_time': model.hora_inicio.isoformat() if model.hora_inicio else None,
+            'end_time': model.hora_fin.isoformat() if model.hora_fin else None,
             'status': model.estado
         }
+
+
+class SQLDashboardRepository:
+    """Building coverage and vigilante availability, read from their summary tables
+    
+    cobertura_edificios is keyed by (building, day): refresh() recomputes only
+    the pairs an assignment write touched. disponibilidad_vigilantes also
+    depends on the clock, so each row records until when it holds
+    (vigente_hasta); rows past it are computed live on read and rewritten by
+    refresh_due_availability().
+    """
+    
+    # Keys per statement when recomputing
+    REFRESH_CHUNK = 500
+    
+    def __init__(self, session=None):
+        self.session = session or get_session()
+    
+    def refresh(self, building_days, vigilante_ids, now=None) -> None:
+        """Recompute the given (building, day) pairs and vigilantes in the caller's transaction"""
+        building_days, vigilante_ids = list(set(building_days)), list(set(vigilante_ids))
+        now = now or datetime.now()
+        for start in range(0, len(building_days), self.REFRESH_CHUNK):
+            chunk = building_days[start:start + self.REFRESH_CHUNK]
+            self.session.execute(CoberturaEdificioModel.__table__.delete().where(
+                tuple_(CoberturaEdificioModel.id_edificio, CoberturaEdificioModel.fecha).in_(chunk)
+            ))
+            self.session.execute(self._insert_coverage(
+                tuple_(ShiftModel.id_edificio, ShiftModel.fecha).in_(chunk)
+            ))
+        for start in range(0, len(vigilante_ids), self.REFRESH_CHUNK):
+            self._replace_availability(now, vigilante_ids[start:start + self.REFRESH_CHUNK])
+    
+    @staticmethod
+    def keys(rows) -> Tuple[set, set]:
+        """(building, day) pairs and vigilante ids of asignaciones_turnos rows given as dicts"""
+        return (
+            {(row['id_edificio'], row['fecha']) for row in rows},
+            {row['id_vigilante'] for row in rows}
+        )
+    
+    def current_keys(self, assignment_ids) -> Tuple[set, set]:
+        """(building, day) pairs and vigilante ids the given assignments count toward now, before they change"""
+        if not assignment_ids:
+            return set(), set()
+        rows = self.session.execute(
+            select(ShiftModel.id_edificio, ShiftModel.fecha, ShiftModel.id_vigilante)
+            .where(ShiftModel.id_asignacion.in_(list(assignment_ids)))
+        ).mappings().all()
+        return self.keys(rows)
+    
+    def refresh_due_availability(self, now=None) -> int:
+        """Rewrite the availability rows whose next shift has started or ended; returns how many"""
+        now = now or datetime.now()
+        try:
+            due = [row.id_vigilante for row in self.session.execute(
+                select(DisponibilidadVigilanteModel.id_vigilante)
+                .where(DisponibilidadVigilanteModel.vigente_hasta <= now)
+            )]
+            self.refresh((), due, now)
+            self.session.commit()
+            return len(due)
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    def rebuild(self, now=None) -> None:
+        """Recompute both summary tables from scratch, e.g. after asignaciones_turnos was changed outside the app"""
+        now = now or datetime.now()
+        try:
+            self.session.execute(CoberturaEdificioModel.__table__.delete())
+            self.session.execute(self._insert_coverage(None))
+            self._replace_availability(now)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    @read_only
+    def get_building_coverage(self, start_date, end_date, building_id=None):
+        """Vigilantes per building and starting hour for each day between two dates (inclusive)"""
+        try:
+            query = select(
+                CoberturaEdificioModel.id_edificio,
+                BuildingModel.nombre,
+                CoberturaEdificioModel.fecha,
+                CoberturaEdificioModel.hora,
+                CoberturaEdificioModel.vigilantes_asignados
+            ).join(BuildingModel, BuildingModel.id_edificio == CoberturaEdificioModel.id_edificio).where(
+                CoberturaEdificioModel.fecha >= start_date,
+                CoberturaEdificioModel.fecha <= end_date
+            )
+            if building_id is not None:
+                query = query.where(CoberturaEdificioModel.id_edificio == building_id)
+            query = query.order_by(CoberturaEdificioModel.fecha, CoberturaEdificioModel.id_edificio, CoberturaEdificioModel.hora)
+            return [self._coverage_to_dict(row) for row in self.session.execute(query)]
+        except Exception as e:
+            print(f"Error getting building coverage: {e}")
+            return []
+    
+    @read_only
+    def get_available_vigilantes(self, now=None):
+        """Active vigilantes with the end of their last shift and the start of their next one"""
+        now = now or datetime.now()
+        try:
+            rows = self.session.execute(
+                select(
+                    VigilanteModel.id_vigilante,
+                    VigilanteModel.nombre_completo,
+                    VigilanteModel.tipo_contrato,
+                    VigilanteModel.telefono_celular,
+                    DisponibilidadVigilanteModel.ultimo_turno_fin,
+                    DisponibilidadVigilanteModel.proximo_turno_inicio,
+                    DisponibilidadVigilanteModel.vigente_hasta,
+                    DisponibilidadVigilanteModel.calculado_en
+                ).outerjoin(
+                    DisponibilidadVigilanteModel,
+                    DisponibilidadVigilanteModel.id_vigilante == VigilanteModel.id_vigilante
+                ).where(VigilanteModel.activo == True).order_by(VigilanteModel.id_vigilante)
+            ).all()
+            # A row holds from calculado_en until vigente_hasta; outside that
+            # span, or never computed, it is recomputed from asignaciones_turnos
+            stale = [
+                row.id_vigilante for row in rows
+                if row.calculado_en is None or row.calculado_en > now
+                or (row.vigente_hasta is not None and row.vigente_hasta <= now)
+            ]
+            live = {}
+            if stale:
+                live = {
+                    row.id_vigilante: row
+                    for row in self.session.execute(
+                        self._availability_query(now).where(VigilanteModel.id_vigilante.in_(stale))
+                    )
+                }
+            return [self._availability_to_dict(row, live.get(row.id_vigilante, row)) for row in rows]
+        except Exception as e:
+            print(f"Error getting available vigilantes: {e}")
+            return []
+    
+    @staticmethod
+    def _insert_coverage(condition):
+        """INSERT ... SELECT of the coverage rows of the assignments matching condition (all when None)"""
+        hour = extract('hour', ShiftModel.hora_inicio)
+        query = select(
+            ShiftModel.id_edificio,
+            ShiftModel.fecha,
+            hour,
+            func.count(ShiftModel.id_vigilante.distinct())
+        )
+        if condition is not None:
+            query = query.where(condition)
+        return insert(CoberturaEdificioModel).from_select(
+            ['id_edificio', 'fecha', 'hora', 'vigilantes_asignados'],
+            query.group_by(ShiftModel.id_edificio, ShiftModel.fecha, hour)
+        )
+    
+    @staticmethod
+    def _availability_query(now):
+        """Per vigilante: last shift finished by now, next shift starting after now, and until when both hold
+        
+        Shifts under way at now count as neither, as in vista_vigilantes_disponibles
+        (a shift has finished from its hora_fin on, so that vigente_hasta is always
+        ahead of now); the values change when the next shift starts or an
+        unfinished one ends.
+        """
+        finished = ShiftModel.hora_fin <= now
+        upcoming = ShiftModel.hora_inicio > now
+        return select(
+            VigilanteModel.id_vigilante,
+            func.max(case((finished, ShiftModel.hora_fin))).label('ultimo_turno_fin'),
+            func.min(case((upcoming, ShiftModel.hora_inicio))).label('proximo_turno_inicio'),
+            func.min(case(
+                (upcoming, ShiftModel.hora_inicio),
+                (~finished, ShiftModel.hora_fin)
+            )).label('vigente_hasta'),
+            literal(now, DateTime).label('calculado_en')
+        ).select_from(VigilanteModel).outerjoin(
+            ShiftModel, ShiftModel.id_vigilante == VigilanteModel.id_vigilante
+        ).group_by(VigilanteModel.id_vigilante)
+    
+    def _replace_availability(self, now, vigilante_ids=None):
+        """Rewrite the availability rows of vigilante_ids (every vigilante when None) as computed at now"""
+        delete = DisponibilidadVigilanteModel.__table__.delete()
+        query = self._availability_query(now)
+        if vigilante_ids is not None:
+            delete = delete.where(DisponibilidadVigilanteModel.id_vigilante.in_(vigilante_ids))
+            query = query.where(VigilanteModel.id_vigilante.in_(vigilante_ids))
+        self.session.execute(delete)
+        self.session.execute(insert(DisponibilidadVigilanteModel).from_select(
+            ['id_vigilante', 'ultimo_turno_fin', 'proximo_turno_inicio', 'vigente_hasta', 'calculado_en'],
+            query
+        ))
+    
+    @staticmethod
+    def _coverage_to_dict(row):
+        return {
+            'building_id': row.id_edificio,
+            'building_name': row.nombre,
+            'date': row.fecha.isoformat(),
+            'hour': int(row.hora),
+            'assigned_vigilantes': row.vigilantes_asignados
+        }
+    
+    @staticmethod
+    def _availability_to_dict(vigilante, availability):
+        return {
+            'vigilante_id': vigilante.id_vigilante,
+            'name': vigilante.nombre_completo,
+            'contract_type': vigilante.tipo_contrato,
+            'phone': vigilante.telefono_celular,
+            'last_shift_end': availability.ultimo_turno_fin.isoformat() if availability.ultimo_turno_fin else None,
+            'next_shift_start': availability.proximo_turno_inicio.isoformat() if availability.proximo_turno_inicio else None
+        }
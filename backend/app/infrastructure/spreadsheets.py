@@ -0,0 +1,75 @@
+"""
+Spreadsheet readers for bulk imports
+Stream the rows of an uploaded CSV or XLSX file as (row number, {header:
+value}) pairs without loading the whole file; row numbers are the ones a
+spreadsheet shows, the header being row 1
+"""
+import csv
+import io
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+
+from app.domain.bulk_import import DecimalCommaText
+
+
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx')
+
+
+class _SemicolonSeparated(csv.excel):
+    """CSV as saved by spreadsheets in locales with a decimal comma"""
+    delimiter = ';'
+
+
+def _normalize(headers) -> List[str]:
+    return [str(header).strip().lower() if header is not None else '' for header in headers]
+
+
+def _is_blank(values) -> bool:
+    return all(value is None or (isinstance(value, str) and not value.strip()) for value in values)
+
+
+def read_csv(stream: BinaryIO) -> Tuple[List[str], Iterator[Tuple[int, Dict[str, Any]]]]:
+    """Header and rows of a UTF-8 CSV (with or without BOM), comma or semicolon separated
+
+    Semicolon-separated files come from decimal-comma locales, so their
+    cells are DecimalCommaText and money columns read 1.234,56 as 1234.56.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    first = text.readline()
+    dialect = csv.excel if first.count(',') >= first.count(';') else _SemicolonSeparated
+    headers = _normalize(next(csv.reader([first], dialect), []))
+
+    def rows():
+        for number, values in enumerate(csv.reader(text, dialect), start=2):
+            if not _is_blank(values):
+                if dialect is _SemicolonSeparated:
+                    values = map(DecimalCommaText, values)
+                yield number, dict(zip(headers, values))
+    return headers, rows()
+
+
+def read_xlsx(stream: BinaryIO) -> Tuple[List[str], Iterator[Tuple[int, Dict[str, Any]]]]:
+    """Header and rows of the first sheet of an XLSX workbook, read in openpyxl's streaming mode"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    values = workbook.worksheets[0].iter_rows(values_only=True)
+    headers = _normalize(next(values, ()))
+
+    def rows():
+        try:
+            for number, row in enumerate(values, start=2):
+                if not _is_blank(row):
+                    yield number, dict(zip(headers, row))
+        finally:
+            workbook.close()
+    return headers, rows()
+
+
+def read_spreadsheet(stream: BinaryIO, filename: str):
+    """Header and row iterator of a .csv or .xlsx upload; ValueError for other files"""
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return read_csv(stream)
+    if name.endswith('.xlsx'):
+        return read_xlsx(stream)
+    raise ValueError(f"Unsupported file type; expected one of {', '.join(SUPPORTED_EXTENSIONS)}")
@@ -0,0 +1,24 @@
+"""
+Repository cache for the API
+One RepositoryCache per process. With REDIS_URL set, entries and
+invalidations are shared with every other worker through Redis; without it
+each process only sees its own writes, and other workers' changes show up
+once their entries expire (CACHE_TTL_SECONDS).
+"""
+from ...config import Config
+from ...infrastructure.cache import CachedRepository, RedisCacheBackend, RepositoryCache
+
+
+repository_cache = RepositoryCache(
+    RedisCacheBackend(Config.REDIS_URL) if Config.REDIS_URL else None,
+    max_entries=Config.CACHE_LOCAL_ENTRIES,
+    ttl_seconds=Config.CACHE_TTL_SECONDS,
+    version_check_seconds=Config.CACHE_VERSION_CHECK_SECONDS
+)
+
+
+def cached(repository, namespace, **methods):
+    """The repository behind the shared cache, or as is with CACHE_ENABLED off"""
+    if not Config.CACHE_ENABLED:
+        return repository
+    return CachedRepository(repository, repository_cache, namespace, **methods)
@@ -0,0 +1,65 @@
+"""
+Database sessions for the API
+One engine and pool per process, shared by every blueprint. Each Flask
+application context (one per request) gets its own SQLAlchemy session,
+closed when the context is torn down. With DATABASE_REPLICA_URLS set,
+read-only repository calls go to the replicas until the request writes.
+The process-wide holiday calendar reads festivos_colombia through this
+database, so it is wired for every process that imports this module.
+"""
+import threading
+
+from flask import has_app_context
+from flask.globals import app_ctx
+
+from ...config import Config
+from ...domain.holidays import holiday_calendar
+from ...infrastructure.database import DatabaseSession, SQLHolidayRepository
+
+
+def _session_scope():
+    """The current application context, or the current thread outside of one"""
+    if has_app_context():
+        return 'app', id(app_ctx._get_current_object())
+    return 'thread', threading.get_ident()
+
+
+database = DatabaseSession(
+    Config.SQLALCHEMY_DATABASE_URI,
+    pool_size=Config.DB_POOL_SIZE,
+    max_overflow=Config.DB_MAX_OVERFLOW,
+    pool_timeout=Config.DB_POOL_TIMEOUT,
+    pool_recycle=Config.DB_POOL_RECYCLE,
+    pool_pre_ping=Config.DB_POOL_PRE_PING,
+    scopefunc=_session_scope,
+    replica_urls=Config.DATABASE_REPLICA_URLS
+)
+
+# Proxy to the current request's session; repositories hold this, not a Session
+db_session = database.scoped
+
+
+def load_holidays(year):
+    """A year's holidays, read in a session of its own so the calendar also
+    loads outside requests (Celery tasks, scripts)"""
+    session = database.get_session()
+    try:
+        return SQLHolidayRepository(session).get_dates_for_year(year)
+    finally:
+        session.close()
+
+
+# Holidays are loaded once per year and cached for the whole process,
+# reloaded after HOLIDAY_CACHE_TTL_SECONDS so every worker sees changes
+holiday_calendar.set_loader(load_holidays, ttl_seconds=Config.HOLIDAY_CACHE_TTL_SECONDS)
+
+
+def shutdown_session(exception=None):
+    """Roll back a request that raised, then close its session and return the connection"""
+    if exception is not None:
+        db_session.rollback()
+    database.remove()
+
+
+def init_app(app):
+    app.teardown_appcontext(shutdown_session)
@@ -0,0 +1,49 @@
+"""
+Async read API
+create_async_app() wraps the Flask app in an ASGI app: requests matching
+an async route (the GET endpoints of vigilantes, buildings, shifts and
+reports) are served by Quart on the event loop, every other request,
+writes included, by the Flask app in a worker thread.
+"""
+from hypercorn.middleware import AsyncioWSGIMiddleware
+from quart import Quart
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+
+from ...config import Config
+from .routes import register_routes
+
+
+class ReadDispatcher:
+    """ASGI app sending each HTTP request to the async app if one of its routes matches, else to the WSGI app"""
+
+    def __init__(self, async_app, wsgi_app):
+        self.async_app = async_app
+        self.wsgi_app = AsyncioWSGIMiddleware(wsgi_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and not self.serves(scope['path'], scope['method']):
+            await self.wsgi_app(scope, receive, send)
+        else:
+            # Lifespan events reach the async app, which disposes its engines on shutdown
+            await self.async_app(scope, receive, send)
+
+    def serves(self, path, method) -> bool:
+        """Whether the async app has a route for this path and method"""
+        try:
+            self.async_app.url_map.bind('').match(path, method)
+        except RequestRedirect:
+            return True
+        except HTTPException:
+            return False
+        return True
+
+
+def create_async_app(wsgi_app):
+    """The async read routes in front of wsgi_app, as one ASGI app"""
+    app = Quart(__name__)
+    app.config.from_object(Config)
+    # Tokens are checked with the Flask app's settings, JWTManager defaults included
+    app.config.update({key: value for key, value in wsgi_app.config.items() if key.startswith('JWT_')})
+    register_routes(app)
+    return ReadDispatcher(app, wsgi_app)
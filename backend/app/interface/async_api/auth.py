@@ -0,0 +1,74 @@
+"""
+Access tokens for the async read API
+Checks the same tokens /api/auth/login issues through Flask-JWT-Extended,
+with the JWT_* settings create_async_app copies from the Flask app, and
+answers with its status codes and messages
+"""
+import functools
+
+import jwt
+from quart import current_app, g, jsonify, request
+
+
+def _token():
+    """The encoded token from the first configured location that has one"""
+    config = current_app.config
+    locations = config.get('JWT_TOKEN_LOCATION', ('headers',))
+    if isinstance(locations, str):
+        locations = (locations,)
+    for location in locations:
+        if location == 'headers':
+            header_type = config.get('JWT_HEADER_TYPE', 'Bearer')
+            value = request.headers.get(config.get('JWT_HEADER_NAME', 'Authorization'), '')
+            if not header_type:
+                token = value
+            else:
+                scheme, _, token = value.partition(' ')
+                token = token if scheme == header_type else ''
+        elif location == 'cookies':
+            token = request.cookies.get(config.get('JWT_ACCESS_COOKIE_NAME', 'access_token_cookie'), '')
+        elif location == 'query_string':
+            token = request.args.get(config.get('JWT_QUERY_STRING_NAME', 'jwt'), '')
+            prefix = config.get('JWT_QUERY_STRING_VALUE_PREFIX', '')
+            token = token[len(prefix):] if token.startswith(prefix) else ''
+        else:
+            continue
+        if token:
+            return token
+    return None
+
+
+def _decode(token):
+    config = current_app.config
+    algorithm = config.get('JWT_ALGORITHM', 'HS256')
+    symmetric = algorithm.startswith('HS')
+    key = config.get('JWT_SECRET_KEY') if symmetric else config.get('JWT_PUBLIC_KEY')
+    return jwt.decode(
+        token,
+        key,
+        algorithms=config.get('JWT_DECODE_ALGORITHMS') or [algorithm],
+        audience=config.get('JWT_DECODE_AUDIENCE'),
+        issuer=config.get('JWT_DECODE_ISSUER'),
+        leeway=config.get('JWT_DECODE_LEEWAY', 0),
+        options={'verify_aud': config.get('JWT_DECODE_AUDIENCE') is not None}
+    )
+
+
+def jwt_required(view):
+    """Reject the request unless it carries a valid access token; its claims go to g.jwt_claims"""
+    @functools.wraps(view)
+    async def wrapper(*args, **kwargs):
+        token = _token()
+        if not token:
+            return jsonify({"msg": "Missing Authorization Header"}), 401
+        try:
+            claims = _decode(token)
+        except jwt.ExpiredSignatureError:
+            return jsonify({"msg": "Token has expired"}), 401
+        except jwt.InvalidTokenError as e:
+            return jsonify({"msg": str(e)}), 422
+        if claims.get('type') != 'access':
+            return jsonify({"msg": "Only access tokens are allowed"}), 422
+        g.jwt_claims = claims
+        return await view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,20 @@
+"""
+Async database engines for the read API
+One AsyncDatabaseSession per process, spread over the read replicas when
+DATABASE_REPLICA_URLS is set. ASYNC_DATABASE_URL overrides the primary URL,
+e.g. to pass asyncpg-specific options; otherwise DATABASE_URL is switched
+to its async driver.
+"""
+from ...config import Config
+from ...infrastructure.async_database import AsyncDatabaseSession
+
+
+database = AsyncDatabaseSession(
+    Config.ASYNC_DATABASE_URL or Config.SQLALCHEMY_DATABASE_URI,
+    replica_urls=Config.DATABASE_REPLICA_URLS,
+    pool_size=Config.DB_POOL_SIZE,
+    max_overflow=Config.DB_MAX_OVERFLOW,
+    pool_timeout=Config.DB_POOL_TIMEOUT,
+    pool_recycle=Config.DB_POOL_RECYCLE,
+    pool_pre_ping=Config.DB_POOL_PRE_PING
+)
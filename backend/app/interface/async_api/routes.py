@@ -0,0 +1,193 @@
+"""
+Async API Routes - Interface Layer
+asyncio counterparts of the read endpoints in api/routes.py, with the same
+paths, arguments and responses; a slow report holds a coroutine instead of
+a worker thread
+"""
+from quart import Blueprint, request, jsonify
+
+from ...application.async_services import (
+    AsyncVigilanteService,
+    AsyncBuildingService,
+    AsyncShiftService,
+    AsyncReportService
+)
+from ...infrastructure.async_database import (
+    AsyncSQLVigilanteRepository,
+    AsyncSQLBuildingRepository,
+    AsyncSQLShiftRepository,
+    AsyncSQLPayrollRepository,
+    AsyncSQLReportRepository
+)
+from .auth import jwt_required
+from .db import database
+
+# Create blueprints
+vigilantes_bp = Blueprint('vigilantes', __name__, url_prefix='/api/vigilantes')
+shifts_bp = Blueprint('shifts', __name__, url_prefix='/api/shifts')
+buildings_bp = Blueprint('buildings', __name__, url_prefix='/api/buildings')
+reports_bp = Blueprint('reports', __name__, url_prefix='/api/reports')
+
+# Initialize services; each repository call opens its own AsyncSession
+vigilante_service = AsyncVigilanteService(AsyncSQLVigilanteRepository(database))
+building_service = AsyncBuildingService(AsyncSQLBuildingRepository(database))
+shift_service = AsyncShiftService(AsyncSQLShiftRepository(database))
+report_service = AsyncReportService(AsyncSQLReportRepository(database), AsyncSQLPayrollRepository(database))
+
+
+# Vigilantes endpoints
+@vigilantes_bp.route('/', methods=['GET'])
+@jwt_required
+async def get_vigilantes():
+    """Get all vigilantes"""
+    try:
+        result = await vigilante_service.get_all_vigilantes(request.args.to_dict())
+
+        if result["success"]:
+            return jsonify(result)
+        else:
+            return jsonify(result), 400
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@vigilantes_bp.route('/<int:vigilante_id>', methods=['GET'])
+@jwt_required
+async def get_vigilante(vigilante_id):
+    """Get vigilante by ID"""
+    try:
+        result = await vigilante_service.get_vigilante(vigilante_id)
+
+        if result["success"]:
+            return jsonify(result)
+        else:
+            return jsonify(result), 404
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+# Buildings endpoints
+@buildings_bp.route('/', methods=['GET'])
+@jwt_required
+async def get_buildings():
+    """Get all buildings"""
+    try:
+        result = await building_service.get_all_buildings()
+
+        if result["success"]:
+            return jsonify(result)
+        else:
+            return jsonify(result), 400
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+# Shifts endpoints
+@shifts_bp.route('/', methods=['GET'])
+@jwt_required
+async def get_shifts():
+    """Get a page of shifts; filters, limit and cursor come from the query string"""
+    try:
+        result = await shift_service.get_all_shifts(request.args.to_dict())
+
+        if result["success"]:
+            return jsonify(result)
+        else:
+            return jsonify(result), 400
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@shifts_bp.route('/<int:shift_id>', methods=['GET'])
+@jwt_required
+async def get_shift(shift_id):
+    """Get shift by ID"""
+    try:
+        result = await shift_service.get_shift(shift_id)
+
+        if result["success"]:
+            return jsonify(result)
+        else:
+            return jsonify(result), 404
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+# Reports endpoints
+@reports_bp.route('/hours/vigilantes/<int:vigilante_id>', methods=['GET'])
+@jwt_required
+async def get_vigilante_hours(vigilante_id):
+    """Hours worked by a vigilante between start_date and end_date"""
+    try:
+        result = await report_service.get_vigilante_hours(
+            vigilante_id, request.args.get('start_date'), request.args.get('end_date')
+        )
+
+        if result["success"]:
+            return jsonify(result)
+        else:
+            return jsonify(result), 400
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@reports_bp.route('/payroll/vigilantes/<int:vigilante_id>', methods=['GET'])
+@jwt_required
+async def get_vigilante_payroll(vigilante_id):
+    """Running monthly totals of a vigilante"""
+    try:
+        mes = request.args.get('mes', type=int)
+        anio = request.args.get('anio', type=int)
+        if mes is None or anio is None:
+            return jsonify({"success": False, "message": "mes and anio are required"}), 400
+
+        result = await report_service.get_vigilante_totals(vigilante_id, mes, anio)
+
+        if result["success"]:
+            return jsonify(result)
+        else:
+            return jsonify(result), 404
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@reports_bp.route('/payroll/buildings/<int:building_id>', methods=['GET'])
+@jwt_required
+async def get_building_payroll(building_id):
+    """Running monthly totals of a building"""
+    try:
+        mes = request.args.get('mes', type=int)
+        anio = request.args.get('anio', type=int)
+        if mes is None or anio is None:
+            return jsonify({"success": False, "message": "mes and anio are required"}), 400
+
+        result = await report_service.get_building_totals(building_id, mes, anio)
+
+        if result["success"]:
+            return jsonify(result)
+        else:
+            return jsonify(result), 404
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+async def _dispose_engines():
+    await database.dispose()
+
+
+# Register all blueprints
+def register_routes(app):
+    """Register all async route blueprints with the Quart app"""
+    app.after_serving(_dispose_engines)
+    app.register_blueprint(vigilantes_bp)
+    app.register_blueprint(buildings_bp)
+    app.register_blueprint(shifts_bp)
+    app.register_blueprint(reports_bp)
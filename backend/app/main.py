@@ -4,7 +4,9 @@ from app.interface.api.routes import register_routes
 from app.interface.api.auth import auth_bp
 from app.config import Config
 
-def create_app():
+def create_app(variant='sync'):
+    """The API as a Flask (WSGI) app, or with variant='async' as an ASGI app
+    whose read endpoints run on asyncio in front of the same Flask app"""
     app = Flask(__name__)
     app.config.from_object(Config)
 
@@ -17,8 +19,13 @@ def create_app():
     # Auth blueprint has no prefix defined; mount under /api/auth
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
 
+    if variant == 'async':
+        from app.interface.async_api import create_async_app
+        return create_async_app(app)
+    if variant != 'sync':
+        raise ValueError(f"Unknown API variant: {variant}")
     return app
 
 if __name__ == "__main__":
     app = create_app()
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,5 @@
+"""
+Scheduling benchmarks
+Synthetic datasets and timings for the assignment, rest validation, payroll,
+serialization and repository hot paths
+"""
@@ -0,0 +1,175 @@
+"""
+Benchmark cases
+Each case takes a dataset and returns a zero-argument callable that runs one
+hot path; setup cost stays outside the timed call
+"""
+import json
+from dataclasses import asdict
+from datetime import timedelta
+from functools import lru_cache
+from typing import Callable, Dict
+
+import pandas as pd
+
+from app.domain.parallel_planning import ParallelRosterPlanner
+from app.domain.payroll import liquidate_month
+from app.domain.roster import RosterPlanningService
+from app.domain.services import ShiftAssignmentService, PayrollCalculationService, ContingencyManagementService
+from app.domain.timeline import ShiftTimeline
+from app.infrastructure.database import DatabaseSession, SQLShiftRepository
+from app.interface.schemas import TurnoSchema
+
+from .synthetic import SyntheticConfig, SyntheticDataset, generate_dataset, seed_database
+
+
+SIZES: Dict[str, SyntheticConfig] = {
+    "small": SyntheticConfig(vigilantes=60, buildings=10, history_months=1),
+    "medium": SyntheticConfig(vigilantes=300, buildings=60, history_months=2),
+    "large": SyntheticConfig(vigilantes=1000, buildings=200, history_months=3),
+}
+
+# Shifts scored per assignment call
+ASSIGNMENT_BATCH = 50
+
+
+@lru_cache(maxsize=None)
+def dataset(size: str) -> SyntheticDataset:
+    return generate_dataset(SIZES[size])
+
+
+def _next_shifts(data: SyntheticDataset, count: int):
+    """(building, start) pairs on the first day after the history"""
+    start = data.end
+    return [
+        (data.buildings[k % len(data.buildings)], start + timedelta(hours=k % 24))
+        for k in range(count)
+    ]
+
+
+def assignment_scalar(data: SyntheticDataset) -> Callable[[], object]:
+    timeline = ShiftTimeline(data.shifts)
+    shifts = _next_shifts(data, ASSIGNMENT_BATCH)
+
+    def run():
+        return [
+            ShiftAssignmentService.find_best_vigilante_for_shift(
+                data.vigilantes, building, start, data.shifts, timeline
+            )
+            for building, start in shifts
+        ]
+    return run
+
+
+def assignment_vectorized(data: SyntheticDataset) -> Callable[[], object]:
+    timeline = ShiftTimeline(data.shifts)
+    shifts = _next_shifts(data, ASSIGNMENT_BATCH)
+    return lambda: ShiftAssignmentService.find_best_vigilantes_for_shifts(
+        data.vigilantes, shifts, data.shifts, timeline
+    )
+
+
+def roster_month(data: SyntheticDataset) -> Callable[[], object]:
+    end = data.end
+    return lambda: RosterPlanningService.generate_month(
+        end.month, end.year, data.buildings, data.vigilantes, data.shifts
+    )
+
+
+def roster_month_clustered(data: SyntheticDataset) -> Callable[[], object]:
+    """The parallel planner's clusters solved inline, without the process pool"""
+    end = data.end
+    planner = ParallelRosterPlanner(workers=1)
+    return lambda: planner.generate_month(
+        end.month, end.year, data.buildings, data.vigilantes, data.shifts
+    )
+
+
+def rest_validation(data: SyntheticDataset) -> Callable[[], object]:
+    timeline = ShiftTimeline(data.shifts)
+    # Re-validate the last week of history against everything else
+    cutoff = data.end - timedelta(days=7)
+    candidates = [s for s in data.shifts if s.start_datetime >= cutoff]
+
+    def run():
+        return sum(
+            ContingencyManagementService.validate_minimum_rest_time(
+                shift.vigilante_id, shift, data.shifts, timeline=timeline
+            )
+            for shift in candidates
+        )
+    return run
+
+
+def payroll(data: SyntheticDataset) -> Callable[[], object]:
+    by_vigilante = {}
+    for shift in data.shifts:
+        by_vigilante.setdefault(shift.vigilante_id, []).append(shift)
+
+    def run():
+        return [
+            PayrollCalculationService.calculate_vigilante_payment(v, by_vigilante.get(v.id, []), 130000000)
+            for v in data.vigilantes
+        ]
+    return run
+
+
+def hour_split(data: SyntheticDataset) -> Callable[[], object]:
+    return lambda: PayrollCalculationService.split_registro_horas(data.shifts)
+
+
+def liquidation(data: SyntheticDataset) -> Callable[[], object]:
+    """Whole-history liquidation over registro_horas rows in minutes and centavos"""
+    salaries = {v.id: 130000000 for v in data.vigilantes}
+    hours = pd.DataFrame([
+        dict(minutes, id_vigilante=s.vigilante_id, id_edificio=s.building_id, salario_centavos=salaries[s.vigilante_id])
+        for s, minutes in zip(data.shifts, PayrollCalculationService.split_registro_horas(data.shifts))
+    ])
+    end = data.end
+    return lambda: liquidate_month(end.month, end.year, hours)
+
+
+def serialization(data: SyntheticDataset) -> Callable[[], object]:
+    schema = TurnoSchema(many=True)
+    rows = [
+        {
+            "id": s.id,
+            "vigilante_id": s.vigilante_id,
+            "edificio_id": s.building_id,
+            "fecha_inicio": s.start_datetime,
+            "fecha_fin": s.end_datetime
+        }
+        for s in data.shifts
+    ]
+    return lambda: (
+        json.dumps(schema.dump(rows)),
+        json.dumps([asdict(s) for s in data.shifts], default=str)
+    )
+
+
+def repository_window(data: SyntheticDataset) -> Callable[[], object]:
+    """Last week of shifts through SQLShiftRepository on in-memory SQLite"""
+    database = DatabaseSession("sqlite://")
+    database.create_tables()
+    session = database.get_session()
+    seed_database(session, data)
+    repository = SQLShiftRepository(session)
+    end = data.end
+
+    def run():
+        session.expire_all()
+        return repository.get_shifts_by_date_range(end - timedelta(days=7), end)
+    return run
+
+
+CASES: Dict[str, Callable[[SyntheticDataset], Callable[[], object]]] = {
+    "assignment_scalar": assignment_scalar,
+    "assignment_vectorized": assignment_vectorized,
+    "roster_month": roster_month,
+    "roster_month_clustered": roster_month_clustered,
+    "rest_validation": rest_validation,
+    "payroll": payroll,
+    "hour_split": hour_split,
+    "liquidation": liquidation,
+    "serialization": serialization,
+    "repository_window": repository_window,
+}
@@ -0,0 +1,123 @@
+"""
+Benchmark runner
+Times every case at the requested sizes and writes the results to JSON
+
+    python -m benchmarks.run --sizes small medium --output bench.json
+    python -m benchmarks.run --compare bench.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from .cases import CASES, SIZES, dataset
+
+
+def time_case(case: str, size: str, rounds: int = 5, min_time: float = 0.05) -> Dict:
+    """Calibrate iterations per round to min_time seconds, then time rounds of them"""
+    run = CASES[case](dataset(size))
+    run()  # warm-up
+
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or iterations >= 1000:
+            break
+        iterations *= 2
+
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        samples.append((time.perf_counter() - started) / iterations)
+
+    return {
+        "case": case,
+        "size": size,
+        "rounds": rounds,
+        "iterations": iterations,
+        "min": min(samples),
+        "max": max(samples),
+        "mean": statistics.mean(samples),
+        "median": statistics.median(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes: List[str], cases: List[str], rounds: int = 5) -> Dict:
+    results = []
+    for size in sizes:
+        for case in cases:
+            result = time_case(case, size, rounds)
+            print(f"{size:>8} {case:<24} {result['median'] * 1000:10.3f} ms", file=sys.stderr)
+            results.append(result)
+    return {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor()
+        },
+        "commit": _git_revision(),
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "sizes": {size: vars(SIZES[size]) for size in sizes},
+        "benchmarks": results
+    }
+
+
+def compare(report: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Cases whose median got slower than the baseline by more than threshold (a fraction)"""
+    previous = {(b["case"], b["size"]): b["median"] for b in baseline.get("benchmarks", [])}
+    regressions = []
+    for result in report["benchmarks"]:
+        before = previous.get((result["case"], result["size"]))
+        if before and result["median"] > before * (1 + threshold):
+            regressions.append(
+                f"{result['size']} {result['case']}: {before * 1000:.3f} ms -> {result['median'] * 1000:.3f} ms"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the scheduling benchmarks")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.cases, args.rounds)
+    with open(args.output, "w") as handle:
+        json.dump(report, handle, indent=2, default=str)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(report, json.load(handle), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
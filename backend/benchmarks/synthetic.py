@@ -0,0 +1,327 @@
+"""
+Synthetic scheduling data
+Deterministic generator of vigilantes, buildings and shift history for
+benchmarks; the same config and seed always give the same dataset
+"""
+import csv
+import io
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert
+
+from app.domain.models import Vigilante, Building, Shift, StatusEnum, ShiftTypeEnum
+from app.domain.roster import RosterPlanningService, SHIFT_PATTERNS
+from app.domain.skills import CERTIFICATION_FLAGS
+from app.infrastructure.database import (
+    VigilanteModel,
+    CertificacionVigilanteModel,
+    BuildingModel,
+    TipoTurnoModel,
+    PlanillaTurnoModel,
+    ShiftModel,
+    NovedadModel,
+    SQLDashboardRepository
+)
+
+
+@dataclass
+class SyntheticConfig:
+    """Size and distributions of a synthetic dataset"""
+    vigilantes: int = 100
+    buildings: int = 20
+    history_months: int = 1
+    start: date = date(2025, 1, 1)
+    seed: int = 0
+    # Probability that a vigilante holds each skill
+    skill_rates: Dict[str, float] = field(default_factory=lambda: {
+        'curso_vigilancia': 0.9,
+        'manejo_armas': 0.3,
+        'medios_electronicos': 0.4,
+        'primeros_auxilios': 0.5
+    })
+    # Probability that a building requires each skill
+    requirement_rates: Dict[str, float] = field(default_factory=lambda: {
+        'curso_vigilancia': 0.5,
+        'manejo_armas': 0.15,
+        'medios_electronicos': 0.2
+    })
+    shift_type_weights: Dict[str, float] = field(default_factory=lambda: {
+        '8_horas': 0.5,
+        '12_horas': 0.35,
+        '24_horas': 0.15
+    })
+    # Share of vigilantes whose contract ends inside the history window
+    expiring_contract_rate: float = 0.1
+    inactive_rate: float = 0.05
+    grid_size: int = 200
+
+
+@dataclass
+class SyntheticDataset:
+    config: SyntheticConfig
+    vigilantes: List[Vigilante]
+    buildings: List[Building]
+    shifts: List[Shift]
+
+    @property
+    def end(self) -> datetime:
+        """First moment after the generated history"""
+        start = self.config.start
+        months = start.month - 1 + self.config.history_months
+        return datetime(start.year + months // 12, months % 12 + 1, 1)
+
+
+def generate_dataset(config: SyntheticConfig) -> SyntheticDataset:
+    """Build vigilantes, buildings and K months of rest-respecting history"""
+    rng = random.Random(config.seed)
+    origin = datetime.combine(config.start, datetime.min.time())
+    history_days = max(1, config.history_months * 31)
+
+    vigilantes = []
+    for i in range(1, config.vigilantes + 1):
+        skills = [name for name, rate in config.skill_rates.items() if rng.random() < rate]
+        contract_start = origin - timedelta(days=rng.randint(30, 3650))
+        if rng.random() < config.expiring_contract_rate:
+            contract_end = origin + timedelta(days=rng.randint(0, history_days))
+        else:
+            contract_end = datetime.max
+        vigilantes.append(Vigilante(
+            id=i,
+            name=f"Vigilante {i}",
+            email=f"vigilante{i}@example.com",
+            phone=f"300{i:07d}",
+            document_id=f"{10000000 + i}",
+            skills=skills,
+            certifications=[s for s in skills if s in CERTIFICATION_FLAGS],
+            status=StatusEnum.INACTIVE if rng.random() < config.inactive_rate else StatusEnum.ACTIVE,
+            hire_date=contract_start,
+            contract_start=contract_start,
+            contract_end=contract_end,
+            street_number=rng.randint(1, config.grid_size),
+            avenue_number=rng.randint(1, config.grid_size)
+        ))
+
+    shift_types = list(config.shift_type_weights)
+    weights = list(config.shift_type_weights.values())
+    buildings = []
+    for i in range(1, config.buildings + 1):
+        hourly_rate = float(rng.randrange(8000, 14000, 500))
+        buildings.append(Building(
+            id=i,
+            name=f"Edificio {i}",
+            address=f"Calle {i}",
+            description=None,
+            security_requirements=[
+                name for name, rate in config.requirement_rates.items() if rng.random() < rate
+            ],
+            hourly_rate=hourly_rate,
+            overtime_rate=hourly_rate * 1.25,
+            holiday_rate=hourly_rate * 1.75,
+            contact_person=f"Administrador {i}",
+            contact_phone=f"601{i:07d}",
+            status=StatusEnum.ACTIVE,
+            shift_type=rng.choices(shift_types, weights)[0],
+            weekly_hours=rng.choice([44, 46, 48]),
+            street_number=rng.randint(1, config.grid_size),
+            avenue_number=rng.randint(1, config.grid_size)
+        ))
+
+    return SyntheticDataset(config, vigilantes, buildings, _generate_history(config, rng, vigilantes, buildings))
+
+
+def _generate_history(
+    config: SyntheticConfig,
+    rng: random.Random,
+    vigilantes: List[Vigilante],
+    buildings: List[Building]
+) -> List[Shift]:
+    """Random but valid history: every slot goes to a rested, qualified vigilante when one exists"""
+    shifts: List[Shift] = []
+    active = [v for v in vigilantes if v.is_active()]
+    if not active:
+        return shifts
+    last_end = {v.id: datetime.min for v in active}
+    rest = timedelta(hours=12)
+
+    year, month = config.start.year, config.start.month
+    for _ in range(config.history_months):
+        for slot in RosterPlanningService.build_month_slots(month, year, buildings):
+            building = buildings[slot.building_id - 1]
+            required = set(building.security_requirements)
+            for _ in range(8):
+                vigilante = active[rng.randrange(len(active))]
+                if (
+                    last_end[vigilante.id] + rest <= slot.start_datetime
+                    and vigilante.is_available_for_shift(slot.start_datetime)
+                    and required <= set(vigilante.skills)
+                ):
+                    last_end[vigilante.id] = slot.end_datetime
+                    shifts.append(Shift(
+                        id=len(shifts) + 1,
+                        vigilante_id=vigilante.id,
+                        building_id=slot.building_id,
+                        start_datetime=slot.start_datetime,
+                        end_datetime=slot.end_datetime,
+                        shift_type=ShiftTypeEnum.NORMAL,
+                        notes=None
+                    ))
+                    break
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return shifts
+
+
+def seed_database(session, dataset: SyntheticDataset) -> None:
+    """Insert a dataset into an empty schema (vigilantes, edificios, tipos_turnos, planillas, asignaciones)
+    
+    The dashboard summaries are rebuilt afterwards, as the app's own writes would have kept them.
+    """
+    vigilantes = [
+        {
+            'id_vigilante': v.id,
+            'nombre_completo': v.name,
+            'numero_identificacion': v.document_id,
+            'fecha_nacimiento': date(1990, 1, 1),
+            'telefono_celular': v.phone,
+            'correo_electronico': v.email,
+            'direccion_calle': v.street_number,
+            'direccion_carrera': v.avenue_number,
+            'direccion_completa': f"Calle {v.street_number} # {v.avenue_number}",
+            'contacto_emergencia_nombre': 'Contacto',
+            'contacto_emergencia_telefono': v.phone,
+            'tipo_contrato': 'fijo_full_time',
+            'edificios': '',
+            'salario': 1300000,
+            'fecha_contratacion': v.hire_date.date(),
+            'activo': v.is_active()
+        }
+        for v in dataset.vigilantes
+    ]
+    certifications = [
+        dict({'id_vigilante': v.id}, **{flag: flag in v.skills for flag in CERTIFICATION_FLAGS})
+        for v in dataset.vigilantes
+    ]
+    buildings = [
+        {
+            'id_edificio': b.id,
+            'nombre': b.name,
+            'direccion_calle': b.street_number,
+            'direccion_carrera': b.avenue_number,
+            'direccion_completa': b.address,
+            'tipo_turno': b.shift_type,
+            'horas_semanales': min(max(b.weekly_hours, 40), 48),
+            'activo': b.is_active()
+        }
+        for b in dataset.buildings
+    ]
+    shift_types = [
+        {
+            'id_tipo_turno': shift_type_id,
+            'nombre': f"{pattern} {shift_type_id}",
+            'hora_inicio': datetime.min.replace(hour=start_hour).time(),
+            'hora_fin': datetime.min.replace(hour=(start_hour + duration) % 24).time(),
+            'duracion': duration
+        }
+        for pattern, rows in SHIFT_PATTERNS.items()
+        for shift_type_id, start_hour, duration in rows
+    ]
+    type_by_start = {
+        (pattern, start_hour): shift_type_id
+        for pattern, rows in SHIFT_PATTERNS.items()
+        for shift_type_id, start_hour, _ in rows
+    }
+
+    planillas: Dict[tuple, int] = {}
+    shifts = []
+    for shift in dataset.shifts:
+        key = (shift.start_datetime.month, shift.start_datetime.year)
+        planilla_id = planillas.setdefault(key, len(planillas) + 1)
+        building = dataset.buildings[shift.building_id - 1]
+        shifts.append({
+            'id_asignacion': shift.id,
+            'id_planilla': planilla_id,
+            'id_vigilante': shift.vigilante_id,
+            'id_edificio': shift.building_id,
+            'id_tipo_turno': type_by_start[(building.shift_type, shift.start_datetime.hour)],
+            'fecha': shift.start_datetime.date(),
+            'hora_inicio': shift.start_datetime,
+            'hora_fin': shift.end_datetime
+        })
+
+    session.execute(insert(VigilanteModel), vigilantes)
+    session.execute(insert(CertificacionVigilanteModel), certifications)
+    session.execute(insert(BuildingModel), buildings)
+    session.execute(insert(TipoTurnoModel), shift_types)
+    if planillas:
+        session.execute(insert(PlanillaTurnoModel), [
+            {'id_planilla': planilla_id, 'mes': mes, 'anio': anio, 'estado': 'publicado'}
+            for (mes, anio), planilla_id in planillas.items()
+        ])
+    if shifts:
+        session.execute(insert(ShiftModel), shifts)
+    session.commit()
+    SQLDashboardRepository(session).rebuild()
+
+
+def seed_novedades(session, dataset: SyntheticDataset, count: int) -> None:
+    """Insert an absence for each of the first count shifts of a seeded dataset; every other one already replaced"""
+    session.execute(insert(NovedadModel), [
+        {
+            'id_asignacion_original': shift.id,
+            'id_vigilante_original': shift.vigilante_id,
+            'id_vigilante_reemplazo': dataset.vigilantes[k % len(dataset.vigilantes)].id if k % 2 else None,
+            'id_edificio': shift.building_id,
+            'fecha_novedad': shift.start_datetime.date(),
+            'hora_inicio': shift.start_datetime,
+            'hora_fin': shift.end_datetime,
+            'tipo_novedad': 'ausencia',
+            'estado': 'resuelta' if k % 2 else 'pendiente'
+        }
+        for k, shift in enumerate(dataset.shifts[:count])
+    ])
+    session.commit()
+
+
+def vigilante_import_row(n: int) -> Dict[str, object]:
+    """Spreadsheet row n of a vigilante import; distinct n give distinct keys"""
+    return {
+        'nombre_completo': f"Vigilante {n}",
+        'numero_identificacion': str(10_000_000 + n),
+        'fecha_nacimiento': '1990-05-17',
+        'telefono_celular': f"3{n:09d}",
+        'correo_electronico': f"vigilante{n}@example.com",
+        'direccion_calle': n % 200,
+        'direccion_carrera': n % 100,
+        'direccion_completa': f"Calle {n % 200} # {n % 100}-{n % 90}",
+        'contacto_emergencia_nombre': f"Contacto {n}",
+        'contacto_emergencia_telefono': f"6{n:09d}",
+        'tipo_contrato': 'fijo_full_time' if n % 3 else 'relevo_part_time',
+        'edificios': 'Torre Norte',
+        'salario': '1300000.00',
+        'fecha_contratacion': '2024-01-15'
+    }
+
+
+def building_import_row(n: int) -> Dict[str, object]:
+    """Spreadsheet row n of a building import"""
+    return {
+        'nombre': f"Edificio {n}",
+        'direccion_calle': n,
+        'direccion_carrera': n + 7,
+        'direccion_completa': f"Carrera {n + 7} # {n}-10",
+        'tipo_turno': '12_horas',
+        'horas_semanales': 44
+    }
+
+
+def csv_upload(rows: List[Dict[str, object]], delimiter: str = ',') -> io.BytesIO:
+    """rows as an uploaded CSV file, header first, with the BOM spreadsheet programs write"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]), delimiter=delimiter)
+    writer.writeheader()
+    writer.writerows(rows)
+    return io.BytesIO(buffer.getvalue().encode('utf-8-sig'))
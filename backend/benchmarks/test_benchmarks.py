@@ -0,0 +1,55 @@
+"""
+pytest-benchmark entry point; from backend/:
+
+    pytest benchmarks --benchmark-json=bench.json
+"""
+import importlib.util
+import time
+
+import pytest
+
+from app.application.services import ImportService
+from app.infrastructure.database import DatabaseSession, SQLBuildingRepository, SQLVigilanteRepository
+from app.infrastructure.spreadsheets import read_spreadsheet
+
+from .cases import CASES, SIZES, dataset
+from .synthetic import csv_upload, generate_dataset, vigilante_import_row
+
+
+# A vigilante CSV of LARGE_IMPORT_ROWS rows must load within LARGE_IMPORT_SECONDS
+LARGE_IMPORT_ROWS = 50_000
+LARGE_IMPORT_SECONDS = 30
+
+HAS_BENCHMARK = importlib.util.find_spec("pytest_benchmark") is not None
+
+
+@pytest.mark.skipif(not HAS_BENCHMARK, reason="pytest-benchmark is not installed")
+@pytest.mark.parametrize("size", ["small", "medium"])
+@pytest.mark.parametrize("case", list(CASES))
+def test_hot_path(benchmark, case, size):
+    benchmark.group = case
+    benchmark(CASES[case](dataset(size)))
+
+
+def test_dataset_is_deterministic():
+    first, second = generate_dataset(SIZES["small"]), generate_dataset(SIZES["small"])
+    assert first.vigilantes == second.vigilantes
+    assert first.buildings == second.buildings
+    assert first.shifts == second.shifts
+
+
+def test_large_import():
+    database = DatabaseSession("sqlite://")
+    database.create_tables()
+    session = database.get_session()
+    service = ImportService(SQLVigilanteRepository(session), SQLBuildingRepository(session))
+    stream = csv_upload([vigilante_import_row(n) for n in range(LARGE_IMPORT_ROWS)])
+    try:
+        started = time.perf_counter()
+        result = service.import_vigilantes(*read_spreadsheet(stream, "vigilantes.csv"))
+        elapsed = time.perf_counter() - started
+    finally:
+        session.close()
+        database.engine.dispose()
+    assert result["success"] and result["data"]["created"] == LARGE_IMPORT_ROWS, result
+    assert elapsed < LARGE_IMPORT_SECONDS, f"{LARGE_IMPORT_ROWS} rows took {elapsed:.1f}s"
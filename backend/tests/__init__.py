@@ -0,0 +1,5 @@
+"""
+Backend tests
+Functional checks of the repositories, services and read paths against
+seeded databases; timings live in benchmarks/
+"""
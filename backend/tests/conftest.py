@@ -0,0 +1,21 @@
+"""
+Shared fixtures
+seeded gives each test its own in-memory database filled with the
+module's DATASET (a SyntheticConfig)
+"""
+import pytest
+
+from benchmarks.synthetic import SyntheticConfig, generate_dataset
+
+from .support import seeded_database
+
+
+DEFAULT_DATASET = SyntheticConfig(vigilantes=30, buildings=6)
+
+
+@pytest.fixture
+def seeded(request):
+    """(database, session, data) for a fresh database seeded with the module's DATASET"""
+    data = generate_dataset(getattr(request.module, "DATASET", DEFAULT_DATASET))
+    with seeded_database(data) as (database, session):
+        yield database, session, data
@@ -0,0 +1,106 @@
+"""
+Test support
+Seeded databases, SQL statement recording and small domain entities
+shared by the test modules
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.domain.models import Building, Shift, ShiftTypeEnum, StatusEnum, Vigilante
+from app.infrastructure.database import Base, DatabaseSession
+from benchmarks.synthetic import seed_database
+
+
+@contextmanager
+def seeded_database(data=None, url="sqlite://", **options):
+    """(database, session) on a fresh schema at url, seeded with data when given
+
+    Tables left at url by an earlier run are dropped first, so url must point
+    to a scratch database.
+    """
+    database = DatabaseSession(url, **options)
+    Base.metadata.drop_all(database.engine)
+    database.create_tables()
+    session = database.get_session()
+    if data is not None:
+        seed_database(session, data)
+    try:
+        yield database, session
+    finally:
+        session.close()
+        database.engine.dispose()
+
+
+def record_statements(engine, call, selects_only=False):
+    """Result of call and the (statement, parameters) pairs it sent to engine"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not selects_only or statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = call()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return result, statements
+
+
+def count_statements(database, session, call):
+    """Result of call and the number of statements it issued, on a fresh identity map"""
+    session.expunge_all()
+    result, statements = record_statements(database.engine, call)
+    return result, len(statements)
+
+
+def make_vigilante(vigilante_id, skills=(), street=None, avenue=None, active=True):
+    """Vigilante with an open-ended contract since 2020"""
+    return Vigilante(
+        id=vigilante_id,
+        name=f"Vigilante {vigilante_id}",
+        email=f"vigilante{vigilante_id}@example.com",
+        phone="3000000000",
+        document_id=str(vigilante_id),
+        skills=list(skills),
+        certifications=list(skills),
+        status=StatusEnum.ACTIVE if active else StatusEnum.INACTIVE,
+        hire_date=datetime(2020, 1, 1),
+        contract_start=datetime(2020, 1, 1),
+        contract_end=datetime.max,
+        street_number=street,
+        avenue_number=avenue
+    )
+
+
+def make_building(building_id, requirements=(), street=None, avenue=None, shift_type="8_horas"):
+    return Building(
+        id=building_id,
+        name=f"Edificio {building_id}",
+        address=f"Calle {street} # {avenue}",
+        description=None,
+        security_requirements=list(requirements),
+        hourly_rate=10000.0,
+        overtime_rate=12500.0,
+        holiday_rate=17500.0,
+        contact_person="Administrador",
+        contact_phone="6000000000",
+        status=StatusEnum.ACTIVE,
+        shift_type=shift_type,
+        street_number=street,
+        avenue_number=avenue
+    )
+
+
+def make_shift(shift_id, vigilante_id, building_id, start, hours=8):
+    return Shift(
+        id=shift_id,
+        vigilante_id=vigilante_id,
+        building_id=building_id,
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=hours),
+        shift_type=ShiftTypeEnum.NORMAL,
+        notes=None
+    )
@@ -0,0 +1,101 @@
+"""
+Async repository parity
+The async repositories of the read API must return exactly what the sync
+ones return for the same calls, also when many of them run at once.
+Needs aiosqlite; skipped without it.
+"""
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from app.application.services import PayrollService
+from app.infrastructure.async_database import (
+    AsyncDatabaseSession,
+    AsyncSQLBuildingRepository,
+    AsyncSQLPayrollRepository,
+    AsyncSQLReportRepository,
+    AsyncSQLShiftRepository,
+    AsyncSQLVigilanteRepository,
+)
+from app.infrastructure.database import (
+    SQLBuildingRepository,
+    SQLPayrollRepository,
+    SQLReportRepository,
+    SQLShiftRepository,
+    SQLVigilanteRepository,
+)
+
+from benchmarks.cases import SIZES
+from benchmarks.synthetic import generate_dataset
+
+from .support import seeded_database
+
+
+COMPLETED_SHIFTS = 300
+
+# Requests in flight at once in the concurrency check
+CONCURRENT_CALLS = 50
+
+
+@pytest.fixture(scope="module")
+def databases(tmp_path_factory):
+    url = f"sqlite:///{tmp_path_factory.mktemp('async_reads') / 'turnos.db'}"
+    data = generate_dataset(SIZES["small"])
+    with seeded_database(data, url) as (_, session):
+        PayrollService(SQLPayrollRepository(session)).complete_assignments([shift.id for shift in data.shifts[:COMPLETED_SHIFTS]])
+        async_database = AsyncDatabaseSession(url)
+        yield session, async_database, data
+        asyncio.run(async_database.dispose())
+
+
+def _calls(data):
+    """(sync repository, async repository, method, args) for every async read"""
+    first = data.shifts[0]
+    start = first.start_datetime
+    month_start = date(start.year, start.month, 1)
+    window = (month_start, month_start + timedelta(days=30))
+    return {
+        "vigilantes": (SQLVigilanteRepository, AsyncSQLVigilanteRepository, "get_all", ()),
+        "vigilante": (SQLVigilanteRepository, AsyncSQLVigilanteRepository, "get_by_id", (first.vigilante_id,)),
+        "buildings": (SQLBuildingRepository, AsyncSQLBuildingRepository, "get_all", ()),
+        "building": (SQLBuildingRepository, AsyncSQLBuildingRepository, "get_by_id", (first.building_id,)),
+        "shift_page": (SQLShiftRepository, AsyncSQLShiftRepository, "get_all", ({"building_id": first.building_id}, 20)),
+        "shift_next_page": (SQLShiftRepository, AsyncSQLShiftRepository, "get_all", ({}, 20, (start, first.id))),
+        "shift": (SQLShiftRepository, AsyncSQLShiftRepository, "get_by_id", (first.id,)),
+        "vigilante_hours": (SQLReportRepository, AsyncSQLReportRepository, "get_vigilante_hours", (first.vigilante_id, *window)),
+        "building_report": (SQLReportRepository, AsyncSQLReportRepository, "get_building_report", (first.building_id, *window)),
+        "vigilante_liquidation": (
+            SQLPayrollRepository, AsyncSQLPayrollRepository, "get_vigilante_liquidation", (first.vigilante_id, start.month, start.year)
+        ),
+        "building_liquidation": (
+            SQLPayrollRepository, AsyncSQLPayrollRepository, "get_building_liquidation", (first.building_id, start.month, start.year)
+        ),
+    }
+
+
+@pytest.mark.parametrize("name", [
+    "vigilantes", "vigilante", "buildings", "building", "shift_page", "shift_next_page", "shift",
+    "vigilante_hours", "building_report", "vigilante_liquidation", "building_liquidation",
+])
+def test_async_repository_matches_sync(databases, name):
+    session, async_database, data = databases
+    sync_repository, async_repository, method, args = _calls(data)[name]
+    expected = getattr(sync_repository(session), method)(*args)
+    actual = asyncio.run(getattr(async_repository(async_database), method)(*args))
+    assert expected, f"{name} returned nothing to compare"
+    assert actual == expected
+
+
+def test_concurrent_reads(databases):
+    session, async_database, data = databases
+    repository = AsyncSQLShiftRepository(async_database)
+
+    async def read_all():
+        return await asyncio.gather(*(repository.get_all({}, 20) for _ in range(CONCURRENT_CALLS)))
+
+    pages = asyncio.run(read_all())
+    assert all(page == pages[0] for page in pages)
+    assert pages[0] == SQLShiftRepository(session).get_all({}, 20)
@@ -0,0 +1,86 @@
+"""
+Token parity
+A token issued by /api/auth/login must open both the Flask routes and the
+async read routes, which check it with the Flask app's JWT settings.
+Needs aiosqlite; skipped without it.
+"""
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from flask_jwt_extended import create_access_token
+from werkzeug.security import generate_password_hash
+
+from app.config import Config
+
+# The API modules build their engines from Config when first imported
+_URL = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='auth_tokens'), 'turnos.db')}"
+Config.SQLALCHEMY_DATABASE_URI = Config.ASYNC_DATABASE_URL = _URL
+Config.DATABASE_REPLICA_URLS = []
+
+from app.domain.holidays import holiday_calendar
+from app.infrastructure.database import UserModel
+from app.interface.api.db import database
+from app.interface.async_api import create_async_app
+from app.main import create_app
+
+# Importing the API points the shared calendar at this module's database; other tests expect it empty
+holiday_calendar.set_loader(None)
+
+SECRET = "a-secret-only-the-flask-app-knows-0123456789"
+
+
+@pytest.fixture(scope="module")
+def apps():
+    database.create_tables()
+    session = database.get_session()
+    session.add(UserModel(
+        nombre_usuario="operador", password=generate_password_hash("clave"), rol="operador_supervisor",
+        nombre_completo="Operador", email="operador@example.com"
+    ))
+    session.commit()
+    session.close()
+    flask_app = create_app()
+    flask_app.config["JWT_SECRET_KEY"] = SECRET
+    return flask_app, create_async_app(flask_app).async_app
+
+
+def _login(flask_app):
+    response = flask_app.test_client().post("/api/auth/login", json={"username": "operador", "password": "clave"})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()["access_token"]
+
+
+def _async_get(async_app, path, headers):
+    async def get():
+        response = await async_app.test_client().get(path, headers=headers)
+        return response.status_code, await response.get_json()
+    return asyncio.run(get())
+
+
+def test_login_token_opens_sync_and_async_routes(apps):
+    flask_app, async_app = apps
+    headers = {"Authorization": f"Bearer {_login(flask_app)}"}
+    sync = flask_app.test_client()
+    assert sync.get("/api/vigilantes/", headers=headers).status_code == 200
+    assert sync.get("/api/auth/protected", headers=headers).get_json()["user"]["username"] == "operador"
+    status, body = _async_get(async_app, "/api/vigilantes/", headers)
+    assert status == 200, body
+
+
+def test_tokens_signed_elsewhere_are_rejected_by_both(apps):
+    flask_app, async_app = apps
+    with flask_app.app_context():
+        flask_app.config["JWT_SECRET_KEY"] = "some-other-secret-0123456789abcdef"
+        try:
+            foreign = create_access_token(identity="1")
+        finally:
+            flask_app.config["JWT_SECRET_KEY"] = SECRET
+    headers = {"Authorization": f"Bearer {foreign}"}
+    assert flask_app.test_client().get("/api/vigilantes/", headers=headers).status_code == 422
+    assert _async_get(async_app, "/api/vigilantes/", headers)[0] == 422
+    assert _async_get(async_app, "/api/vigilantes/", {})[0] == 401
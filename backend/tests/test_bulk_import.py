@@ -0,0 +1,118 @@
+"""
+Bulk import check
+Vigilantes and buildings are imported from generated CSV and XLSX files
+through ImportService. Bad values, keys repeated in the file and keys
+already registered must be rejected with their spreadsheet row number
+while the other rows are created. SQLite by default; set IMPORT_TEST_URL
+to a scratch PostgreSQL database to exercise the COPY staging path.
+"""
+import io
+import os
+from decimal import Decimal
+
+import pytest
+
+from app.application.services import ImportService
+from app.domain.bulk_import import BUILDING_IMPORT
+from app.infrastructure.database import (
+    BuildingModel,
+    SQLBuildingRepository,
+    SQLVigilanteRepository,
+    VigilanteModel,
+    _copy_csv,
+)
+from app.infrastructure.spreadsheets import read_spreadsheet
+from benchmarks.synthetic import building_import_row, csv_upload, vigilante_import_row
+
+from .support import seeded_database
+
+
+@pytest.fixture
+def importer():
+    with seeded_database(url=os.environ.get("IMPORT_TEST_URL", "sqlite://")) as (_, session):
+        yield session, ImportService(SQLVigilanteRepository(session), SQLBuildingRepository(session))
+
+
+def _count(session, model):
+    return session.query(model).count()
+
+
+def test_bad_and_duplicate_rows_are_reported(importer):
+    session, service = importer
+    service.import_vigilantes(*read_spreadsheet(csv_upload([vigilante_import_row(0)]), "vigilantes.csv"))
+    rows = [vigilante_import_row(n) for n in range(1, 6)]
+    rows[1]["fecha_nacimiento"] = "17/05/1990"
+    rows[2]["numero_identificacion"] = rows[0]["numero_identificacion"]
+    rows[3]["correo_electronico"] = vigilante_import_row(0)["correo_electronico"].upper()
+    rows[4]["tipo_contrato"] = ""
+
+    result = service.import_vigilantes(*read_spreadsheet(csv_upload(rows, delimiter=";"), "vigilantes.csv"))
+    assert result["success"], result
+    assert result["data"]["received"] == 5 and result["data"]["created"] == 1
+    assert [(error["row"], error["message"].split()[0]) for error in result["data"]["errors"]] == [
+        (3, "fecha_nacimiento"),
+        (4, "numero_identificacion"),
+        (5, "correo_electronico"),
+        (6, "tipo_contrato"),
+    ]
+    assert "earlier in the file" in result["data"]["errors"][1]["message"]
+    assert "already registered" in result["data"]["errors"][2]["message"]
+    assert _count(session, VigilanteModel) == 2
+
+
+def test_atomic_import_creates_nothing_on_error(importer):
+    session, service = importer
+    rows = [building_import_row(n) for n in range(1, 4)]
+    rows[2]["horas_semanales"] = 60
+    result = service.import_buildings(*read_spreadsheet(csv_upload(rows), "edificios.csv"), atomic=True)
+    assert not result["success"] and result["data"]["rejected"] == 1
+    assert _count(session, BuildingModel) == 0
+
+
+def test_missing_columns_are_named(importer):
+    session, service = importer
+    row = building_import_row(1)
+    del row["tipo_turno"]
+    result = service.import_buildings(*read_spreadsheet(csv_upload([row]), "edificios.csv"))
+    assert not result["success"] and "tipo_turno" in result["message"]
+
+
+def test_xlsx_import(importer):
+    openpyxl = pytest.importorskip("openpyxl")
+    session, service = importer
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    columns = list(BUILDING_IMPORT.columns)
+    sheet.append(columns)
+    for n in range(1, 21):
+        row = building_import_row(n)
+        sheet.append([row.get(name) for name in columns])
+    sheet.append([None] * len(columns))  # trailing blank rows are ignored
+    stream = io.BytesIO()
+    workbook.save(stream)
+    stream.seek(0)
+
+    result = service.import_buildings(*read_spreadsheet(stream, "edificios.xlsx"))
+    assert result["success"] and result["data"]["created"] == 20, result
+    again = service.import_buildings(*read_spreadsheet(io.BytesIO(stream.getvalue()), "edificios.xlsx"))
+    assert again["data"]["created"] == 0 and again["data"]["rejected"] == 20
+    assert _count(session, BuildingModel) == 20
+
+
+def test_semicolon_files_read_decimal_commas(importer):
+    session, service = importer
+    rows = [vigilante_import_row(n) for n in range(1, 5)]
+    for row, salario in zip(rows, ["1.300.000,50", "1234,56", "1300000.25", "1.300.000"]):
+        row["salario"] = salario
+    result = service.import_vigilantes(*read_spreadsheet(csv_upload(rows, delimiter=";"), "vigilantes.csv"))
+    assert result["data"]["created"] == 4, result
+    salaries = [salario for salario, in session.query(VigilanteModel.salario).order_by(VigilanteModel.numero_identificacion)]
+    assert salaries == [Decimal("1300000.50"), Decimal("1234.56"), Decimal("1300000.25"), Decimal("1300000.00")]
+
+
+def test_copy_keeps_empty_strings_apart_from_nulls():
+    rows = [{"a": None, "b": "", "c": 'say "hi", then\nleave'}, {"a": 1, "b": "\\.", "c": Decimal("2.50")}]
+    assert _copy_csv(rows, ["a", "b", "c"]).getvalue() == (
+        ',"","say ""hi"", then\nleave"\n'
+        '1,"\\.",2.50\n'
+    )
@@ -0,0 +1,130 @@
+"""
+Dashboard summary check
+cobertura_edificios and disponibilidad_vigilantes are refreshed by the
+repository writes to asignaciones_turnos. After each kind of write they
+must match the aggregates of vista_cobertura_edificios and
+vista_vigilantes_disponibles recomputed in Python from the assignments.
+Availability must stay exact as the clock passes shift boundaries with
+no refresh in between.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from app.application.services import PayrollService
+from app.domain.repair import AssignmentChange
+from app.domain.roster import RosterAssignment
+from app.infrastructure.database import (
+    DisponibilidadVigilanteModel,
+    ShiftModel,
+    SQLDashboardRepository,
+    SQLPayrollRepository,
+    SQLShiftRepository,
+    VigilanteModel,
+)
+from benchmarks.synthetic import SyntheticConfig
+
+
+DATASET = SyntheticConfig(vigilantes=30, buildings=6)
+
+
+def _expected_coverage(session, start, end):
+    vigilantes = defaultdict(set)
+    for shift in session.query(ShiftModel).filter(ShiftModel.fecha >= start, ShiftModel.fecha <= end):
+        vigilantes[(shift.fecha, shift.id_edificio, shift.hora_inicio.hour)].add(shift.id_vigilante)
+    return [
+        (building, day.isoformat(), hour, len(assigned))
+        for (day, building, hour), assigned in sorted(vigilantes.items())
+    ]
+
+
+def _coverage(dashboard, start, end):
+    return [
+        (row["building_id"], row["date"], row["hour"], row["assigned_vigilantes"])
+        for row in dashboard.get_building_coverage(start, end)
+    ]
+
+
+def _expected_availability(session, now):
+    shifts = defaultdict(list)
+    for shift in session.query(ShiftModel):
+        shifts[shift.id_vigilante].append(shift)
+    expected = []
+    for vigilante in session.query(VigilanteModel).filter(VigilanteModel.activo == True).order_by(VigilanteModel.id_vigilante):
+        ended = [s.hora_fin for s in shifts[vigilante.id_vigilante] if s.hora_fin <= now]
+        upcoming = [s.hora_inicio for s in shifts[vigilante.id_vigilante] if s.hora_inicio > now]
+        expected.append((
+            vigilante.id_vigilante,
+            max(ended).isoformat() if ended else None,
+            min(upcoming).isoformat() if upcoming else None,
+        ))
+    return expected
+
+
+def _availability(dashboard, now):
+    return [
+        (row["vigilante_id"], row["last_shift_end"], row["next_shift_start"])
+        for row in dashboard.get_available_vigilantes(now)
+    ]
+
+
+def _window(data):
+    start = data.shifts[0].start_datetime.date()
+    return start, start + timedelta(days=7)
+
+
+def test_rebuild_matches_the_views(seeded):
+    _, session, data = seeded
+    dashboard = SQLDashboardRepository(session)
+    now = data.shifts[len(data.shifts) // 2].start_datetime
+    dashboard.rebuild(now)
+    assert _coverage(dashboard, *_window(data)) == _expected_coverage(session, *_window(data))
+    assert _availability(dashboard, now) == _expected_availability(session, now)
+
+
+def test_writes_refresh_only_what_they_touch(seeded):
+    _, session, data = seeded
+    dashboard = SQLDashboardRepository(session)
+    shifts = SQLShiftRepository(session)
+    # The synthetic history is in the past, so every stored availability row
+    # holds from now on and reads use them as they are
+    dashboard.rebuild()
+    first = data.shifts[0]
+    # The last shift of another vigilante, whose last_shift_end moves when it is reassigned
+    second = max((s for s in data.shifts if s.vigilante_id != first.vigilante_id), key=lambda s: s.end_datetime)
+
+    later = first.start_datetime + timedelta(days=3)
+    shifts.copy_assignments([(1, RosterAssignment(
+        first.vigilante_id, first.building_id, 1, later, later + timedelta(hours=8)
+    ))])
+    shifts.apply_reassignments([AssignmentChange(
+        second.id, second.building_id, second.start_datetime, second.end_datetime,
+        second.vigilante_id, first.vigilante_id
+    )])
+    payroll = PayrollService(SQLPayrollRepository(session))
+    payroll.complete_assignments([first.id])
+    moved = payroll.correct_assignment(first.id, {
+        "building_id": second.building_id,
+        "start_datetime": (first.start_datetime + timedelta(days=1)).isoformat(),
+        "end_datetime": (first.end_datetime + timedelta(days=1)).isoformat(),
+    })
+    assert moved["success"], moved
+
+    assert _coverage(dashboard, *_window(data)) == _expected_coverage(session, *_window(data))
+    now = datetime.now()
+    assert session.query(DisponibilidadVigilanteModel).filter(DisponibilidadVigilanteModel.calculado_en > now).count() == 0
+    assert _availability(dashboard, now) == _expected_availability(session, now)
+
+
+def test_availability_follows_the_clock(seeded):
+    _, session, data = seeded
+    dashboard = SQLDashboardRepository(session)
+    start = data.shifts[0].start_datetime
+    dashboard.rebuild(start - timedelta(days=1))
+    for now in (start, start + timedelta(hours=1), start + timedelta(hours=30), start + timedelta(days=5)):
+        assert _availability(dashboard, now) == _expected_availability(session, now)
+
+    refreshed = dashboard.refresh_due_availability(start + timedelta(days=5))
+    assert refreshed > 0
+    now = start + timedelta(days=5)
+    assert session.query(DisponibilidadVigilanteModel).filter(DisponibilidadVigilanteModel.vigente_hasta <= now).count() == 0
+    assert _availability(dashboard, now) == _expected_availability(session, now)
@@ -0,0 +1,119 @@
+"""
+Hours and fixed-point check
+The vectorized splitter must agree minute by minute with a plain walk over
+each shift, the holiday calendar must load each year once, and the integer
+rounding helpers must round half away from zero like Decimal.
+"""
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+import pytest
+
+from app.domain.fixed_point import divide_rounded, minutes_to_hundredths, to_decimal, to_hundredths
+from app.domain.holidays import HolidayCalendar
+from app.domain.hours import ORDINARY_MINUTES, REGISTRO_HORAS_COLUMNS, split_hours
+
+
+HOLIDAYS = {2025: [date(2025, 1, 6), date(2025, 3, 24), date(2025, 12, 8), date(2025, 12, 25)], 2026: [date(2026, 1, 1)]}
+
+
+@pytest.fixture
+def calendar():
+    loads = []
+
+    def loader(year):
+        loads.append(year)
+        return HOLIDAYS.get(year, []) + [date(year + 1, 1, 1)]  # other years' dates are ignored
+    calendar = HolidayCalendar(loader)
+    calendar.loads = loads
+    return calendar
+
+
+def _walk(start, end, calendar):
+    """Minutes per registro_horas column, one minute at a time"""
+    totals = dict.fromkeys(REGISTRO_HORAS_COLUMNS, 0)
+    moment, elapsed = start, 0
+    while moment < end:
+        holiday = moment.weekday() == 6 or calendar.is_holiday(moment.date())
+        night = moment.hour < 6 or moment.hour >= 21
+        if holiday:
+            column = 'horas_extras_festivas_nocturnas' if night else 'horas_extras_festivas_diurnas'
+        elif elapsed < ORDINARY_MINUTES:
+            column = 'horas_normales'
+        else:
+            column = 'horas_extras_nocturnas' if night else 'horas_extras_diurnas'
+        totals[column] += 1
+        moment += timedelta(minutes=1)
+        elapsed += 1
+    return totals
+
+
+def test_split_matches_a_minute_walk(calendar):
+    rng = random.Random(0)
+    starts = [datetime(2025, 12, 1) + timedelta(minutes=rng.randrange(40 * 24 * 60)) for _ in range(150)]
+    ends = [start + timedelta(minutes=rng.choice([0, 45, 480, 720, 1440]) + rng.randrange(120)) for start in starts]
+    minutes = split_hours(starts, ends, calendar).minutes()
+    for k, (start, end) in enumerate(zip(starts, ends)):
+        assert {column: int(minutes[column][k]) for column in REGISTRO_HORAS_COLUMNS} == _walk(start, end, calendar)
+
+
+def test_weekday_night_shift_is_ordinary(calendar):
+    # Tuesday 22:00 - Wednesday 06:00, then Tuesday 18:00 - Wednesday 06:00
+    hours = split_hours([datetime(2025, 12, 9, 22), datetime(2025, 12, 9, 18)],
+                        [datetime(2025, 12, 10, 6), datetime(2025, 12, 10, 6)], calendar).hours()
+    assert [hours[column][0] for column in REGISTRO_HORAS_COLUMNS] == [8, 0, 0, 0, 0]
+    assert [hours[column][1] for column in REGISTRO_HORAS_COLUMNS] == [8, 0, 4, 0, 0]
+
+
+def test_split_flags_holiday_starts_and_handles_no_shifts(calendar):
+    split = split_hours([datetime(2025, 12, 7, 22), datetime(2025, 12, 8, 7), datetime(2025, 12, 9, 7)],
+                        [datetime(2025, 12, 8, 6), datetime(2025, 12, 8, 15), datetime(2025, 12, 9, 15)], calendar)
+    assert split.holiday.tolist() == [True, True, False]  # a Sunday, a holiday, a Tuesday
+    assert split_hours([], [], calendar).normales.size == 0
+
+
+def test_calendar_loads_each_year_once(calendar):
+    assert calendar.is_holiday(date(2025, 12, 8)) and not calendar.is_holiday(date(2025, 12, 9))
+    assert calendar.holidays(2025) == HOLIDAYS[2025]
+    assert calendar.ordinals(date(2025, 12, 1), date(2026, 1, 31)).tolist() == [
+        date(2025, 12, 8).toordinal(), date(2025, 12, 25).toordinal(), date(2026, 1, 1).toordinal()
+    ]
+    assert calendar.loads == [2025, 2026]
+    calendar.refresh(2025)
+    calendar.is_holiday(date(2025, 1, 6))
+    calendar.is_holiday(date(2026, 1, 6))
+    assert calendar.loads == [2025, 2026, 2025]
+
+
+def test_calendar_reloads_years_older_than_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.domain.holidays.time.monotonic", lambda: now[0])
+    loads = []
+    calendar = HolidayCalendar(lambda year: loads.append(year) or HOLIDAYS.get(year, []), ttl_seconds=60)
+    calendar.is_holiday(date(2025, 12, 8))
+    now[0] += 59
+    calendar.is_holiday(date(2025, 12, 8))
+    assert loads == [2025]
+    now[0] += 1
+    assert calendar.holidays(2025) == HOLIDAYS[2025]
+    assert loads == [2025, 2025]
+
+
+def test_calendar_without_loader_is_empty():
+    assert HolidayCalendar().holidays(2025) == []
+
+
+@pytest.mark.parametrize("denominator", [2, 3, 60, 240 * 60 * 100])
+def test_divide_rounded_rounds_half_away_from_zero(denominator):
+    numerators = list(range(-3 * denominator, 3 * denominator + 1, max(1, denominator // 7))) + [denominator // 2, -(denominator // 2)]
+    expected = [int((Decimal(n) / denominator).quantize(Decimal(1), rounding=ROUND_HALF_UP)) for n in numerators]
+    assert [divide_rounded(n, denominator) for n in numerators] == expected
+    assert divide_rounded(np.array(numerators, dtype=np.int64), denominator).tolist() == expected
+
+
+def test_hundredths_conversions():
+    assert [minutes_to_hundredths(m) for m in (0, 1, 20, 30, 50, 59, 480)] == [0, 2, 33, 50, 83, 98, 800]
+    assert [to_hundredths(v) for v in (None, "1300000.00", 0.005, Decimal("12.345"), 7)] == [0, 130000000, 1, 1235, 700]
+    assert to_decimal(130000050) == Decimal("1300000.50")
@@ -0,0 +1,64 @@
+"""
+Parallel planner check
+The clustered month must cover as many slots as the single min-cost solver,
+keep every vigilante rested, and not depend on the worker count.
+"""
+import pytest
+
+from app.domain.parallel_planning import ParallelRosterPlanner
+from app.domain.roster import RosterPlanningService
+from app.domain.timeline import ShiftTimeline
+from benchmarks.synthetic import SyntheticConfig, generate_dataset
+
+from .support import make_building, make_vigilante
+
+
+@pytest.fixture(scope="module")
+def month():
+    data = generate_dataset(SyntheticConfig(vigilantes=200, buildings=30))
+    return data.end, data
+
+
+def _plan(planner, month):
+    end, data = month
+    return planner.generate_month(end.month, end.year, data.buildings, data.vigilantes, data.shifts)
+
+
+def test_coverage_matches_the_single_solver(month):
+    end, data = month
+    solver = RosterPlanningService.generate_month(end.month, end.year, data.buildings, data.vigilantes, data.shifts)
+    planned = _plan(ParallelRosterPlanner(workers=1), month)
+    assert len(planned.unfilled) <= len(solver.unfilled)
+    assert len(planned.assignments) + len(planned.unfilled) == len(solver.assignments) + len(solver.unfilled)
+
+
+def test_vigilantes_stay_rested(month):
+    end, data = month
+    planned = _plan(ParallelRosterPlanner(workers=1), month)
+    timeline = ShiftTimeline(data.shifts)
+    for assignment in sorted(planned.assignments, key=lambda a: a.start_datetime):
+        assert not timeline.has_conflict(
+            assignment.vigilante_id, assignment.start_datetime, assignment.end_datetime, 12
+        ), assignment
+        timeline.add(assignment.to_shift())
+
+
+def test_roster_does_not_depend_on_workers(month):
+    inline = _plan(ParallelRosterPlanner(workers=1, n_clusters=4), month)
+    pooled = _plan(ParallelRosterPlanner(workers=2, n_clusters=4), month)
+    assert inline.assignments == pooled.assignments
+
+
+def test_short_cluster_borrows_from_its_neighbours():
+    # The armed vigilantes all live by the unarmed post, so the armed post's
+    # cluster gets only unarmed ones and the refill has to lend it theirs
+    buildings = [
+        make_building(1, street=1, avenue=1, shift_type="24_horas"),
+        make_building(2, ["manejo_armas"], street=190, avenue=90, shift_type="24_horas"),
+    ]
+    vigilantes = [make_vigilante(j, ["manejo_armas"], street=1, avenue=j) for j in range(1, 5)]
+    vigilantes += [make_vigilante(j, street=110, avenue=60) for j in range(5, 8)]
+    planned = ParallelRosterPlanner(workers=1, n_clusters=2, overlap=0).generate_month(3, 2025, buildings, vigilantes)
+    assert planned.unfilled == []
+    armed = {v.id for v in vigilantes[:4]}
+    assert all(a.vigilante_id in armed for a in planned.assignments if a.building_id == 2)
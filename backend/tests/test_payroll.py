@@ -0,0 +1,123 @@
+"""
+Payroll writes check
+Liquidation upserts and running-total increments must compile for every
+supported database, each adding to or overwriting the row on its unique key,
+and the running totals must match a full recompute after corrections.
+"""
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_mock_engine, update
+from sqlalchemy.orm import Session
+
+from app.application.services import PayrollService
+from app.domain.hours import REGISTRO_HORAS_COLUMNS
+from app.domain.payroll import ACCUMULATED_COLUMNS, liquidate_month
+from app.domain.services import PayrollCalculationService
+from app.infrastructure.database import (
+    LiquidacionMensualModel,
+    RegistroHorasModel,
+    SQLPayrollRepository,
+    VigilanteModel,
+)
+from benchmarks.synthetic import SyntheticConfig, generate_dataset
+
+
+def _repository(url):
+    return SQLPayrollRepository(Session(bind=create_mock_engine(url, lambda *args, **kwargs: None)))
+
+
+def _sql(repository, statement):
+    return str(statement.compile(dialect=repository.session.get_bind().dialect))
+
+
+@pytest.mark.parametrize("url,clause,proposed", [
+    ("postgresql://", "ON CONFLICT (id_asignacion) DO UPDATE", "excluded.horas_normales"),
+    ("sqlite://", "ON CONFLICT (id_asignacion) DO UPDATE", "excluded.horas_normales"),
+    ("mysql://", "ON DUPLICATE KEY UPDATE", "VALUES(horas_normales)"),
+    ("mariadb://", "ON DUPLICATE KEY UPDATE", "VALUES(horas_normales)"),
+])
+def test_upsert_overwrites_on_every_dialect(url, clause, proposed):
+    repository = _repository(url)
+    row = dict({"id_asignacion": 1}, **{column: 0 for column in REGISTRO_HORAS_COLUMNS})
+    sql = _sql(repository, repository._upsert(RegistroHorasModel, ["id_asignacion"], [row], "fecha_calculo"))
+    assert clause in sql
+    assert f"horas_normales = {proposed}" in sql
+    assert "id_asignacion = " not in sql.split(clause)[1]
+
+
+@pytest.mark.parametrize("url", ["postgresql://", "sqlite://", "mysql://", "mariadb://"])
+def test_increment_adds_to_the_running_row(url):
+    repository = _repository(url)
+    row = dict({"id_vigilante": 1, "mes": 1, "anio": 2026}, **{column: 0 for column in ACCUMULATED_COLUMNS})
+    sql = _sql(repository, repository._increment(LiquidacionMensualModel, ["id_vigilante", "mes", "anio"], [row]))
+    assert "valor_total = (liquidacion_mensual.valor_total + " in sql
+
+
+def test_other_databases_are_refused():
+    with pytest.raises(NotImplementedError):
+        _repository("oracle://")._insert(RegistroHorasModel)
+
+
+def _completed_month(session, data):
+    """Complete every assignment in the month of the first one; returns the service, month and year"""
+    first = data.shifts[0].start_datetime
+    ids = [
+        s.id for s in data.shifts
+        if (s.start_datetime.year, s.start_datetime.month) == (first.year, first.month)
+    ]
+    service = PayrollService(SQLPayrollRepository(session))
+    assert service.complete_assignments(ids)["success"]
+    return service, first.month, first.year
+
+
+def test_running_totals_match_a_recompute(seeded):
+    _, session, data = seeded
+    service, mes, anio = _completed_month(session, data)
+    shift = data.shifts[0]
+    moved = service.correct_assignment(shift.id, {
+        "end_datetime": (shift.end_datetime - timedelta(hours=2)).isoformat(),
+        "vigilante_id": data.vigilantes[-1].id,
+    })
+    assert moved["success"], moved
+    assert service.reconcile_month(mes, anio)["data"]["clean"]
+
+
+def test_corrections_take_back_what_was_added_after_a_raise(seeded):
+    _, session, data = seeded
+    service, mes, anio = _completed_month(session, data)
+    shift = data.shifts[0]
+    before = SQLPayrollRepository(session).get_vigilante_liquidation(shift.vigilante_id, mes, anio)
+    session.execute(
+        update(VigilanteModel).where(VigilanteModel.id_vigilante == shift.vigilante_id).values(salario=2_600_000)
+    )
+    session.commit()
+    corrected = service.correct_assignment(shift.id, {"end_datetime": shift.end_datetime.isoformat()})
+    assert corrected["success"], corrected
+    report = service.reconcile_month(mes, anio)["data"]
+    assert report["clean"], report
+    after = SQLPayrollRepository(session).get_vigilante_liquidation(shift.vigilante_id, mes, anio)
+    # Same hours at twice the salario: only the corrected shift's value changes
+    assert after["total_horas_normales"] == before["total_horas_normales"]
+    assert after["valor_total"] > before["valor_total"]
+
+
+def test_payment_matches_the_liquidation_row():
+    data = generate_dataset(SyntheticConfig(vigilantes=20, buildings=4))
+    salaries = {v.id: 1_300_000_00 + 1_000_01 * v.id for v in data.vigilantes}
+    hours = pd.DataFrame([
+        dict(minutes, id_vigilante=s.vigilante_id, id_edificio=s.building_id, salario_centavos=salaries[s.vigilante_id])
+        for s, minutes in zip(data.shifts, PayrollCalculationService.split_registro_horas(data.shifts))
+    ])
+    # One liquidation over the whole history: the month only labels the rows
+    expected = liquidate_month(1, 2025, hours).vigilantes.set_index("id_vigilante")
+    for vigilante in data.vigilantes:
+        shifts = [s for s in data.shifts if s.vigilante_id == vigilante.id]
+        payment = PayrollCalculationService.calculate_vigilante_payment(vigilante, shifts, salaries[vigilante.id])
+        if not shifts:
+            assert payment["total_payment_centavos"] == 0
+            continue
+        row = expected.loc[vigilante.id]
+        assert payment["total_payment_centavos"] == row["valor_total"]
+        assert payment["hours_breakdown"] == {column: row["total_" + column] / 100 for column in REGISTRO_HORAS_COLUMNS}
@@ -0,0 +1,79 @@
+"""
+Query-count guard
+Listings that show related names must load them in the same statement:
+the number of SQL statements a listing issues may not grow with the
+number of rows it returns.
+"""
+from datetime import timedelta
+
+import pytest
+
+from app.application.services import PayrollService
+from app.infrastructure.database import (
+    SQLNovedadRepository,
+    SQLPayrollRepository,
+    SQLReportRepository,
+    SQLShiftRepository,
+)
+
+from benchmarks.cases import SIZES
+from benchmarks.synthetic import generate_dataset, seed_novedades
+
+from .support import count_statements, seeded_database
+
+
+# Page sizes compared for every listing
+SMALL_PAGE, LARGE_PAGE = 5, 100
+
+# Shifts with registro_horas rows
+COMPLETED_SHIFTS = 300
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    data = generate_dataset(SIZES["small"])
+    with seeded_database(data) as (database, session):
+        PayrollService(SQLPayrollRepository(session)).complete_assignments([shift.id for shift in data.shifts[:COMPLETED_SHIFTS]])
+        seed_novedades(session, data, LARGE_PAGE * 2)
+        yield database, session, data
+
+
+def _listings(session, data):
+    shifts = SQLShiftRepository(session)
+    novedades = SQLNovedadRepository(session)
+    reports = SQLReportRepository(session)
+    first = data.shifts[0]
+    busiest = max(data.vigilantes, key=lambda v: sum(s.vigilante_id == v.id for s in data.shifts[:COMPLETED_SHIFTS])).id
+    start = first.start_datetime.date()
+    return {
+        "shifts": lambda limit: shifts.get_all({}, limit).items,
+        "novedades": lambda limit: novedades.get_all({}, limit).items,
+        "vigilante_hours": lambda limit: reports.get_vigilante_hours(
+            busiest, start, start + timedelta(days=limit)
+        ),
+        "building_report": lambda limit: reports.get_building_report(
+            first.building_id, start, start + timedelta(days=limit)
+        ),
+    }
+
+
+@pytest.mark.parametrize("name", ["shifts", "novedades", "vigilante_hours", "building_report"])
+def test_listing_uses_constant_statements(seeded, name):
+    database, session, data = seeded
+    listing = _listings(session, data)[name]
+    few, few_statements = count_statements(database, session, lambda: listing(SMALL_PAGE))
+    many, many_statements = count_statements(database, session, lambda: listing(LARGE_PAGE))
+    assert len(many) > len(few) > 0
+    assert few_statements == many_statements == 1, (
+        f"{name}: {few_statements} statements for {len(few)} rows, {many_statements} for {len(many)}"
+    )
+
+
+def test_listings_carry_names(seeded):
+    database, session, data = seeded
+    names = {v.id: v.name for v in data.vigilantes}
+    page = SQLNovedadRepository(session).get_all({}, LARGE_PAGE).items
+    assert all(row["vigilante_name"] == names[row["vigilante_id"]] for row in page)
+    assert any(row["replacement_vigilante_name"] for row in page)
+    shifts = SQLShiftRepository(session).get_all({}, LARGE_PAGE).items
+    assert all(row["vigilante_name"] == names[row["vigilante_id"]] and row["building_name"] for row in shifts)
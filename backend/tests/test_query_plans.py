@@ -0,0 +1,205 @@
+"""
+Query-plan regression check
+Every hot repository call runs against a seeded database while its SQL is
+captured, then each captured SELECT is EXPLAINed and the test fails if the
+plan reads a whole table, or walks a whole index only to filter its rows. SQLite in memory by default; set
+EXPLAIN_DATABASE_URL to a scratch PostgreSQL database to check the real
+planner, where sequential scans are disabled so that any remaining
+"Seq Scan" means no index serves the query.
+"""
+import os
+import re
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.application.services import PayrollService
+from app.infrastructure.database import (
+    Base,
+    BuildingModel,
+    SQLBuildingRepository,
+    SQLDashboardRepository,
+    SQLHolidayRepository,
+    SQLNovedadRepository,
+    SQLPayrollRepository,
+    SQLPlanillaRepository,
+    SQLReportRepository,
+    SQLShiftRepository,
+    SQLVigilanteRepository,
+    VigilanteModel,
+)
+
+from benchmarks.cases import SIZES
+from benchmarks.synthetic import generate_dataset, seed_novedades
+
+from .support import record_statements, seeded_database
+
+
+DATABASE_URL = os.environ.get("EXPLAIN_DATABASE_URL", "sqlite://")
+
+# Shifts completed up front so registro_horas and the liquidation tables have rows
+COMPLETED_SHIFTS = 200
+
+# Absences recorded against the first shifts
+NOVEDADES = 100
+
+# One in RETIRED_SHARE vigilantes and buildings stays active
+RETIRED_SHARE = 4
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    data = generate_dataset(SIZES["small"])
+    with seeded_database(data, DATABASE_URL) as (database, session):
+        PayrollService(SQLPayrollRepository(session)).complete_assignments(
+            [shift.id for shift in data.shifts[:COMPLETED_SHIFTS]]
+        )
+        seed_novedades(session, data, NOVEDADES)
+        # Former vigilantes and buildings stay in their tables; with most rows
+        # inactive the planner has a reason to prefer the partial indexes
+        for model, key in ((VigilanteModel, VigilanteModel.id_vigilante), (BuildingModel, BuildingModel.id_edificio)):
+            session.query(model).filter(key % RETIRED_SHARE != 0).update({"activo": False})
+        session.commit()
+        with database.engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+        yield database, session, data
+
+
+def _hot_paths(session, data):
+    shifts = SQLShiftRepository(session)
+    vigilante = data.vigilantes[0].id
+    building = data.buildings[0].id
+    first = data.shifts[0]
+    start = first.start_datetime
+    window = (start - timedelta(hours=12), start + timedelta(hours=36))
+    month = start.month, start.year
+    month_start = date(start.year, start.month, 1)
+    page = shifts.get_all({}, limit=20)
+    after = page.items[-1]
+
+    return {
+        "shifts_by_vigilante_in_window": lambda: shifts.get_shifts_by_vigilante_in_window(vigilante, *window),
+        "shifts_for_vigilantes_in_window": lambda: shifts.get_shifts_for_vigilantes_in_window(
+            [v.id for v in data.vigilantes[:20]], *window
+        ),
+        "shifts_by_date_range": lambda: shifts.get_shifts_by_date_range(*window),
+        "shift_listing_first_page": lambda: shifts.get_all({}, limit=20),
+        "shift_listing_next_page": lambda: shifts.get_all(
+            {}, limit=20, after=(datetime.fromisoformat(after["start_time"]), after["id"])
+        ),
+        "shift_listing_by_vigilante": lambda: shifts.get_all({"vigilante_id": vigilante}, limit=20),
+        "shift_listing_by_building": lambda: shifts.get_all(
+            {"building_id": building, "start_from": window[0], "start_to": window[1]}, limit=20
+        ),
+        "novedad_listing": lambda: SQLNovedadRepository(session).get_all({}, limit=20),
+        "novedad_listing_by_vigilante": lambda: SQLNovedadRepository(session).get_all(
+            {"vigilante_id": vigilante}, limit=20
+        ),
+        "planilla_assignment_count": lambda: SQLPlanillaRepository(session).count_assignments(1),
+        "active_vigilantes": lambda: SQLVigilanteRepository(session).get_active_vigilantes(),
+        "active_buildings": lambda: SQLBuildingRepository(session).get_active_buildings(),
+        "holidays_for_year": lambda: SQLHolidayRepository(session).get_dates_for_year(start.year),
+        "month_hours": lambda: SQLPayrollRepository(session).load_month_hours(*month),
+        "assignment_hours": lambda: SQLPayrollRepository(session).load_assignment_hours([first.id]),
+        "vigilante_liquidation": lambda: SQLPayrollRepository(session).get_vigilante_liquidation(
+            first.vigilante_id, *month
+        ),
+        "vigilante_hours_report": lambda: SQLReportRepository(session).get_vigilante_hours(
+            vigilante, month_start, month_start + timedelta(days=30)
+        ),
+        "building_report": lambda: SQLReportRepository(session).get_building_report(
+            building, month_start, month_start + timedelta(days=30)
+        ),
+        "building_coverage": lambda: SQLDashboardRepository(session).get_building_coverage(
+            start.date(), start.date() + timedelta(days=7)
+        ),
+        "building_coverage_by_building": lambda: SQLDashboardRepository(session).get_building_coverage(
+            start.date(), start.date() + timedelta(days=7), building
+        ),
+        "available_vigilantes": lambda: SQLDashboardRepository(session).get_available_vigilantes(),
+    }
+
+
+def _partial_indexes():
+    """Names of indexes with a WHERE clause; walking one reads only the rows it selects"""
+    return {
+        index.name
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+        if index.dialect_options["postgresql"]["where"] is not None
+        or index.dialect_options["sqlite"]["where"] is not None
+    }
+
+
+def _postgresql_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _postgresql_nodes(child)
+
+
+def _full_scans(engine, statement, parameters):
+    """Plan steps that read a whole table, or walk a whole index to filter it"""
+    partial = _partial_indexes()
+    with engine.connect() as connection:
+        if engine.dialect.name == "sqlite":
+            filtered = re.search(r"\bWHERE\b", statement, re.IGNORECASE) is not None
+            scans = []
+            for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters):
+                # SEARCH seeks into an index; SCAN reads a table or an index from end to end
+                match = re.match(r"SCAN (\w+)(?: USING (?:COVERING )?INDEX (\w+))?$", row[-1])
+                if match and (match.group(2) is None or (filtered and match.group(2) not in partial)):
+                    scans.append(row[-1])
+            return scans
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()[0]["Plan"]
+        return [
+            f"{node['Node Type']} on {node['Relation Name']}"
+            for node in _postgresql_nodes(plan)
+            if node["Node Type"] == "Seq Scan"
+            or (
+                node["Node Type"] in ("Index Scan", "Index Only Scan")
+                and "Index Cond" not in node
+                and "Filter" in node
+                and node["Index Name"] not in partial
+            )
+        ]
+
+
+HOT_PATH_NAMES = [
+    "shifts_by_vigilante_in_window",
+    "shifts_for_vigilantes_in_window",
+    "shifts_by_date_range",
+    "shift_listing_first_page",
+    "shift_listing_next_page",
+    "shift_listing_by_vigilante",
+    "shift_listing_by_building",
+    "novedad_listing",
+    "novedad_listing_by_vigilante",
+    "planilla_assignment_count",
+    "active_vigilantes",
+    "active_buildings",
+    "holidays_for_year",
+    "month_hours",
+    "assignment_hours",
+    "vigilante_liquidation",
+    "vigilante_hours_report",
+    "building_report",
+    "building_coverage",
+    "building_coverage_by_building",
+    "available_vigilantes",
+]
+
+
+@pytest.mark.parametrize("name", HOT_PATH_NAMES)
+def test_hot_path_uses_indexes(seeded, name):
+    database, session, data = seeded
+    _, statements = record_statements(database.engine, _hot_paths(session, data)[name], selects_only=True)
+    assert statements, f"{name} issued no SELECT"
+    for statement, parameters in statements:
+        scans = _full_scans(database.engine, statement, parameters)
+        assert not scans, f"{name} reads whole tables: {scans}\n{statement}"
+
+
+def test_every_hot_path_is_checked(seeded):
+    database, session, data = seeded
+    assert sorted(_hot_paths(session, data)) == sorted(HOT_PATH_NAMES)
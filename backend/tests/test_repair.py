@@ -0,0 +1,179 @@
+"""
+Absence repair check
+Swap chains must cover the open shift with the fewest moves, respect skills
+and rest, and the service must move the shifts and resolve the novedad in
+one transaction.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.application.services import ContingencyService
+from app.domain.models import Novedad
+from app.domain.repair import AssignmentChange
+from app.domain.services import ContingencyManagementService
+from app.infrastructure.database import (
+    NovedadModel,
+    ShiftModel,
+    SQLBuildingRepository,
+    SQLDashboardRepository,
+    SQLNovedadRepository,
+    SQLShiftRepository,
+    SQLVigilanteRepository,
+)
+from sqlalchemy import insert, update
+
+from benchmarks.synthetic import seed_novedades
+
+from .support import make_building, make_shift, make_vigilante
+
+
+DAY = datetime(2025, 3, 10, 6)
+
+
+def _absence(shift):
+    return Novedad(
+        id=1,
+        vigilante_id=shift.vigilante_id,
+        building_id=shift.building_id,
+        start_datetime=shift.start_datetime,
+        end_datetime=shift.end_datetime,
+        novedad_type="ausencia",
+        shift_id=shift.id
+    )
+
+
+def _repair(roster, vigilantes, buildings, absent):
+    return ContingencyManagementService.repair_absence(
+        _absence(absent), roster, vigilantes, {b.id: b for b in buildings}
+    )
+
+
+def test_free_vigilante_takes_the_shift():
+    open_shift = make_shift(1, 1, 1, DAY)
+    result = _repair([open_shift], [make_vigilante(1), make_vigilante(2)], [make_building(1)], open_shift)
+    assert result.resolved
+    assert [(c.shift_id, c.from_vigilante_id, c.to_vigilante_id) for c in result.changes] == [(1, 1, 2)]
+
+
+def test_chain_moves_a_qualified_vigilante_and_backfills():
+    # Only vigilante 2 is armed, but works elsewhere at the same time;
+    # vigilante 3 can take that unarmed post
+    open_shift = make_shift(1, 1, 1, DAY)
+    blocking = make_shift(2, 2, 2, DAY)
+    vigilantes = [make_vigilante(1, ["manejo_armas"]), make_vigilante(2, ["manejo_armas"]), make_vigilante(3)]
+    buildings = [make_building(1, ["manejo_armas"]), make_building(2)]
+    result = _repair([open_shift, blocking], vigilantes, buildings, open_shift)
+    assert result.resolved
+    assert [(c.shift_id, c.to_vigilante_id) for c in result.changes] == [(1, 2), (2, 3)]
+
+
+def test_rest_and_skills_leave_the_shift_unfilled():
+    open_shift = make_shift(1, 1, 1, DAY)
+    # Vigilante 2 ends a shift 4 hours before and nobody can take it over;
+    # vigilante 3 is unarmed and inactive
+    tired = make_shift(2, 2, 2, DAY.replace(hour=18, day=9))
+    vigilantes = [
+        make_vigilante(1, ["manejo_armas"]), make_vigilante(2, ["manejo_armas"]), make_vigilante(3, active=False)
+    ]
+    buildings = [make_building(1, ["manejo_armas"]), make_building(2)]
+    result = _repair([open_shift, tired], vigilantes, buildings, open_shift)
+    assert not result.resolved and result.unfilled == [open_shift]
+    assert result.changes == []
+
+
+def test_unknown_requirement_is_never_covered():
+    open_shift = make_shift(1, 1, 1, DAY)
+    vigilantes = [make_vigilante(1), make_vigilante(2, ["buceo"])]
+    result = _repair([open_shift], vigilantes, [make_building(1, ["buceo"])], open_shift)
+    assert not result.resolved
+
+
+@pytest.fixture
+def contingency(seeded):
+    database, session, data = seeded
+    seed_novedades(session, data, 1)
+    service = ContingencyService(
+        SQLNovedadRepository(session), SQLShiftRepository(session),
+        SQLVigilanteRepository(session), SQLBuildingRepository(session)
+    )
+    return session, data, service
+
+
+def test_repair_moves_shifts_and_resolves_in_one_commit(contingency):
+    session, data, service = contingency
+    commits = []
+    session.commit = (lambda commit: lambda: commits.append(1) or commit())(session.commit)
+    result = service.repair_novedad(1)
+    assert result["success"] and result["data"]["resolved"], result
+    change = result["data"]["changes"][0]
+    novedad = session.get(NovedadModel, 1)
+    assert (novedad.estado, novedad.id_vigilante_reemplazo) == ("resuelta", change["to_vigilante_id"])
+    assert session.get(ShiftModel, data.shifts[0].id).id_vigilante == change["to_vigilante_id"]
+    assert len(commits) == 1
+
+
+def test_failed_repair_changes_nothing(contingency, monkeypatch):
+    session, data, service = contingency
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("refresh failed")
+
+    monkeypatch.setattr(SQLDashboardRepository, "refresh", fail)
+    result = service.repair_novedad(1)
+    assert not result["success"]
+    session.expire_all()
+    assert session.get(NovedadModel, 1).estado == "pendiente"
+    assert session.get(ShiftModel, data.shifts[0].id).id_vigilante == data.shifts[0].vigilante_id
+
+
+def test_absence_without_shifts_is_resolved(contingency):
+    session, data, service = contingency
+    # Years after the seeded roster, so the window holds no shifts
+    start = max(s.end_datetime for s in data.shifts) + timedelta(days=365)
+    novedad_id = session.execute(insert(NovedadModel).returning(NovedadModel.id_novedad), [{
+        'id_vigilante_original': data.vigilantes[0].id, 'id_edificio': data.buildings[0].id,
+        'fecha_novedad': start.date(), 'hora_inicio': start, 'hora_fin': start + timedelta(hours=8),
+        'tipo_novedad': 'ausencia', 'estado': 'pendiente'
+    }]).scalar_one()
+    session.commit()
+    result = service.repair_novedad(novedad_id)
+    assert result["success"] and result["data"]["resolved"] and result["data"]["changes"] == [], result
+    novedad = session.get(NovedadModel, novedad_id)
+    assert (novedad.estado, novedad.id_vigilante_reemplazo) == ("resuelta", None)
+
+
+def test_stale_change_rolls_back(contingency, monkeypatch):
+    session, data, service = contingency
+    shift = data.shifts[0]
+    other = next(v.id for v in data.vigilantes if v.id != shift.vigilante_id)
+    repair_absence = ContingencyManagementService.repair_absence
+
+    def reassigned_meanwhile(*args, **kwargs):
+        result = repair_absence(*args, **kwargs)
+        session.execute(update(ShiftModel).where(ShiftModel.id_asignacion == shift.id).values(id_vigilante=other))
+        session.commit()
+        return result
+
+    monkeypatch.setattr(ContingencyManagementService, "repair_absence", staticmethod(reassigned_meanwhile))
+    result = service.repair_novedad(1)
+    assert not result["success"] and "changed" in result["message"], result
+    session.expire_all()
+    assert session.get(NovedadModel, 1).estado == "pendiente"
+    assert session.get(ShiftModel, shift.id).id_vigilante == other
+
+
+def test_reassignments_only_move_shifts_still_held(contingency):
+    session, data, service = contingency
+    first, second = data.shifts[0], data.shifts[1]
+    target = next(v.id for v in data.vigilantes if v.id not in (first.vigilante_id, second.vigilante_id))
+    changes = [
+        AssignmentChange(first.id, first.building_id, first.start_datetime, first.end_datetime,
+                         first.vigilante_id, target),
+        AssignmentChange(second.id, second.building_id, second.start_datetime, second.end_datetime,
+                         target, first.vigilante_id),
+    ]
+    assert SQLShiftRepository(session).apply_reassignments(changes, 1) is None
+    session.expire_all()
+    assert session.get(ShiftModel, first.id).id_vigilante == first.vigilante_id
+    assert session.get(NovedadModel, 1).estado == "pendiente"
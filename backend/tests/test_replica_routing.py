@@ -0,0 +1,77 @@
+"""
+Read/write splitting check
+A primary and two replicas are seeded with the same data, then one
+vigilante is renamed on the primary only, so every read shows which
+database answered it. SQLite files by default; set REPLICA_TEST_URLS to
+three comma-separated scratch PostgreSQL URLs (primary first) to run it
+against real servers.
+"""
+import os
+
+import pytest
+
+from app.infrastructure.database import (
+    REPLICA_ENGINE,
+    Base,
+    DatabaseSession,
+    SQLShiftRepository,
+    SQLVigilanteRepository,
+    VigilanteModel,
+)
+from benchmarks.synthetic import SyntheticConfig, generate_dataset
+
+from .support import seeded_database
+
+
+RENAMED = "Renamed on the primary"
+
+
+@pytest.fixture
+def replicated(tmp_path):
+    urls = [url for url in os.environ.get("REPLICA_TEST_URLS", "").split(",") if url]
+    if not urls:
+        urls = [f"sqlite:///{tmp_path / name}.db" for name in ("primary", "replica_1", "replica_2")]
+    data = generate_dataset(SyntheticConfig(vigilantes=10, buildings=3))
+    for url in urls:
+        with seeded_database(data, url) as (_, session):
+            if url == urls[0]:
+                session.query(VigilanteModel).filter_by(id_vigilante=data.vigilantes[0].id).update(
+                    {"nombre_completo": RENAMED}
+                )
+                session.commit()
+    database = DatabaseSession(urls[0], replica_urls=urls[1:])
+    yield database, data
+    for engine in [database.engine, *database.replicas.engines]:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def test_read_only_calls_go_to_a_replica(replicated):
+    database, data = replicated
+    vigilante = data.vigilantes[0].id
+    with database.get_session() as session:
+        assert SQLVigilanteRepository(session).get_by_id(vigilante)["name"] != RENAMED
+        assert session.get(VigilanteModel, vigilante).nombre_completo == RENAMED
+
+
+def test_replicas_are_used_in_turn(replicated):
+    database, data = replicated
+    used = []
+    for _ in range(4):
+        with database.get_session() as session:
+            SQLShiftRepository(session).get_all({}, 5)
+            used.append(session.info[REPLICA_ENGINE])
+    assert used[0] is not used[1]
+    assert used[:2] == used[2:]
+
+
+def test_reads_after_a_write_stay_on_the_primary(replicated):
+    database, data = replicated
+    vigilante = data.vigilantes[0].id
+    with database.get_session() as session:
+        repository = SQLVigilanteRepository(session)
+        assert repository.get_by_id(vigilante)["name"] != RENAMED
+        repository.update(data.vigilantes[1].id, {"telefono_celular": "3000000000"})
+        assert repository.get_by_id(vigilante)["name"] == RENAMED
+        session.close()
+        assert repository.get_by_id(vigilante)["name"] != RENAMED
@@ -0,0 +1,117 @@
+"""
+Repository cache check
+Two RepositoryCaches sharing one InMemoryCacheBackend stand for two worker
+processes sharing Redis. Hits must not touch the database, writes must be
+visible at once in the writing process and within version_check_seconds
+in the other one.
+"""
+import pytest
+
+from app.infrastructure.cache import CachedRepository, InMemoryCacheBackend, RepositoryCache
+from app.infrastructure.database import (
+    SQLBuildingRepository,
+    SQLShiftTypeRepository,
+    SQLVigilanteRepository,
+)
+from benchmarks.synthetic import SyntheticConfig
+
+from .support import count_statements
+
+
+DATASET = SyntheticConfig(vigilantes=10, buildings=3)
+
+VERSION_CHECK_SECONDS = 1.0
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def workers(seeded):
+    database, session, data = seeded
+    clock = Clock()
+    backend = InMemoryCacheBackend(clock)
+    caches = [
+        RepositoryCache(backend, ttl_seconds=300, version_check_seconds=VERSION_CHECK_SECONDS, clock=clock)
+        for _ in range(2)
+    ]
+    return database, session, data, clock, caches
+
+
+def test_hits_skip_the_database(workers):
+    database, session, data, clock, (cache, other) = workers
+    vigilantes = CachedRepository(SQLVigilanteRepository(session), cache, "vigilantes")
+    vigilante = data.vigilantes[0].id
+
+    first, first_statements = count_statements(database, session, lambda: vigilantes.get_by_id(vigilante))
+    again, again_statements = count_statements(database, session, lambda: vigilantes.get_by_id(vigilante))
+    shared, shared_statements = count_statements(
+        database, session, lambda: CachedRepository(SQLVigilanteRepository(session), other, "vigilantes").get_by_id(vigilante)
+    )
+    assert first == again == shared == SQLVigilanteRepository(session).get_by_id(vigilante)
+    assert (first_statements, again_statements, shared_statements) == (1, 0, 0)
+    assert cache.stats()["local_hits"] == 1 and other.stats()["shared_hits"] == 1
+
+
+def test_writes_invalidate_every_worker(workers):
+    database, session, data, clock, (cache, other) = workers
+    writer = CachedRepository(SQLVigilanteRepository(session), cache, "vigilantes")
+    reader = CachedRepository(SQLVigilanteRepository(session), other, "vigilantes")
+    vigilante = data.vigilantes[0].id
+    assert writer.get_by_id(vigilante)["phone"] == reader.get_by_id(vigilante)["phone"] != "3999999999"
+
+    writer.update(vigilante, {"telefono_celular": "3999999999"})
+    assert writer.get_by_id(vigilante)["phone"] == "3999999999"
+    clock.now += VERSION_CHECK_SECONDS
+    assert reader.get_by_id(vigilante)["phone"] == "3999999999"
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_namespaces_are_independent(workers):
+    database, session, data, clock, (cache, _) = workers
+    buildings = CachedRepository(SQLBuildingRepository(session), cache, "buildings")
+    shift_types = CachedRepository(SQLShiftTypeRepository(session), cache, "tipos_turnos")
+    buildings.get_all()
+    shift_types.get_all()
+    cache.invalidate("tipos_turnos")
+    _, building_statements = count_statements(database, session, buildings.get_all)
+    _, shift_type_statements = count_statements(database, session, shift_types.get_all)
+    assert (building_statements, shift_type_statements) == (0, 1)
+
+
+def test_results_are_not_shared_between_callers(workers):
+    database, session, data, clock, (cache, _) = workers
+    vigilantes = CachedRepository(SQLVigilanteRepository(session), cache, "vigilantes")
+    vigilantes.get_by_id(data.vigilantes[0].id)["name"] = "changed by a caller"
+    assert vigilantes.get_by_id(data.vigilantes[0].id)["name"] != "changed by a caller"
+
+
+def test_local_entries_are_bounded(workers):
+    database, session, data, clock, _ = workers
+    cache = RepositoryCache(max_entries=3, clock=clock)
+    vigilantes = CachedRepository(SQLVigilanteRepository(session), cache, "vigilantes")
+    for vigilante in data.vigilantes[:5]:
+        vigilantes.get_by_id(vigilante.id)
+    assert cache.stats()["entries"] == 3
+
+
+def test_failing_backend_falls_back_to_the_database(workers):
+    database, session, data, clock, _ = workers
+
+    class Down:
+        def get(self, key):
+            raise ConnectionError("cache down")
+
+        set = incr = get
+
+    cache = RepositoryCache(Down(), clock=clock)
+    vigilantes = CachedRepository(SQLVigilanteRepository(session), cache, "vigilantes")
+    assert vigilantes.get_by_id(data.vigilantes[0].id) == SQLVigilanteRepository(session).get_by_id(data.vigilantes[0].id)
+    vigilantes.update(data.vigilantes[0].id, {"telefono_celular": "3888888888"})
+    assert vigilantes.get_by_id(data.vigilantes[0].id)["phone"] == "3888888888"
+    assert cache.stats()["errors"] > 0
@@ -0,0 +1,103 @@
+"""
+Roster check
+The month solver must respect contracts, skills, minimum rest and one slot
+per vigilante per day; the optimizer's incremental cost must agree with a
+from-scratch recompute and it must never return a worse roster.
+"""
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.domain.optimizer import RosterOptimizer, _RosterState
+from app.domain.roster import RosterAssignment, RosterPlanningService
+from app.domain.timeline import ShiftTimeline
+from benchmarks.synthetic import SyntheticConfig, generate_dataset
+
+from .support import make_building, make_vigilante
+
+
+@pytest.fixture(scope="module")
+def month():
+    data = generate_dataset(SyntheticConfig(vigilantes=80, buildings=12))
+    end = data.end
+    roster = RosterPlanningService.generate_month(end.month, end.year, data.buildings, data.vigilantes, data.shifts)
+    return data, roster
+
+
+def test_hard_constraints_hold(month):
+    data, roster = month
+    vigilantes = {v.id: v for v in data.vigilantes}
+    buildings = {b.id: b for b in data.buildings}
+    assert roster.assignments
+    for assignment in roster.assignments:
+        vigilante = vigilantes[assignment.vigilante_id]
+        required = buildings[assignment.building_id].requirement_mask
+        assert vigilante.is_active() and vigilante.is_available_for_shift(assignment.start_datetime)
+        assert vigilante.skill_mask & required == required
+    per_day = Counter((a.vigilante_id, a.fecha) for a in roster.assignments)
+    assert max(per_day.values()) == 1
+
+
+def test_rest_holds_across_the_month_boundary(month):
+    data, roster = month
+    timeline = ShiftTimeline(data.shifts)
+    for assignment in sorted(roster.assignments, key=lambda a: a.start_datetime):
+        assert not timeline.has_conflict(
+            assignment.vigilante_id, assignment.start_datetime, assignment.end_datetime, 12
+        ), assignment
+        timeline.add(assignment.to_shift())
+
+
+def test_unqualified_slots_stay_unfilled():
+    building = make_building(1, requirements=("manejo_armas",))
+    roster = RosterPlanningService.generate_month(2, 2025, [building], [make_vigilante(1, ("curso_vigilancia",))])
+    assert not roster.assignments and len(roster.unfilled) == 28 * 3
+
+
+def test_incremental_cost_matches_a_recompute(month):
+    data, roster = month
+    optimizer = RosterOptimizer(data.buildings, data.vigilantes, data.shifts)
+    state = _RosterState(optimizer, roster.assignments)
+    rng = random.Random(0)
+    moves = 0
+    while moves < 500:
+        i = rng.randrange(len(state.owner))
+        target = rng.randrange(len(state.masks))
+        if target == state.owner[i] or not state.qualified(i, target):
+            continue
+        state.move(i, target, state.reassign_delta(i, target))
+        moves += 1
+    assert state.cost == pytest.approx(sum(state.breakdown().values()), rel=1e-9)
+
+
+def test_optimizer_never_returns_a_worse_roster(month):
+    data, roster = month
+    result = RosterOptimizer(data.buildings, data.vigilantes, data.shifts).optimize(roster.assignments, 300)
+    assert result.best_cost <= result.initial_cost + 1e-6
+    assert [(a.building_id, a.start_datetime) for a in result.assignments] == [
+        (a.building_id, a.start_datetime) for a in roster.assignments
+    ]
+
+
+def test_overtime_uses_the_building_cap():
+    # 44 hours in one week with no holidays: over a 40 hour building's cap, under a 48 hour one
+    monday = datetime(2025, 3, 3, 6)
+    short, long = make_building(1), make_building(2)
+    short.weekly_hours, long.weekly_hours = 40, 48
+    week = [(monday + timedelta(days=d), 8) for d in range(5)] + [(monday + timedelta(days=5), 4)]
+    optimizer = RosterOptimizer([short, long], [make_vigilante(1), make_vigilante(2)])
+
+    def state(building):
+        return _RosterState(optimizer, [
+            RosterAssignment(1, building.id, 1, start, start + timedelta(hours=hours)) for start, hours in week
+        ])
+
+    assert state(long).breakdown()["overtime"] == 0
+    capped = state(short)
+    assert capped.breakdown()["overtime"] == pytest.approx(4 * short.overtime_rate)
+    # Moving a shift to the other vigilante brings the week back under the cap
+    capped.move(0, 1, capped.reassign_delta(0, 1))
+    assert capped.breakdown()["overtime"] == 0
+    assert capped.cost == pytest.approx(sum(capped.breakdown().values()))
@@ -0,0 +1,88 @@
+"""
+Shift batches and listing check
+Batch validation must reject bad, unknown and conflicting rows with their
+index while accepting the rest, and keyset pages must walk the filtered
+listing exactly once, in (start, id) order.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.domain.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor, page_size
+from app.domain.shift_batch import history_window, infer_shift_type, validate_shift_batch
+from app.infrastructure.database import ShiftModel, SQLShiftRepository
+
+from .support import make_building, make_shift, make_vigilante
+
+
+MONDAY = datetime(2025, 3, 3)
+
+
+def _row(vigilante_id, building_id, start, hours=8, **extra):
+    return dict(vigilante_id=vigilante_id, building_id=building_id, start_datetime=start.isoformat(),
+                end_datetime=(start + timedelta(hours=hours)).isoformat(), **extra)
+
+
+def test_batch_rows_are_checked_in_order():
+    vigilantes = {j: make_vigilante(j) for j in (1, 2)}
+    buildings = {1: make_building(1), 2: make_building(2, shift_type="12_horas")}
+    history = [make_shift(900, 2, 1, MONDAY - timedelta(hours=10))]
+    rows = [
+        _row(1, 1, MONDAY + timedelta(hours=6)),                     # 0 accepted, type 1
+        _row(1, 2, MONDAY + timedelta(hours=43), hours=12),          # 1 accepted, type 5 (19:00, 12 h)
+        _row(1, 1, MONDAY + timedelta(hours=14)),                    # 2 overlaps row 0
+        _row(2, 1, MONDAY + timedelta(hours=6)),                     # 3 too little rest after shift 900
+        _row(3, 1, MONDAY + timedelta(hours=6)),                     # 4 unknown vigilante
+        _row(2, 7, MONDAY + timedelta(hours=22)),                    # 5 unknown building
+        _row(2, 1, MONDAY + timedelta(hours=22), hours=5),           # 6 non-standard length
+        _row(2, 1, MONDAY + timedelta(hours=22), hours=5, shift_type_id=7),  # 7 accepted with its type
+        {"vigilante_id": 2, "building_id": 1},                       # 8 missing times
+        _row(2, 1, MONDAY + timedelta(days=2), hours=0),             # 9 empty
+    ]
+    batch = validate_shift_batch(rows, vigilantes, buildings, history)
+    assert [index for index, _ in batch.accepted] == [0, 1, 7]
+    assert [a.shift_type_id for a in batch.assignments] == [1, 5, 7]
+    messages = {error["index"]: error["message"] for error in batch.errors}
+    assert sorted(messages) == [2, 3, 4, 5, 6, 8, 9]
+    assert messages[2].endswith("with row 0") and messages[3].endswith("with shift 900")
+    assert "Vigilante" in messages[4] and "Building" in messages[5] and "shift_type_id" in messages[6]
+    assert "start_datetime" in messages[8] and "after" in messages[9]
+
+
+def test_history_window_spans_the_parsable_rows():
+    rows = [_row(1, 1, MONDAY), {"vigilante_id": 5}, _row(2, 1, MONDAY + timedelta(days=3))]
+    assert history_window(rows, 12) == ({1, 2}, MONDAY - timedelta(hours=12), MONDAY + timedelta(days=3, hours=20))
+    assert history_window([{"vigilante_id": 5}]) is None
+    assert infer_shift_type(make_building(1, shift_type="24_horas"), MONDAY, MONDAY + timedelta(hours=24)) == 6
+
+
+def test_cursors_and_page_sizes():
+    assert decode_cursor(encode_cursor(MONDAY, 42)) == (MONDAY, 42)
+    for bad in ("", "not-a-cursor", encode_cursor(MONDAY, 1)[:-3]):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+    assert [page_size(v) for v in (None, "", "0", 20, 10_000)] == [50, 50, 1, 20, MAX_PAGE_SIZE]
+    with pytest.raises(ValueError):
+        page_size("ten")
+
+
+@pytest.mark.parametrize("filters", [{}, {"building_id": 1}, {"status": "programado", "start_from": datetime(2025, 1, 10)}])
+def test_pages_walk_the_listing_once(seeded, filters):
+    _, session, _ = seeded
+    repository = SQLShiftRepository(session)
+    seen, after = [], None
+    while True:
+        page = repository.get_all(filters, limit=7, after=after)
+        seen.extend((item["start_time"], item["id"]) for item in page.items)
+        if page.next_cursor is None:
+            break
+        start, row_id = decode_cursor(page.next_cursor)
+        after = (start, row_id)
+    query = session.query(ShiftModel)
+    for key, column in SQLShiftRepository.FILTER_COLUMNS.items():
+        if key in filters:
+            query = query.filter(column == filters[key])
+    if "start_from" in filters:
+        query = query.filter(ShiftModel.hora_inicio >= filters["start_from"])
+    expected = sorted((m.hora_inicio.isoformat(), m.id_asignacion) for m in query)
+    assert seen == expected and len(expected) > 7
@@ -0,0 +1,102 @@
+"""
+Replacement search check
+The grid index must return the same k nearest vigilantes as a full scan,
+and the service must look the building up by key and rebuild the index
+after vigilantes change.
+"""
+import random
+
+import pytest
+
+from app.application.services import ContingencyService, ImportService
+from app.domain.spatial import SpatialGridIndex, grid_distance
+from app.infrastructure.database import (
+    SQLBuildingRepository,
+    SQLNovedadRepository,
+    SQLShiftRepository,
+    SQLVigilanteRepository,
+)
+from app.infrastructure.spreadsheets import read_spreadsheet
+from benchmarks.synthetic import csv_upload, seed_novedades, vigilante_import_row
+
+from .support import make_vigilante
+
+
+@pytest.fixture(scope="module")
+def scattered():
+    rng = random.Random(7)
+    vigilantes = [make_vigilante(j, street=rng.randrange(200), avenue=rng.randrange(100)) for j in range(1, 301)]
+    vigilantes += [make_vigilante(j) for j in range(301, 306)]  # no address
+    return vigilantes
+
+
+def _brute_force(vigilantes, street, avenue, k, accept=lambda v: True, max_distance=None):
+    located = [
+        (grid_distance(street, avenue, v.street_number, v.avenue_number), v.id, v)
+        for v in vigilantes
+        if v.street_number is not None and accept(v)
+    ]
+    located = sorted(item for item in located if max_distance is None or item[0] <= max_distance)
+    result = [(v, d) for d, _, v in located[:k]]
+    if max_distance is None:
+        result += [(v, None) for v in vigilantes if v.street_number is None and accept(v)][:k - len(result)]
+    return result
+
+
+@pytest.mark.parametrize("street,avenue,k", [(0, 0, 1), (100, 50, 5), (199, 99, 20), (37, 12, 400)])
+def test_nearest_matches_a_full_scan(scattered, street, avenue, k):
+    index = SpatialGridIndex(scattered, cell_size=10)
+    assert index.nearest(street, avenue, k) == _brute_force(scattered, street, avenue, k)
+
+
+def test_filters_and_radius(scattered):
+    index = SpatialGridIndex(scattered)
+    even = lambda v: v.id % 2 == 0
+    assert index.nearest(50, 50, 10, even) == _brute_force(scattered, 50, 50, 10, even)
+    near = index.nearest(50, 50, 50, max_distance=15)
+    assert near == _brute_force(scattered, 50, 50, 50, max_distance=15)
+    assert all(distance is not None and distance <= 15 for _, distance in near)
+
+
+def test_removed_vigilantes_are_not_offered(scattered):
+    index = SpatialGridIndex(scattered)
+    nearest = index.nearest(100, 50, 1)[0][0]
+    index.remove(nearest.id)
+    assert nearest not in [v for v, _ in index.nearest(100, 50, 5)]
+    assert len(index) == len(scattered) - 1
+
+
+@pytest.fixture
+def contingency(seeded):
+    database, session, data = seeded
+    seed_novedades(session, data, 1)
+    vigilantes = SQLVigilanteRepository(session)
+    buildings = SQLBuildingRepository(session)
+    service = ContingencyService(SQLNovedadRepository(session), SQLShiftRepository(session), vigilantes, buildings)
+    return session, data, service
+
+
+def test_replacements_look_the_building_up_by_key(contingency, monkeypatch):
+    session, data, service = contingency
+
+    def scan():
+        raise AssertionError("find_replacements loaded every building")
+
+    monkeypatch.setattr(service.building_repository, "get_active_buildings", scan)
+    result = service.find_replacements(1, k=3)
+    assert result["success"] and result["count"] == 3, result
+    assert data.shifts[0].vigilante_id not in [row["vigilante_id"] for row in result["data"]]
+
+
+def test_vigilante_imports_rebuild_the_index(contingency):
+    session, data, service = contingency
+    importer = ImportService(
+        service.vigilante_repository, service.building_repository,
+        on_vigilantes_change=service.invalidate_spatial_index
+    )
+    before = len(service.spatial_index())
+    result = importer.import_vigilantes(
+        *read_spreadsheet(csv_upload([vigilante_import_row(n) for n in range(90_000, 90_003)]), "vigilantes.csv")
+    )
+    assert result["data"]["created"] == 3
+    assert len(service.spatial_index()) == before + 3
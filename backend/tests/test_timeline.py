@@ -0,0 +1,70 @@
+"""
+Shift timeline check
+Interval lookups on ShiftTimeline must match a scan of the vigilante's
+shifts, before and after shifts are added one by one.
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.domain.timeline import ShiftTimeline
+
+from .support import make_shift
+
+
+ORIGIN = datetime(2025, 1, 1)
+
+
+@pytest.fixture(scope="module")
+def shifts():
+    rng = random.Random(5)
+    return [
+        make_shift(k, rng.randrange(1, 6), 1, ORIGIN + timedelta(hours=rng.randrange(60 * 24)), rng.choice([8, 12, 24, 36]))
+        for k in range(1, 400)
+    ]
+
+
+def _scan(shifts, vigilante_id, start, end, rest_hours, exclude_id=None):
+    rest = timedelta(hours=rest_hours)
+    found = [
+        s for s in shifts
+        if s.vigilante_id == vigilante_id and s.id != exclude_id
+        and s.start_datetime < end + rest and s.end_datetime > start - rest
+    ]
+    return sorted(s.id for s in found)
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_conflicts_match_a_scan(shifts, incremental):
+    if incremental:
+        timeline = ShiftTimeline()
+        for shift in shifts:
+            timeline.add(shift)
+    else:
+        timeline = ShiftTimeline(shifts)
+    rng = random.Random(1)
+    for _ in range(300):
+        vigilante_id = rng.randrange(1, 7)
+        start = ORIGIN + timedelta(hours=rng.randrange(-24, 62 * 24))
+        end = start + timedelta(hours=rng.choice([1, 8, 24]))
+        rest = rng.choice([0, 12])
+        exclude = rng.choice([None, shifts[rng.randrange(len(shifts))].id])
+        found = timeline.conflicts(vigilante_id, start, end, rest, exclude)
+        assert sorted(s.id for s in found) == _scan(shifts, vigilante_id, start, end, rest, exclude)
+        assert [s.start_datetime for s in found] == sorted(s.start_datetime for s in found)
+
+
+def test_rest_boundary_and_history_lookups():
+    first = make_shift(1, 1, 1, ORIGIN)                      # 00:00-08:00
+    second = make_shift(2, 1, 1, ORIGIN + timedelta(days=1)) # next day 00:00-08:00
+    timeline = ShiftTimeline([second, first])
+    # Exactly rest_hours after the end is allowed, a minute less is not
+    gap = ShiftTimeline([first])
+    assert not gap.has_conflict(1, ORIGIN + timedelta(hours=20), ORIGIN + timedelta(hours=21), 12)
+    assert gap.has_conflict(1, ORIGIN + timedelta(hours=19, minutes=59), ORIGIN + timedelta(hours=21), 12)
+    assert timeline.last_shift(1) is second and timeline.last_shift(1, before=ORIGIN + timedelta(hours=9)) is first
+    assert timeline.last_shift(1, before=ORIGIN) is None and timeline.last_shift(2) is None
+    assert timeline.count_starting_between(1, ORIGIN) == 2
+    assert timeline.count_starting_between(1, ORIGIN, ORIGIN + timedelta(days=1)) == 1
+    assert [s.id for s in timeline.shifts_for(1)] == [1, 2] and len(timeline) == 2
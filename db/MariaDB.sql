@@ -155,7 +155,7 @@ CREATE TABLE novedades (
 -- Tabla de Registro de Horas Trabajadas
 CREATE TABLE registro_horas (
     id_registro INT AUTO_INCREMENT PRIMARY KEY,
-    id_asignacion INT NOT NULL,
+    id_asignacion INT NOT NULL UNIQUE,
     id_vigilante INT NOT NULL,
     id_edificio INT NOT NULL,
     fecha DATE NOT NULL,
@@ -167,6 +167,7 @@ CREATE TABLE registro_horas (
     horas_extras_festivas_diurnas DECIMAL(5,2) DEFAULT 0,
     horas_extras_festivas_nocturnas DECIMAL(5,2) DEFAULT 0,
     es_festivo BOOLEAN DEFAULT FALSE,
+    salario_aplicado DECIMAL(10, 2),
     calculado_por INT,
     fecha_calculo DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (id_asignacion) REFERENCES asignaciones_turnos(id_asignacion),
@@ -257,6 +258,52 @@ CREATE TABLE registro_backups (
     FOREIGN KEY (realizado_por) REFERENCES usuarios(id_usuario)
 );
 
+-- Tabla de Cobertura de Edificios (forma materializada de vista_cobertura_edificios)
+CREATE TABLE cobertura_edificios (
+    id_edificio INT NOT NULL,
+    fecha DATE NOT NULL,
+    hora INT NOT NULL,
+    vigilantes_asignados INT NOT NULL,
+    PRIMARY KEY (id_edificio, fecha, hora),
+    FOREIGN KEY (id_edificio) REFERENCES edificios(id_edificio) ON DELETE CASCADE
+);
+
+-- Tabla de Disponibilidad de Vigilantes (forma materializada de vista_vigilantes_disponibles)
+CREATE TABLE disponibilidad_vigilantes (
+    id_vigilante INT PRIMARY KEY,
+    ultimo_turno_fin DATETIME,
+    proximo_turno_inicio DATETIME,
+    vigente_hasta DATETIME,
+    calculado_en DATETIME NOT NULL,
+    FOREIGN KEY (id_vigilante) REFERENCES vigilantes(id_vigilante) ON DELETE CASCADE
+);
+
+-- Índices para las consultas frecuentes
+-- Descanso y listados por vigilante; id_asignacion completa el orden de la paginación por cursor
+CREATE INDEX idx_asignaciones_vigilante_inicio ON asignaciones_turnos (id_vigilante, hora_inicio, id_asignacion);
+-- Reportes y cobertura por edificio
+CREATE INDEX idx_asignaciones_edificio_fecha ON asignaciones_turnos (id_edificio, fecha);
+-- Consultas por rango de fechas y listado paginado de turnos
+CREATE INDEX idx_asignaciones_inicio ON asignaciones_turnos (hora_inicio, id_asignacion);
+CREATE INDEX idx_asignaciones_planilla ON asignaciones_turnos (id_planilla);
+-- Liquidación mensual y horas por vigilante o edificio
+CREATE INDEX idx_registro_horas_fecha ON registro_horas (fecha);
+CREATE INDEX idx_registro_horas_vigilante_fecha ON registro_horas (id_vigilante, fecha);
+CREATE INDEX idx_registro_horas_edificio_fecha ON registro_horas (id_edificio, fecha);
+-- Novedades por vigilante, edificio y asignación
+CREATE INDEX idx_novedades_vigilante_inicio ON novedades (id_vigilante_original, hora_inicio);
+CREATE INDEX idx_novedades_edificio_fecha ON novedades (id_edificio, fecha_novedad);
+CREATE INDEX idx_novedades_inicio ON novedades (hora_inicio, id_novedad);
+CREATE INDEX idx_novedades_asignacion ON novedades (id_asignacion_original);
+-- Certificaciones cargadas junto con los vigilantes
+CREATE INDEX idx_certificaciones_vigilante ON certificaciones_vigilantes (id_vigilante);
+-- MariaDB no tiene índices parciales: activo va primero para filtrar vigilantes y edificios activos
+CREATE INDEX idx_vigilantes_activos ON vigilantes (activo, id_vigilante);
+CREATE INDEX idx_edificios_activos ON edificios (activo, id_edificio);
+-- Tablero de cobertura por rango de fechas y filas de disponibilidad vencidas
+CREATE INDEX idx_cobertura_fecha ON cobertura_edificios (fecha, id_edificio, hora);
+CREATE INDEX idx_disponibilidad_vigente_hasta ON disponibilidad_vigilantes (vigente_hasta);
+
 -- Procedimiento almacenado para verificar y validar la concurrencia de sesiones
 DELIMITER //
 CREATE PROCEDURE validar_sesion_operador(IN p_id_usuario INT, IN p_token VARCHAR(255))
@@ -472,22 +519,20 @@ WHERE
 GROUP BY 
     v.id_vigilante;
 
--- Vista para el dashboard de cobertura de edificios
+-- Vista para el dashboard de cobertura de edificios, leída de cobertura_edificios
 CREATE VIEW vista_cobertura_edificios AS
 SELECT 
     e.id_edificio,
     e.nombre AS edificio,
-    DATE(a.fecha) AS fecha,
-    HOUR(a.hora_inicio) AS hora,
-    COUNT(DISTINCT a.id_vigilante) AS vigilantes_asignados
+    c.fecha,
+    c.hora,
+    c.vigilantes_asignados
 FROM 
-    edificios e
-LEFT JOIN 
-    asignaciones_turnos a ON e.id_edificio = a.id_edificio
+    cobertura_edificios c
+JOIN 
+    edificios e ON e.id_edificio = c.id_edificio
 WHERE 
-    a.fecha BETWEEN CURDATE() AND DATE_ADD(CURDATE(), INTERVAL 7 DAY)
-GROUP BY 
-    e.id_edificio, DATE(a.fecha), HOUR(a.hora_inicio);
+    c.fecha BETWEEN CURDATE() AND DATE_ADD(CURDATE(), INTERVAL 7 DAY);
 
 -- Creación de usuario administrador por defecto (password: admin123 en MD5)
 INSERT INTO usuarios (nombre_usuario, password, rol, nombre_completo, email) 
@@ -192,7 +192,7 @@ CREATE TABLE novedades (
 -- Esta tabla almacena el registro de las horas trabajadas por los vigilantes
 CREATE TABLE registro_horas (
     id_registro SERIAL PRIMARY KEY, -- Identificador único autoincremental para cada registro
-    id_asignacion INT NOT NULL, -- Identificador de la asignación de turno
+    id_asignacion INT NOT NULL UNIQUE, -- Identificador de la asignación de turno (un registro por asignación)
     id_vigilante INT NOT NULL, -- Identificador del vigilante
     id_edificio INT NOT NULL, -- Identificador del edificio donde se trabajó
     fecha DATE NOT NULL, -- Fecha del registro
@@ -204,6 +204,7 @@ CREATE TABLE registro_horas (
     horas_extras_festivas_diurnas NUMERIC(5,2) DEFAULT 0, -- Horas extras festivas diurnas trabajadas
     horas_extras_festivas_nocturnas NUMERIC(5,2) DEFAULT 0, -- Horas extras festivas nocturnas trabajadas
     es_festivo BOOLEAN DEFAULT FALSE, -- Indica si el día es festivo (por defecto, FALSE)
+    salario_aplicado NUMERIC(10, 2), -- Salario con el que se liquidó el registro (NULL: el salario actual del vigilante)
     calculado_por INT, -- Identificador del usuario que realizó el cálculo
     fecha_calculo TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- Fecha en que se realizó el cálculo (por defecto, la fecha actual)
     CONSTRAINT fk_asignacion FOREIGN KEY (id_asignacion) REFERENCES asignaciones_turnos(id_asignacion), -- Relación con la tabla "asignaciones_turnos"
@@ -299,6 +300,54 @@ CREATE TABLE registro_backups (
     CONSTRAINT fk_realizado_por FOREIGN KEY (realizado_por) REFERENCES usuarios(id_usuario) -- Relación con la tabla "usuarios"
 );
 
+-- Tabla de Cobertura de Edificios (forma materializada de vista_cobertura_edificios)
+-- La aplicación recalcula solo los pares (edificio, día) que toca cada escritura en asignaciones_turnos
+CREATE TABLE cobertura_edificios (
+    id_edificio INT NOT NULL, -- Edificio cubierto
+    fecha DATE NOT NULL, -- Día del turno
+    hora INT NOT NULL, -- Hora de inicio de los turnos
+    vigilantes_asignados INT NOT NULL, -- Vigilantes distintos asignados
+    PRIMARY KEY (id_edificio, fecha, hora),
+    CONSTRAINT fk_cobertura_edificio FOREIGN KEY (id_edificio) REFERENCES edificios(id_edificio) ON DELETE CASCADE
+);
+
+-- Tabla de Disponibilidad de Vigilantes (forma materializada de vista_vigilantes_disponibles)
+-- Cada fila vale desde calculado_en hasta vigente_hasta, cuando empieza o termina un turno del vigilante
+CREATE TABLE disponibilidad_vigilantes (
+    id_vigilante INT PRIMARY KEY, -- Vigilante
+    ultimo_turno_fin TIMESTAMP, -- Fin del último turno terminado
+    proximo_turno_inicio TIMESTAMP, -- Inicio del próximo turno
+    vigente_hasta TIMESTAMP, -- Momento en que los dos valores anteriores cambian (NULL si no hay turnos pendientes)
+    calculado_en TIMESTAMP NOT NULL, -- Momento del cálculo
+    CONSTRAINT fk_disponibilidad_vigilante FOREIGN KEY (id_vigilante) REFERENCES vigilantes(id_vigilante) ON DELETE CASCADE
+);
+
+-- Índices para las consultas frecuentes
+-- Descanso y listados por vigilante; id_asignacion completa el orden de la paginación por cursor
+CREATE INDEX idx_asignaciones_vigilante_inicio ON asignaciones_turnos (id_vigilante, hora_inicio, id_asignacion);
+-- Reportes y cobertura por edificio
+CREATE INDEX idx_asignaciones_edificio_fecha ON asignaciones_turnos (id_edificio, fecha);
+-- Consultas por rango de fechas y listado paginado de turnos
+CREATE INDEX idx_asignaciones_inicio ON asignaciones_turnos (hora_inicio, id_asignacion);
+CREATE INDEX idx_asignaciones_planilla ON asignaciones_turnos (id_planilla);
+-- Liquidación mensual y horas por vigilante o edificio
+CREATE INDEX idx_registro_horas_fecha ON registro_horas (fecha);
+CREATE INDEX idx_registro_horas_vigilante_fecha ON registro_horas (id_vigilante, fecha);
+CREATE INDEX idx_registro_horas_edificio_fecha ON registro_horas (id_edificio, fecha);
+-- Novedades por vigilante, edificio y asignación
+CREATE INDEX idx_novedades_vigilante_inicio ON novedades (id_vigilante_original, hora_inicio);
+CREATE INDEX idx_novedades_edificio_fecha ON novedades (id_edificio, fecha_novedad);
+CREATE INDEX idx_novedades_inicio ON novedades (hora_inicio, id_novedad);
+CREATE INDEX idx_novedades_asignacion ON novedades (id_asignacion_original);
+-- Certificaciones cargadas junto con los vigilantes
+CREATE INDEX idx_certificaciones_vigilante ON certificaciones_vigilantes (id_vigilante);
+-- Índices parciales: solo vigilantes y edificios activos
+CREATE INDEX idx_vigilantes_activos ON vigilantes (id_vigilante) WHERE activo = TRUE;
+CREATE INDEX idx_edificios_activos ON edificios (id_edificio) WHERE activo = TRUE;
+-- Tablero de cobertura por rango de fechas y filas de disponibilidad vencidas
+CREATE INDEX idx_cobertura_fecha ON cobertura_edificios (fecha, id_edificio, hora);
+CREATE INDEX idx_disponibilidad_vigente_hasta ON disponibilidad_vigilantes (vigente_hasta);
+
 -- Procedimiento almacenado para verificar y validar la concurrencia de sesiones
 -- Este procedimiento valida que no haya más de una sesión activa para operadores supervisores
 CREATE OR REPLACE FUNCTION validar_sesion_operador(p_id_usuario INT, p_token VARCHAR(255))
@@ -544,22 +593,20 @@ GROUP BY
     v.id_vigilante;
 
 -- Vista para el dashboard de cobertura de edificios
--- Esta vista muestra la cobertura de edificios en los próximos 7 días
+-- Esta vista muestra la cobertura de edificios en los próximos 7 días, leída de cobertura_edificios
 CREATE OR REPLACE VIEW vista_cobertura_edificios AS
 SELECT 
     e.id_edificio,
     e.nombre AS edificio,
-    DATE(a.fecha) AS fecha,
-    EXTRACT(HOUR FROM a.hora_inicio) AS hora,
-    COUNT(DISTINCT a.id_vigilante) AS vigilantes_asignados
+    c.fecha,
+    c.hora,
+    c.vigilantes_asignados
 FROM 
-    edificios e
-LEFT JOIN 
-    asignaciones_turnos a ON e.id_edificio = a.id_edificio
+    cobertura_edificios c
+JOIN 
+    edificios e ON e.id_edificio = c.id_edificio
 WHERE 
-    a.fecha BETWEEN CURRENT_DATE AND CURRENT_DATE + INTERVAL '7 days'
-GROUP BY 
-    e.id_edificio, DATE(a.fecha), EXTRACT(HOUR FROM a.hora_inicio);
+    c.fecha BETWEEN CURRENT_DATE AND CURRENT_DATE + 7;
 
 -- Creación de usuario administrador por defecto (password: admin123 en MD5)
 -- Nota: PostgreSQL no tiene una función MD5 integrada en SQL puro, pero se puede usar `md5()` en plpgsql
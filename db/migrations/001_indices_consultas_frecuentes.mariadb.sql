@@ -0,0 +1,28 @@
+-- Migración 001: índices para las consultas frecuentes (MariaDB)
+-- Para bases creadas con MariaDB.sql antes de que incluyera estos índices.
+
+USE gestion_turnos_vigilantes;
+
+-- Índices para las consultas frecuentes
+-- Descanso y listados por vigilante; id_asignacion completa el orden de la paginación por cursor
+CREATE INDEX IF NOT EXISTS idx_asignaciones_vigilante_inicio ON asignaciones_turnos (id_vigilante, hora_inicio, id_asignacion);
+-- Reportes y cobertura por edificio
+CREATE INDEX IF NOT EXISTS idx_asignaciones_edificio_fecha ON asignaciones_turnos (id_edificio, fecha);
+-- Consultas por rango de fechas y listado paginado de turnos
+CREATE INDEX IF NOT EXISTS idx_asignaciones_inicio ON asignaciones_turnos (hora_inicio, id_asignacion);
+CREATE INDEX IF NOT EXISTS idx_asignaciones_planilla ON asignaciones_turnos (id_planilla);
+-- Liquidación mensual y horas por vigilante o edificio
+CREATE INDEX IF NOT EXISTS idx_registro_horas_fecha ON registro_horas (fecha);
+CREATE INDEX IF NOT EXISTS idx_registro_horas_vigilante_fecha ON registro_horas (id_vigilante, fecha);
+CREATE INDEX IF NOT EXISTS idx_registro_horas_edificio_fecha ON registro_horas (id_edificio, fecha);
+-- Novedades por vigilante, edificio y asignación
+CREATE INDEX IF NOT EXISTS idx_novedades_vigilante_inicio ON novedades (id_vigilante_original, hora_inicio);
+CREATE INDEX IF NOT EXISTS idx_novedades_edificio_fecha ON novedades (id_edificio, fecha_novedad);
+CREATE INDEX IF NOT EXISTS idx_novedades_asignacion ON novedades (id_asignacion_original);
+-- Certificaciones cargadas junto con los vigilantes
+CREATE INDEX IF NOT EXISTS idx_certificaciones_vigilante ON certificaciones_vigilantes (id_vigilante);
+-- MariaDB no tiene índices parciales: activo va primero para filtrar vigilantes y edificios activos
+CREATE INDEX IF NOT EXISTS idx_vigilantes_activos ON vigilantes (activo, id_vigilante);
+CREATE INDEX IF NOT EXISTS idx_edificios_activos ON edificios (activo, id_edificio);
+
+ANALYZE TABLE asignaciones_turnos, registro_horas, novedades, vigilantes, edificios;
@@ -0,0 +1,33 @@
+-- Migración 001: índices para las consultas frecuentes (PostgreSQL)
+-- Para bases creadas con PostgreDB.sql antes de que incluyera estos índices.
+-- CONCURRENTLY no bloquea las escrituras mientras se construye cada índice,
+-- por eso este archivo no debe ejecutarse dentro de una transacción:
+--     psql "$DATABASE_URL" -f db/migrations/001_indices_consultas_frecuentes.postgres.sql
+
+-- Índices para las consultas frecuentes
+-- Descanso y listados por vigilante; id_asignacion completa el orden de la paginación por cursor
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_asignaciones_vigilante_inicio ON asignaciones_turnos (id_vigilante, hora_inicio, id_asignacion);
+-- Reportes y cobertura por edificio
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_asignaciones_edificio_fecha ON asignaciones_turnos (id_edificio, fecha);
+-- Consultas por rango de fechas y listado paginado de turnos
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_asignaciones_inicio ON asignaciones_turnos (hora_inicio, id_asignacion);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_asignaciones_planilla ON asignaciones_turnos (id_planilla);
+-- Liquidación mensual y horas por vigilante o edificio
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_registro_horas_fecha ON registro_horas (fecha);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_registro_horas_vigilante_fecha ON registro_horas (id_vigilante, fecha);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_registro_horas_edificio_fecha ON registro_horas (id_edificio, fecha);
+-- Novedades por vigilante, edificio y asignación
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_novedades_vigilante_inicio ON novedades (id_vigilante_original, hora_inicio);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_novedades_edificio_fecha ON novedades (id_edificio, fecha_novedad);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_novedades_asignacion ON novedades (id_asignacion_original);
+-- Certificaciones cargadas junto con los vigilantes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_certificaciones_vigilante ON certificaciones_vigilantes (id_vigilante);
+-- Índices parciales: solo vigilantes y edificios activos
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_vigilantes_activos ON vigilantes (id_vigilante) WHERE activo = TRUE;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_edificios_activos ON edificios (id_edificio) WHERE activo = TRUE;
+
+ANALYZE asignaciones_turnos;
+ANALYZE registro_horas;
+ANALYZE novedades;
+ANALYZE vigilantes;
+ANALYZE edificios;
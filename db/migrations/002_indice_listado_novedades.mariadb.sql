@@ -0,0 +1,5 @@
+-- Migración 002: índice del listado paginado de novedades (MariaDB)
+
+USE gestion_turnos_vigilantes;
+
+CREATE INDEX IF NOT EXISTS idx_novedades_inicio ON novedades (hora_inicio, id_novedad);
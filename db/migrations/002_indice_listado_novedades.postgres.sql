@@ -0,0 +1,5 @@
+-- Migración 002: índice del listado paginado de novedades (PostgreSQL)
+-- No ejecutar dentro de una transacción (CONCURRENTLY):
+--     psql "$DATABASE_URL" -f db/migrations/002_indice_listado_novedades.postgres.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_novedades_inicio ON novedades (hora_inicio, id_novedad);
@@ -0,0 +1,59 @@
+-- Migración 003: cobertura y disponibilidad materializadas (PostgreSQL)
+-- Crea cobertura_edificios y disponibilidad_vigilantes, las llena desde
+-- asignaciones_turnos y hace que vista_cobertura_edificios lea la tabla.
+-- Desde aquí la aplicación las mantiene en cada escritura de asignaciones:
+--     psql "$DATABASE_URL" -1 -f db/migrations/003_resumenes_tablero.postgres.sql
+
+CREATE TABLE IF NOT EXISTS cobertura_edificios (
+    id_edificio INT NOT NULL,
+    fecha DATE NOT NULL,
+    hora INT NOT NULL,
+    vigilantes_asignados INT NOT NULL,
+    PRIMARY KEY (id_edificio, fecha, hora),
+    CONSTRAINT fk_cobertura_edificio FOREIGN KEY (id_edificio) REFERENCES edificios(id_edificio) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS disponibilidad_vigilantes (
+    id_vigilante INT PRIMARY KEY,
+    ultimo_turno_fin TIMESTAMP,
+    proximo_turno_inicio TIMESTAMP,
+    vigente_hasta TIMESTAMP,
+    calculado_en TIMESTAMP NOT NULL,
+    CONSTRAINT fk_disponibilidad_vigilante FOREIGN KEY (id_vigilante) REFERENCES vigilantes(id_vigilante) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_cobertura_fecha ON cobertura_edificios (fecha, id_edificio, hora);
+CREATE INDEX IF NOT EXISTS idx_disponibilidad_vigente_hasta ON disponibilidad_vigilantes (vigente_hasta);
+
+-- Carga inicial; un turno cuenta como terminado desde su hora_fin
+DELETE FROM cobertura_edificios;
+INSERT INTO cobertura_edificios (id_edificio, fecha, hora, vigilantes_asignados)
+SELECT id_edificio, fecha, EXTRACT(HOUR FROM hora_inicio), COUNT(DISTINCT id_vigilante)
+FROM asignaciones_turnos
+GROUP BY id_edificio, fecha, EXTRACT(HOUR FROM hora_inicio);
+
+DELETE FROM disponibilidad_vigilantes;
+INSERT INTO disponibilidad_vigilantes (id_vigilante, ultimo_turno_fin, proximo_turno_inicio, vigente_hasta, calculado_en)
+SELECT
+    v.id_vigilante,
+    MAX(CASE WHEN a.hora_fin <= LOCALTIMESTAMP THEN a.hora_fin END),
+    MIN(CASE WHEN a.hora_inicio > LOCALTIMESTAMP THEN a.hora_inicio END),
+    MIN(CASE WHEN a.hora_inicio > LOCALTIMESTAMP THEN a.hora_inicio
+             WHEN a.hora_fin > LOCALTIMESTAMP THEN a.hora_fin END),
+    LOCALTIMESTAMP
+FROM vigilantes v
+LEFT JOIN asignaciones_turnos a ON a.id_vigilante = v.id_vigilante
+GROUP BY v.id_vigilante;
+
+-- Las columnas cambian de tipo (hora pasa a INT), por eso no basta con CREATE OR REPLACE
+DROP VIEW IF EXISTS vista_cobertura_edificios;
+CREATE VIEW vista_cobertura_edificios AS
+SELECT
+    e.id_edificio,
+    e.nombre AS edificio,
+    c.fecha,
+    c.hora,
+    c.vigilantes_asignados
+FROM cobertura_edificios c
+JOIN edificios e ON e.id_edificio = c.id_edificio
+WHERE c.fecha BETWEEN CURRENT_DATE AND CURRENT_DATE + 7;
@@ -0,0 +1,20 @@
+-- Migración 004: registro_horas para la liquidación incremental (MariaDB)
+-- Borra los registros repetidos de una misma asignación, conservando el más
+-- reciente, agrega el índice UNIQUE (id_asignacion) que necesita el
+-- ON DUPLICATE KEY UPDATE de la liquidación incremental y la columna
+-- salario_aplicado, con la que cada registro se descuenta al corregirse.
+-- Los registros existentes quedan con salario_aplicado NULL y se valoran con
+-- el salario actual. Los totales calculados con registros repetidos quedan
+-- desfasados; después de migrar, ejecutar la conciliación con reparación
+-- (POST /api/reports/payroll/reconcile con "repair": true) para cada mes afectado.
+
+USE gestion_turnos_vigilantes;
+
+DELETE r FROM registro_horas r
+JOIN registro_horas reciente
+  ON r.id_asignacion = reciente.id_asignacion
+ AND r.id_registro < reciente.id_registro;
+
+ALTER TABLE registro_horas ADD UNIQUE INDEX IF NOT EXISTS id_asignacion (id_asignacion);
+
+ALTER TABLE registro_horas ADD COLUMN IF NOT EXISTS salario_aplicado DECIMAL(10, 2);
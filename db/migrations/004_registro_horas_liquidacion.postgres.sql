@@ -0,0 +1,27 @@
+-- Migración 004: registro_horas para la liquidación incremental (PostgreSQL)
+-- Borra los registros repetidos de una misma asignación, conservando el más
+-- reciente, agrega la restricción UNIQUE (id_asignacion) que necesita el
+-- ON CONFLICT de la liquidación incremental y la columna salario_aplicado,
+-- con la que cada registro se descuenta al corregirse:
+--     psql "$DATABASE_URL" -1 -f db/migrations/004_registro_horas_liquidacion.postgres.sql
+-- Los registros existentes quedan con salario_aplicado NULL y se valoran con
+-- el salario actual. Los totales calculados con registros repetidos quedan
+-- desfasados; después de migrar, ejecutar la conciliación con reparación
+-- (POST /api/reports/payroll/reconcile con "repair": true) para cada mes afectado.
+
+DELETE FROM registro_horas r
+USING registro_horas reciente
+WHERE r.id_asignacion = reciente.id_asignacion
+  AND r.id_registro < reciente.id_registro;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'registro_horas_id_asignacion_key'
+    ) THEN
+        ALTER TABLE registro_horas
+            ADD CONSTRAINT registro_horas_id_asignacion_key UNIQUE (id_asignacion);
+    END IF;
+END $$;
+
+ALTER TABLE registro_horas ADD COLUMN IF NOT EXISTS salario_aplicado NUMERIC(10, 2);